@@ -1,4 +1,4 @@
-import pygame
+import os
 from typing import Dict, Tuple
 from managers.settings_manager import load_settings
 
@@ -13,6 +13,32 @@ GRID_SIZE = 30
 GRID_WIDTH, GRID_HEIGHT = SCREEN_WIDTH // GRID_SIZE, SCREEN_HEIGHT // GRID_SIZE
 MOVE_COOLDOWN = 120
 
+# Timing
+SIMULATION_FPS = 60           # fixed game logic rate, independent of rendering
+RENDER_FPS = 60               # 0 = uncapped (e.g. 30 or 144 also work)
+MAX_FRAME_TIME = 250          # ms; longer frames are clamped so the game slows down instead of spiralling
+MAX_SIMULATION_STEPS = 8      # most logic steps run to catch up within one rendered frame
+
+# Sound effects
+SOUND_CHANNELS = 12           # voices for sound effects (music streams separately)
+SOUND_MAX_PER_FRAME = 1       # the same effect starts at most this many times per simulation step
+SOUND_PRIORITIES = {          # higher wins when all channels are busy
+    "death": 3,
+    "hit": 2,
+    "explosion": 2,
+    "final_map_selector": 1,
+    "move_map_selector": 1,
+    "walk": 0,
+}
+
+# Rendering
+DIRTY_RECT_RENDERING = True   # False = always flip the whole frame
+MAX_DIRTY_RECTS = 96          # more rects than this in one frame -> full flip instead
+# Atlas hárky z tools/build_atlas.py (generované, nie sú v gite); keď chýbajú, obrázky sa čítajú po jednom
+ATLAS_DIR = os.path.join("assets", "atlas")
+# Archív s predškálovanými obrázkami a dekódovanými zvukmi z tools/build_asset_archive.py (tiež generovaný)
+ASSET_ARCHIVE = os.path.join("assets", "assets.pak")
+
 
 MUSIC_VOLUME = {
     "main_menu_volume": 0.25,
@@ -98,76 +124,28 @@ SPAWN_POINTS = {"spawn1": (0, 30),
                 "spawn2": (930, 30),
                 "spawn3": (0, 510),
                 "spawn4": (930, 510)}
-PLAYER1_MOVE_KEYS = [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE]
-PLAYER2_MOVE_KEYS  = [pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT, pygame.K_0]
+# Poradie, v akom dostávajú hráči multiplayeru spawny (prví dvaja idú do protiľahlých rohov)
+SPAWN_ORDER = ("spawn1", "spawn4", "spawn2", "spawn3")
+MAX_PLAYERS = len(SPAWN_ORDER)
+# Klávesy sú konštanty pygame; PLAYER1_MOVE_KEYS, PLAYER2_MOVE_KEYS a PLAYER_CONFIG vznikajú až pri prvom
+# prístupe (__getattr__ na konci súboru), aby import config nenačítaval pygame
+_MOVE_KEY_NAMES = {
+    "PLAYER1_MOVE_KEYS": ("K_w", "K_a", "K_s", "K_d", "K_SPACE"),
+    "PLAYER2_MOVE_KEYS": ("K_UP", "K_LEFT", "K_DOWN", "K_RIGHT", "K_0"),
+}
 
 
-# Player images
-PLAYER1_IMAGES = {
-    "idle": [
-        pygame.image.load("assets/player_animations/p_1_idle_0.png"),
-        pygame.image.load("assets/player_animations/p_1_idle_1.png"),
-        pygame.image.load("assets/player_animations/p_1_idle_2.png")
-    ],
-    "down":[
-        pygame.image.load("assets/player_animations/p_1_down_0.png"),
-        pygame.image.load("assets/player_animations/p_1_down_1.png"),
-        pygame.image.load("assets/player_animations/p_1_down_2.png")
-    ],
-    "up": [
-        pygame.image.load("assets/player_animations/p_1_up_0.png"),
-        pygame.image.load("assets/player_animations/p_1_up_1.png"),
-        pygame.image.load("assets/player_animations/p_1_up_2.png")
-    ],
-    "left": [
-        pygame.image.load("assets/player_animations/p_1_left_0.png"),
-        pygame.image.load("assets/player_animations/p_1_left_1.png"),
-        pygame.image.load("assets/player_animations/p_1_left_2.png")
-    ],
-    "right": [
-        pygame.image.load("assets/player_animations/p_1_right_0.png"),
-        pygame.image.load("assets/player_animations/p_1_right_1.png"),
-        pygame.image.load("assets/player_animations/p_1_right_2.png")
-    ]
-}
-PLAYER2_IMAGES = {
-    "idle": [
-        pygame.image.load("assets/player_animations/p_1_idle_0.png"),
-        pygame.image.load("assets/player_animations/p_1_idle_1.png"),
-        pygame.image.load("assets/player_animations/p_1_idle_2.png")
-    ],
-    "down":[
-        pygame.image.load("assets/player_animations/p_1_down_0.png"),
-        pygame.image.load("assets/player_animations/p_1_down_1.png"),
-        pygame.image.load("assets/player_animations/p_1_down_2.png")
-    ],
-    "up": [
-        pygame.image.load("assets/player_animations/p_1_up_0.png"),
-        pygame.image.load("assets/player_animations/p_1_up_1.png"),
-        pygame.image.load("assets/player_animations/p_1_up_2.png")
-    ],
-    "left": [
-        pygame.image.load("assets/player_animations/p_1_left_0.png"),
-        pygame.image.load("assets/player_animations/p_1_left_1.png"),
-        pygame.image.load("assets/player_animations/p_1_left_2.png")
-    ],
-    "right": [
-        pygame.image.load("assets/player_animations/p_1_right_0.png"),
-        pygame.image.load("assets/player_animations/p_1_right_1.png"),
-        pygame.image.load("assets/player_animations/p_1_right_2.png")
-    ]
+# Player images - iba cesty, surfaces načíta (a skonvertuje) asset_manager pri prvom použití,
+# takže import config nič nenačítava a funguje aj bez displeja (nástroje v tools/)
+PLAYER_ANIMATION_DIR = os.path.join("assets", "player_animations")
+PLAYER_ANIMATIONS = ("idle", "down", "up", "left", "right")
+PLAYER_ANIMATION_FRAMES = 3
+PLAYER1_IMAGE_PATHS = {
+    animation: [os.path.join(PLAYER_ANIMATION_DIR, f"p_1_{animation}_{i}.png") for i in range(PLAYER_ANIMATION_FRAMES)]
+    for animation in PLAYER_ANIMATIONS
 }
+PLAYER2_IMAGE_PATHS = PLAYER1_IMAGE_PATHS   # hráč 2 používa tie isté snímky, odlíši ho farba skinu
 
-PLAYER_CONFIG = {
-    1: {
-        'move_keys': PLAYER1_MOVE_KEYS,
-        'images': PLAYER1_IMAGES,
-    },
-    2: {
-        'move_keys': PLAYER2_MOVE_KEYS,
-        'images': PLAYER2_IMAGES,
-    }
-}
 # -----------------------------------------------------------------Power_up-----------------------------------------------------------------
 # Power-up types and properties
 POWERUP_TYPES = [
@@ -296,6 +274,11 @@ CARD_W      = 220
 CARD_H      = 160
 CARD_GAP    = 24
 CARD_RADIUS = 14
+MAP_PREVIEW_SIZE = (CARD_W - 20, CARD_H - 50)            # náhľad mapy na karte v MapSelector
+# Karty v MultiplayerMapSelector
+MP_CARD_W = 250
+MP_CARD_H = 160
+MP_MAP_PREVIEW_SIZE = (MP_CARD_W - 20, MP_CARD_H - 50)
 OVERLAY_ALPHA = 0
 #------SKIN SELECTOR CONSTANTS------
 BOMBS = [
@@ -361,4 +344,45 @@ GAP_X = 12
 GAP_Y = 10
 # ---------------------------------------------------------------Network---------------------------------------------------------------
 SERVER_PORT = 9999
-load_settings()
\ No newline at end of file
+NETWORK_WIRE_FORMAT = "binary"   # "json" = čitateľné pakety na ladenie (dohodne sa pri JOIN)
+NETWORK_BATCH_MAX_PACKETS = 256  # max. paketov spracovaných za jeden frame
+NETWORK_BATCH_MAX_TIME = 0.004   # max. čas (s) na vyprázdnenie socketu za jeden frame
+NETWORK_MTU = 1200               # max. veľkosť datagramu, do ktorého sa zbalia správy jedného framu
+NETWORK_MIN_RTO = 0.05           # dolná hranica timeoutu pre opätovné odoslanie (s), na LAN je RTT pár ms
+NETWORK_MAX_RTO = 2.0            # horná hranica timeoutu aj s exponenciálnym backoffom (s)
+NETWORK_BANDWIDTH_CAP = 64 * 1024    # bajtov/s na jedného peera, 0 = bez limitu
+NETWORK_BANDWIDTH_BURST = 16 * 1024  # koľko bajtov môže odísť naraz po chvíli ticha
+NETWORK_SNAPSHOT_RATE = 20       # koľkokrát za sekundu posiela host hosťom SNAPSHOT zápasu
+NETWORK_INTERPOLATION_DELAY = 100  # ms, o koľko v minulosti sa kreslia ostatní hráči (~2 SNAPSHOT-y)
+NETWORK_EXTRAPOLATION_LIMIT = 100  # ms, ako dlho sa hráč posúva ďalej, keď SNAPSHOT mešká
+NETWORK_SCOPE_HOLD_TIME = 2.0    # ako dlho (s) čakajú nespoľahlivé pakety pre scope, ktorý aktuálny stav nečíta
+NETWORK_UNREGISTERED_TIMEOUT = 10.0  # po koľkých s sa vzdá posielanie ordered paketov na adresu, ktorá nie je peer
+NETWORK_LOG_LEVEL = "WARNING"    # "DEBUG" vypíše aj heartbeaty a ďalšie detaily siete
+# Simulované podmienky siete na testovanie cez localhost, meno profilu z managers/network_transport.PROFILES
+# (napr. "wifi", "mobile", "lossy"), prázdne = obyčajný UDP. Dá sa nastaviť aj premennou BOMBERMAN_NETSIM.
+NETWORK_SIMULATION = os.environ.get("BOMBERMAN_NETSIM", "")
+
+
+def __getattr__(name):
+    """Values that need pygame, built on first access and then stored as normal module attributes."""
+    if name in _MOVE_KEY_NAMES:
+        import pygame
+        value = [getattr(pygame, key) for key in _MOVE_KEY_NAMES[name]]
+    elif name == "PLAYER_CONFIG":
+        value = {
+            1: {
+                'move_keys': globals().get("PLAYER1_MOVE_KEYS") or __getattr__("PLAYER1_MOVE_KEYS"),
+                'image_paths': PLAYER1_IMAGE_PATHS,
+            },
+            2: {
+                'move_keys': globals().get("PLAYER2_MOVE_KEYS") or __getattr__("PLAYER2_MOVE_KEYS"),
+                'image_paths': PLAYER2_IMAGE_PATHS,
+            }
+        }
+    else:
+        raise AttributeError(f"module 'config' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+
+load_settings()
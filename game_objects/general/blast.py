@@ -0,0 +1,39 @@
+import config
+from typing import List, Tuple
+
+# Nastavenie smerov výbuchu: vpravo, vľavo, hore, dole
+BLAST_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+def blast_cells(tile_map: List[List[int]], tile_x: int, tile_y: int, power: int) -> List[Tuple[int, int, bool]]:
+    """Cells hit by a bomb at (tile_x, tile_y) with range *power*.
+
+    Returns ``(x, y, destroys_brick)`` for the centre and every reached cell,
+    in the order the explosions are spawned. Pure function shared by the
+    multiplayer ``Bomb`` sprite and the singleplayer ``Match``.
+    """
+    cells = [(tile_x, tile_y, False)]
+    max_x = (config.SCREEN_WIDTH - config.GRID_SIZE) // config.GRID_SIZE
+    max_y = (config.SCREEN_HEIGHT - config.GRID_SIZE) // config.GRID_SIZE
+
+    for dx, dy in BLAST_DIRECTIONS:
+        for distance in range(1, power + 1):
+            x = tile_x + dx * distance
+            y = tile_y + dy * distance
+            if not (0 <= x <= max_x and 0 <= y <= max_y):
+                break
+
+            tile_type = tile_map[y][x]
+            if tile_type == config.GROUND:
+                cells.append((x, y, False))
+            elif tile_type == config.WALL:
+                break
+            elif tile_type == config.BRICK:
+                cells.append((x, y, True))
+                break
+            elif tile_type in (config.PORTAL_BLUE, config.PORTAL_RED):
+                break
+            elif tile_type in (6, 7):
+                cells.append((x, y, False))
+                break
+    return cells
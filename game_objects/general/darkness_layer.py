@@ -0,0 +1,61 @@
+import pygame
+import config
+from typing import List, Tuple
+from managers.asset_manager import asset_manager
+
+Point = Tuple[int, int]
+
+
+class DarknessLayer:
+    """Screen-sized light map multiplied over the frame while darkness is active.
+
+    Darkness is kept as brightness (255 - opacity): almost black everywhere
+    except a light stamp around every player. The stamp, a lit disc fading
+    out over *fade_extra* pixels in *fade_steps* rings, is drawn once per
+    radius and profile and shared through asset_manager; overlapping lights
+    keep the brighter value. The map is only redrawn around players that
+    moved, and applying it is one opaque multiply blit.
+    """
+
+    OPACITY = 250
+
+    def __init__(self, size: Tuple[int, int], radius: int = config.GRID_SIZE,
+                 fade_extra: int = config.GRID_SIZE, fade_steps: int = config.FADE_STEPS):
+        self.radius = radius
+        self.fade_extra = fade_extra
+        self.fade_steps = fade_steps
+        self.light = radius + fade_extra + fade_steps   # polovica strany pečiatky
+        self.shade = (255 - self.OPACITY,) * 3
+        self.surface = pygame.Surface(size).convert()
+        self.surface.fill(self.shade)
+        self.stamp = asset_manager.get_surface(("light_stamp", radius, fade_extra, fade_steps), self._build_stamp)
+        self._centers: List[Point] = []
+
+    def _build_stamp(self) -> pygame.Surface:
+        stamp = pygame.Surface((self.light * 2, self.light * 2)).convert()
+        stamp.fill(self.shade)
+        center = (self.light, self.light)
+        pygame.draw.circle(stamp, (255, 255, 255), center, self.radius)
+        for i in range(self.fade_steps):
+            progress = (i + 1) / self.fade_steps
+            alpha = int(self.OPACITY * (progress ** 1.5))
+            r = self.radius + int(self.fade_extra * progress)
+            pygame.draw.circle(stamp, (255 - alpha,) * 3, center, r, width=max(1, int(self.fade_extra / self.fade_steps) + 2))
+        return stamp
+
+    def rect_at(self, center: Point) -> pygame.Rect:
+        return pygame.Rect(center[0] - self.light, center[1] - self.light, self.light * 2, self.light * 2)
+
+    def update(self, centers: List[Point]) -> None:
+        """Move the lights to *centers*; nothing is redrawn while nobody moves."""
+        if centers == self._centers:
+            return
+        for center in self._centers:
+            self.surface.fill(self.shade, self.rect_at(center))
+        # aj nepohnuté svetlá znova, staré miesto mohlo prekrývať ich okraj
+        for center in centers:
+            self.surface.blit(self.stamp, self.rect_at(center), special_flags=pygame.BLEND_RGB_MAX)
+        self._centers = list(centers)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        screen.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
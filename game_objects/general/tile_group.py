@@ -0,0 +1,42 @@
+import pygame
+import config
+from typing import Dict, List, Tuple
+
+Tile = Tuple[int, int]
+
+
+class TileGroup(pygame.sprite.Group):
+    """Sprite group that also indexes its sprites by grid tile.
+
+    Meant for grid-aligned sprites that do not move while in the group
+    (bombs, explosions, power-ups), so "is something on this tile" is a
+    dictionary lookup instead of a collide_rect scan over the whole group.
+    """
+
+    def __init__(self, *sprites):
+        self._tiles: Dict[Tile, List[pygame.sprite.Sprite]] = {}
+        super().__init__(*sprites)
+
+    @staticmethod
+    def tile_of(rect: pygame.Rect) -> Tile:
+        return rect.x // config.GRID_SIZE, rect.y // config.GRID_SIZE
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._tiles.setdefault(self.tile_of(sprite.rect), []).append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        tile = self.tile_of(sprite.rect)
+        sprites = self._tiles.get(tile)
+        if sprites and sprite in sprites:
+            sprites.remove(sprite)
+            if not sprites:
+                del self._tiles[tile]
+
+    def at(self, tile: Tile) -> List[pygame.sprite.Sprite]:
+        """Sprites on *tile* (a copy, safe to kill while iterating)."""
+        return list(self._tiles.get(tile, ()))
+
+    def has_tile(self, tile: Tile) -> bool:
+        return tile in self._tiles
@@ -0,0 +1,89 @@
+import pygame
+import config
+from typing import Dict, List, Optional
+
+# Pozadie a textúry stien podľa mapy
+MAP_BACKGROUNDS = {
+    "Crystal Caves": "cave_bg",
+    "Classic":       "grass_bg",
+    "Desert Maze":   "sand_bg",
+    "Ancient Ruins": "ruins_bg",
+    "Urban Assault": "urban_bg",
+}
+UNBREAKABLE_TILES = {
+    "Crystal Caves": "unbreakable_stone",
+    "Classic":       "unbreakable_box",
+    "Desert Maze":   "unbreakable_box",
+    "Ancient Ruins": "unbreakable_rock",
+}
+BREAKABLE_TILES = {
+    "Desert Maze":   "breakable_cactus",
+    "Classic":       "breakable_bush",
+    "Crystal Caves": "breakable_diamond",
+    "Ancient Ruins": "breakable_rock",
+}
+
+
+class TileLayer:
+    """Pre-rendered background + walls of one match.
+
+    The whole layer is built once; when a tile changes only its cell is
+    redrawn, so rendering the static part of the map is a single blit.
+    """
+
+    def __init__(self, images: Dict[str, pygame.Surface], map_name: str, tile_map: List[List[int]]):
+        self.map_name = map_name
+        self.background: Optional[pygame.Surface] = images.get(MAP_BACKGROUNDS.get(map_name, ""))
+        self.tile_images: Dict[int, pygame.Surface] = {
+            config.WALL:        images[UNBREAKABLE_TILES.get(map_name, "unbreakable_wall")],
+            config.BRICK:       images[BREAKABLE_TILES.get(map_name, "breakable_wall")],
+            config.PORTAL_BLUE: images["blue_cave"],
+            config.PORTAL_RED:  images["red_cave"],
+            config.TRAP:        images["trap_image"],
+        }
+        self.surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)).convert()
+        self.tile_map = tile_map
+        self.rebuild(tile_map)
+
+    # ------------------------------------------------------------------ build
+    def rebuild(self, tile_map: List[List[int]]) -> None:
+        """Redraw the whole layer, e.g. after the map was replaced."""
+        self.tile_map = tile_map
+        self._draw_background(None)
+        for y, row in enumerate(tile_map):
+            for x, tile in enumerate(row):
+                self._draw_tile(x, y, tile)
+
+    def update_tile(self, x: int, y: int, tile: int) -> None:
+        """Patch a single cell after ``tile_map[y][x]`` changed."""
+        rect = pygame.Rect(x * config.GRID_SIZE, y * config.GRID_SIZE, config.GRID_SIZE, config.GRID_SIZE)
+        self._draw_background(rect)
+        self._draw_tile(x, y, tile)
+
+    def _draw_background(self, clip: Optional[pygame.Rect]) -> None:
+        surface = self.surface
+        surface.set_clip(clip)
+        surface.fill(config.COLOR_WHITE)
+        if self.background is not None:
+            surface.blit(self.background, (0, 0))
+        else:
+            for line in range((config.SCREEN_WIDTH // config.GRID_SIZE) + 1):
+                pygame.draw.line(surface, config.COLOR_BLACK, (line * config.GRID_SIZE, 30),
+                                 (line * config.GRID_SIZE, config.SCREEN_HEIGHT))
+            for line in range((config.SCREEN_HEIGHT // config.GRID_SIZE) - 1):
+                pygame.draw.line(surface, config.COLOR_BLACK, (0, line * config.GRID_SIZE + 30),
+                                 (config.SCREEN_WIDTH, line * config.GRID_SIZE + 30))
+        surface.set_clip(None)
+
+    def _draw_tile(self, x: int, y: int, tile: int) -> None:
+        px, py = x * config.GRID_SIZE, y * config.GRID_SIZE
+        if tile in (config.GROUND, config.PORTAL_BLUE, config.PORTAL_RED) and self.background is None:
+            color = config.COLOR_DARK_GREEN if (x + y) % 2 == 0 else config.COLOR_LIGHT_GREEN
+            pygame.draw.rect(self.surface, color, (px, py, config.GRID_SIZE, config.GRID_SIZE))
+        image = self.tile_images.get(tile)
+        if image is not None:
+            self.surface.blit(image, (px, py))
+
+    # ------------------------------------------------------------------ draw
+    def draw(self, screen: pygame.Surface) -> None:
+        screen.blit(self.surface, (0, 0))
@@ -0,0 +1,223 @@
+import config
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+Addr = Tuple[str, int]
+Command = Tuple[int, str]   # (input seq, action)
+PlayerEntry = List[int]     # [tile x, tile y, direction, health, bombs left, max bombs, power, freeze (1/10 s)]
+SnapshotState = Dict[str, PlayerEntry]
+
+# Host je autoritatívny: simuluje pohyb, bomby, zásahy aj power-upy všetkých hráčov.
+# Hosť posiela iba INPUT príkazy (s číslom), svoj pohyb si hneď predpovedá a keď príde
+# SNAPSHOT s číslom posledného spracovaného príkazu, vráti sa na pozíciu od hosta
+# a znovu prehrá príkazy, ktoré host ešte nevidel.
+
+ACTIONS = ("up", "down", "left", "right", "bomb")
+MOVES = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+SNAPSHOT_DIRECTIONS = ("idle", "up", "down", "left", "right")
+HISTORY = 32   # snapshots kept as delta baselines on both sides
+
+
+def player_entry(player, now_ms: int) -> PlayerEntry:
+    """Authoritative state of one Player as sent in SNAPSHOT."""
+    direction = SNAPSHOT_DIRECTIONS.index(player.current_direction) if player.current_direction in SNAPSHOT_DIRECTIONS else 0
+    freeze = max(0, player.freeze_timer - now_ms) // 100
+    return [
+        player.rect.x // config.GRID_SIZE, player.rect.y // config.GRID_SIZE, direction,
+        max(0, player.health), max(0, player.currentBomb), player.maxBombs, player.power, freeze,
+    ]
+
+
+class InputBuffer:
+    """Guest side: numbered commands not yet confirmed by the host.
+
+    Every INPUT packet repeats all of them (INPUT is unreliable and only the
+    newest one counts), so a lost packet costs nothing as long as a later one
+    arrives.
+    """
+
+    MAX_PENDING = 32
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.pending: List[Command] = []
+        self.dirty = False
+
+    def add(self, action: str) -> int:
+        self.seq += 1
+        self.pending.append((self.seq, action))
+        del self.pending[:-self.MAX_PENDING]
+        self.dirty = True
+        return self.seq
+
+    def acknowledge(self, seq: int) -> None:
+        while self.pending and self.pending[0][0] <= seq:
+            self.pending.pop(0)
+
+    def packet(self, snapshot_ack: int) -> dict:
+        self.dirty = False
+        return {"ack": snapshot_ack, "commands": [[seq, ACTIONS.index(action)] for seq, action in self.pending]}
+
+
+class SnapshotEncoder:
+    """Host side: per-guest SNAPSHOT data, delta-encoded against the newest snapshot that guest confirmed.
+
+    A snapshot goes out every interval even when nothing changed (it is a few
+    bytes then), so guests get an even timeline for interpolation.
+    """
+
+    def __init__(self) -> None:
+        self.tick = 0
+        self._sent: Dict[Addr, "OrderedDict[int, SnapshotState]"] = {}
+        self._baseline: Dict[Addr, int] = {}
+
+    def acknowledge(self, addr: Addr, tick: int) -> None:
+        if tick in self._sent.get(addr, ()) and tick > self._baseline.get(addr, 0):
+            self._baseline[addr] = tick
+
+    def next_tick(self) -> int:
+        self.tick += 1
+        return self.tick
+
+    def encode(self, addr: Addr, state: SnapshotState, input_ack: int, time_ms: int) -> dict:
+        """SNAPSHOT data for *addr* with only the players that changed; *time_ms* is the host's clock."""
+        sent = self._sent.setdefault(addr, OrderedDict())
+        base = self._baseline.get(addr, 0)
+        baseline = sent.get(base, {})
+        changed = {name: entry for name, entry in state.items() if baseline.get(name) != entry}
+        removed = [name for name in baseline if name not in state]
+
+        sent[self.tick] = {name: list(entry) for name, entry in state.items()}
+        while len(sent) > HISTORY:
+            oldest, _ = sent.popitem(last=False)
+            if oldest == self._baseline.get(addr):
+                self._baseline.pop(addr)   # guest fell too far behind, next one is a full snapshot
+        return {"tick": self.tick, "time": time_ms, "base": base, "ack": input_ack, "players": changed, "removed": removed}
+
+    def forget(self, addr: Addr) -> None:
+        self._sent.pop(addr, None)
+        self._baseline.pop(addr, None)
+
+
+class SnapshotDecoder:
+    """Guest side: rebuilds full snapshots from deltas and remembers them as baselines."""
+
+    def __init__(self) -> None:
+        self.latest = 0
+        self._history: "OrderedDict[int, SnapshotState]" = OrderedDict()
+
+    def decode(self, data: dict) -> Optional[SnapshotState]:
+        """Full state of a SNAPSHOT, None if it is old or its baseline is unknown."""
+        tick, base = data["tick"], data["base"]
+        if tick <= self.latest:
+            return None
+        if base and base not in self._history:
+            return None
+        state = {name: list(entry) for name, entry in self._history.get(base, {}).items()} if base else {}
+        state.update(data["players"])
+        for name in data.get("removed", ()):
+            state.pop(name, None)
+        self._history[tick] = state
+        while len(self._history) > HISTORY:
+            self._history.popitem(last=False)
+        self.latest = tick
+        return state
+
+
+class SnapshotClock:
+    """Maps the host's snapshot time onto the local clock.
+
+    The offset is the smallest (arrival - host time) of the recent snapshots,
+    i.e. the fastest delivery; packets that took longer simply wait in the
+    interpolation buffer a bit less.
+    """
+
+    WINDOW = 64
+
+    def __init__(self) -> None:
+        self._offsets: Deque[float] = deque(maxlen=self.WINDOW)
+        self.offset: Optional[float] = None
+
+    def observe(self, host_ms: float, local_ms: float) -> None:
+        self._offsets.append(local_ms - host_ms)
+        self.offset = min(self._offsets)
+
+    def to_host(self, local_ms: float) -> Optional[float]:
+        return None if self.offset is None else local_ms - self.offset
+
+
+class InterpolationBuffer:
+    """Timestamped tile positions of one remote player, drawn a fixed delay in the past.
+
+    Only position changes are kept as keyframes; a player slides into the next
+    cell during the last *step_time* ms before the keyframe that put it there,
+    so walking looks continuous no matter how the snapshots were spaced. Past
+    the newest sample (an underrun) a walking player keeps going for at most
+    *extrapolation_limit* ms and half a cell, then stops and waits.
+    """
+
+    def __init__(self, extrapolation_limit: float, step_time: float = config.MOVE_COOLDOWN, size: int = 16) -> None:
+        self.extrapolation_limit = extrapolation_limit
+        self.step_time = step_time
+        self._keys: Deque[Tuple[float, int, int, str]] = deque(maxlen=size)   # (time reached, x, y, direction)
+        self.newest: Optional[float] = None
+        self.underruns = 0       # times rendering ran past the newest sample
+        self.extrapolated = 0    # frames drawn from extrapolation
+        self.late = 0            # samples older than one already buffered
+        self._starved = False
+
+    def push(self, t: float, x: int, y: int, direction: str) -> None:
+        if self.newest is not None and t <= self.newest:
+            self.late += 1
+            return
+        self.newest = t
+        if self._keys and self._keys[-1][1:3] == (x, y):
+            return
+        self._keys.append((t, x, y, direction))
+
+    def sample(self, t: float) -> Optional[Tuple[float, float, str, bool]]:
+        """(x, y, direction, moving) to draw at host time *t*, None before the first sample."""
+        keys = self._keys
+        if not keys:
+            return None
+        if t >= self.newest:
+            if not self._starved:
+                self.underruns += 1
+                self._starved = True
+            return self._extrapolate(t)
+        self._starved = False
+
+        j = next((i for i, key in enumerate(keys) if key[0] > t), None)
+        if j is None:
+            _, x, y, direction = keys[-1]
+            return x, y, direction, False
+        if j == 0:
+            _, x, y, direction = keys[0]
+            return x, y, direction, False
+        (_, ax, ay, _), (bt, bx, by, direction) = keys[j - 1], keys[j]
+        start = max(keys[j - 1][0], bt - self.step_time)
+        if t <= start or self._jump(ax, ay, bx, by):
+            return ax, ay, direction, t > start
+        frac = (t - start) / (bt - start)
+        return ax + (bx - ax) * frac, ay + (by - ay) * frac, direction, True
+
+    def _extrapolate(self, t: float) -> Tuple[float, float, str, bool]:
+        keys = self._keys
+        lt, lx, ly, direction = keys[-1]
+        over = t - self.newest
+        # still walking at the newest sample (it was a keyframe), keep the pace for a moment
+        if len(keys) >= 2 and lt == self.newest and over <= self.extrapolation_limit:
+            pt, px, py, _ = keys[-2]
+            span = lt - max(pt, lt - self.step_time)
+            if span > 0 and not self._jump(px, py, lx, ly):
+                limit = config.GRID_SIZE / 2
+                dx = max(-limit, min(limit, (lx - px) / span * over))
+                dy = max(-limit, min(limit, (ly - py) / span * over))
+                self.extrapolated += 1
+                return lx + dx, ly + dy, direction, True
+        return lx, ly, direction, False
+
+    @staticmethod
+    def _jump(ax: float, ay: float, bx: float, by: float) -> bool:
+        """More than one cell apart: a teleport, not a step worth sliding through."""
+        return abs(bx - ax) + abs(by - ay) > config.GRID_SIZE * 1.5
@@ -1,8 +1,10 @@
 import pygame
 import config
-import time
 from game_objects.general.bomb import Bomb
+from game_objects.general.tile_group import TileGroup
 from managers.music_manager import MusicManager
+from managers.asset_manager import asset_manager
+from managers.time_manager import sim_clock
 from typing import Tuple, Union, List
 
 ColorLike = Union[pygame.Color, Tuple[int, int, int], Tuple[int, int, int, int]]
@@ -40,27 +42,20 @@ class Player(pygame.sprite.Sprite):
         self.current_direction = "idle"
         self.moving = False
         self.frame_index = config.FRAME_INDEX
-        self.last_anim_update = pygame.time.get_ticks()
+        self.last_anim_update = sim_clock.get_ticks()
         self.anim_fps = config.ANIM_FPS
         self.frame_duration = 1000 // self.anim_fps
         self.last_move_anim_time = 0  
+        # Remote players are drawn here instead of at rect (interpolated, see InterpolationBuffer)
+        self.render_pos: Tuple[int, int] | None = None
+        self.render_cell: Tuple[int, int] | None = None
 
         # ==================== Idle System ====================
-        self.idle_start = pygame.time.get_ticks()
+        self.idle_start = sim_clock.get_ticks()
         self.afk_delay = config.AFK_DELAY
 
-        # Load and scale images from config
-        self.images: dict[str, list[pygame.Surface]] = {}
-        for key, frames in config.PLAYER1_IMAGES.items():
-            if isinstance(frames, list):
-                self.images[key] = [
-                    pygame.transform.scale(f.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                    for f in frames
-                ]
-            else:
-                self.images[key] = [
-                    pygame.transform.scale(frames.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                ]
+        # Load and scale images from config (shared cache)
+        self.images: dict[str, list[pygame.Surface]] = self._base_frames()
 
         # Initialize image and position
         self.image = self.images["down"][0]
@@ -81,16 +76,20 @@ class Player(pygame.sprite.Sprite):
         self._apply_skin()
 
     # ==================== Skin & Hat ===================
+    @staticmethod
+    def _base_frames() -> dict[str, list[pygame.Surface]]:
+        """Scaled animation frames, shared by every player instance."""
+        size = (config.GRID_SIZE, config.GRID_SIZE)
+        return {
+            key: [asset_manager.load_image(path, size) for path in paths]
+            for key, paths in config.PLAYER1_IMAGE_PATHS.items()
+        }
+
     def _apply_skin(self):
-        color = self.player_color
-        for key, frames in config.PLAYER1_IMAGES.items():
-            tinted_frames = []
-            for frame in frames:
-                base = pygame.transform.scale(frame.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                tinted = base.copy()
-                tinted.fill(color, special_flags=pygame.BLEND_MULT)
-                tinted_frames.append(tinted)
-            self.images[key] = tinted_frames
+        # tinted frames come from the shared cache, players with the same color share them
+        size = (config.GRID_SIZE, config.GRID_SIZE)
+        for key, frames in self._base_frames().items():
+            self.images[key] = asset_manager.get_tinted_frames(("player_frame", 1, key, size), frames, self.player_color)
 
         self.image = self.images[self.current_direction][self.frame_index]
 
@@ -109,11 +108,11 @@ class Player(pygame.sprite.Sprite):
 
     # ==================== Gameplay Logic ====================
     def check_hit(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if not now - self.iframe_timer >= config.PLAYER_IFRAMES:
             return
 
-        if bool(pygame.sprite.spritecollide(self, self.explosion_group, False)):  # type: ignore[arg-type]
+        if self.explosion_group.has_tile(TileGroup.tile_of(self.rect)):
             self.iframe_timer = now
             self.music_manager.play_sound("hit", "level_volume")
             self.health -= 1
@@ -121,7 +120,7 @@ class Player(pygame.sprite.Sprite):
         return False
 
     def activate_powerup(self, powerup_type, duration=10):
-        now = time.time()
+        now = sim_clock.time()
 
         if powerup_type == "range_powerup":
             self.power += 1
@@ -131,16 +130,16 @@ class Player(pygame.sprite.Sprite):
         elif powerup_type == "freeze_powerup":
             for player in self.test_field.players.values():
                 if player.name != self.name:
-                    player.freeze_timer = pygame.time.get_ticks() + (duration * 1000)
+                    player.freeze_timer = sim_clock.get_ticks() + (duration * 1000)
         elif powerup_type == "live+_powerup":
             self.health = min(self.health + 1, config.PLAYER_MAX_HEALTH)
         elif powerup_type == "shield_powerup":
-            self.iframe_timer = pygame.time.get_ticks() + (duration * 1000)
+            self.iframe_timer = sim_clock.get_ticks() + (duration * 1000)
 
         self.active_powerups[powerup_type] = now + duration
 
     def update_powerups(self):
-        now = time.time()
+        now = sim_clock.time()
         expired = [powerup for powerup, expire_time in self.active_powerups.items() if now >= expire_time]
         for powerup in expired:
             del self.active_powerups[powerup]
@@ -155,92 +154,91 @@ class Player(pygame.sprite.Sprite):
         return self.maxBombs
 
     def handle_queued_keys(self, now):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         move_keys = self.move_keys
 
         move_delay = config.MOVE_COOLDOWN * 2 if now < self.freeze_timer else config.MOVE_COOLDOWN
 
         if now - self.last_move_time >= move_delay and self.held_down_keys:
             key = self.held_down_keys[-1]
+            action = None
             if key == move_keys[0]:
-                self.move(0, -1, "up", send_packet=True)
+                action = "up"
             elif key == move_keys[2]:
-                self.move(0, 1, "down", send_packet=True)
+                action = "down"
             elif key == move_keys[1]:
-                self.move(-1, 0, "left", send_packet=True)
+                action = "left"
             elif key == move_keys[3]:
-                self.move(1, 0, "right", send_packet=True)
+                action = "right"
             elif key == move_keys[4]:
-                self.deploy_bomb(self.bomb_group, self.explosion_group)
+                action = "bomb"
+            if action:
+                # host applies it right away, a guest predicts it and sends it to the host
+                self.test_field.handle_local_action(self, action)
 
             self.last_move_time = now
 
-    def move(self, dx, dy, direction, send_packet: bool = False):
-        new_x = self.rect.x + dx * config.GRID_SIZE
-        new_y = self.rect.y + dy * config.GRID_SIZE
-
-        bound_x = max(0, min(new_x, config.SCREEN_WIDTH - config.GRID_SIZE))
-        bound_y = max(0, min(new_y, config.SCREEN_HEIGHT - config.GRID_SIZE))
+    def step_target(self, dx, dy, position=None):
+        """Pixel position one step from *position* (default the current one), None when the step is blocked."""
+        x, y = position if position is not None else self.rect.topleft
+        bound_x = max(0, min(x + dx * config.GRID_SIZE, config.SCREEN_WIDTH - config.GRID_SIZE))
+        bound_y = max(0, min(y + dy * config.GRID_SIZE, config.SCREEN_HEIGHT - config.GRID_SIZE))
 
         # Check collision with map
         tile_type = self.test_field.tile_map[bound_y // config.GRID_SIZE][bound_x // config.GRID_SIZE]
         if tile_type in [1, 2, 3]:
-            self.moving = False
-            self.current_direction = direction
-            return
+            return None
 
         # Check for teleport tiles
         if tile_type in [4, 5]:
-            paired = self.find_paired_teleport(tile_type, bound_x, bound_y)
+            paired = self.find_paired_teleport(bound_x, bound_y)
             if paired:
                 bound_x, bound_y = paired
 
         # Check collision with bombs
-        future_rect = self.rect.copy()
-        future_rect.topleft = (bound_x, bound_y)
-        for bomb in self.bomb_group:
-            if not bomb.passable and bomb.rect.colliderect(future_rect):
-                self.moving = False
-                self.current_direction = direction
-                return
-
-        # Move and sync position
-        self.rect.topleft = (bound_x, bound_y)
+        for bomb in self.bomb_group.at((bound_x // config.GRID_SIZE, bound_y // config.GRID_SIZE)):
+            if not bomb.passable:
+                return None
+        return bound_x, bound_y
+
+    def move(self, dx, dy, direction):
+        target = self.step_target(dx, dy)
+        if target is None:
+            self.moving = False
+            self.current_direction = direction
+            return
+        self.set_position(*target, direction)
+
+    def set_position(self, x, y, direction):
+        """Place the player on pixel position (x, y) and start the walk animation."""
+        self.rect.topleft = (x, y)
         self.moving = True
         self.current_direction = direction
-        self.idle_start = pygame.time.get_ticks()
+        self.idle_start = sim_clock.get_ticks()
         num_frames = len(self.images.get(direction, self.images["idle"]))
-        self.last_move_anim_time = pygame.time.get_ticks() + (num_frames * (1000 // self.anim_fps))
+        self.last_move_anim_time = sim_clock.get_ticks() + (num_frames * (1000 // self.anim_fps))
         self.music_manager.play_sound("walk", "walk_volume")
 
-        if send_packet:
-            packet_data = {
-                "player_name": self.name,
-                "direction": self.current_direction
-            }
-            self.test_field.send_packet('PLAYER_UPDATE', packet_data)
-
     def deploy_bomb(self, bomb_group, explosion_group):
+        """Place a bomb (host only, guests get it through BOMB_UPDATE)."""
         if self.currentBomb > 0:
             self.currentBomb -= 1
             Bomb(self, bomb_group, explosion_group, self.test_field)
-            packet_data = {'player_name': self.name}
+            packet_data = {
+                'player_name': self.name,
+                'x': self.rect.x // config.GRID_SIZE,
+                'y': self.rect.y // config.GRID_SIZE,
+            }
             self.test_field.send_packet('BOMB_UPDATE', packet_data)
 
-    def find_paired_teleport(self, teleport_type, current_x, current_y):
-        tiles = []
-        for y, row in enumerate(self.test_field.tile_map):
-            for x, tile in enumerate(row):
-                if tile == teleport_type:
-                    tile_x = x * config.GRID_SIZE
-                    tile_y = y * config.GRID_SIZE
-                    if tile_x == current_x and tile_y == current_y:
-                        continue
-                    tiles.append((tile_x, tile_y))
-        return tiles[0] if tiles else None
+    def find_paired_teleport(self, current_x, current_y):
+        paired = self.test_field.special_tiles.paired_teleport(current_x // config.GRID_SIZE, current_y // config.GRID_SIZE)
+        if paired is None:
+            return None
+        return paired[0] * config.GRID_SIZE, paired[1] * config.GRID_SIZE
 
     def update_animation(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         anim_key = self.current_direction if self.moving else "idle"
 
         if anim_key not in self.images:
@@ -1,8 +1,9 @@
 import pygame
 import random
 import config
-import time
 import os  # Import os directly
+from managers.asset_manager import asset_manager
+from managers.time_manager import sim_clock
 
 
 class PowerUp(pygame.sprite.Sprite):
@@ -26,13 +27,12 @@ class PowerUp(pygame.sprite.Sprite):
             image_path = f"assets/power_ups/{self.type}.png"
             # Try to load the image, but if the file doesn't exist, create a fallback
             if os.path.exists(image_path):
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (config.GRID_SIZE, config.GRID_SIZE))
+                self.image = asset_manager.load_image(image_path, (config.GRID_SIZE, config.GRID_SIZE))
             else:
-                self.image = self.create_fallback_image()
+                self.image = asset_manager.get_surface(("powerup_fallback", __name__, self.type), self.create_fallback_image)
         except (pygame.error, FileNotFoundError):
             # If loading fails for any reason, use a fallback image
-            self.image = self.create_fallback_image()
+            self.image = asset_manager.get_surface(("powerup_fallback", __name__, self.type), self.create_fallback_image)
 
         # Position the power-up
         self.rect = self.image.get_rect()
@@ -40,7 +40,7 @@ class PowerUp(pygame.sprite.Sprite):
         self.rect.y = y * config.GRID_SIZE
 
         # Set power-up properties
-        self.reveal_time = time.time()
+        self.reveal_time = sim_clock.time()
         self.field_duration = 30  # Power-up remains on the field for 30 seconds
         self.collected = False
         self.effect_duration = 30  # Duration of effect in seconds after collection
@@ -76,12 +76,12 @@ class PowerUp(pygame.sprite.Sprite):
         return image
 
     def update(self):
-        if not self.hidden and not self.collected and time.time() - self.reveal_time > self.field_duration:
+        if not self.hidden and not self.collected and sim_clock.time() - self.reveal_time > self.field_duration:
             self.kill()
 
     def reveal(self):
         self.hidden = False
-        self.reveal_time = time.time()
+        self.reveal_time = sim_clock.time()
 
     def apply_effect(self, player):
         self.collected = True
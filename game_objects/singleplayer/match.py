@@ -0,0 +1,264 @@
+import copy
+import random
+import config
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from game_objects.general.blast import blast_cells
+from maps.special_tiles import SpecialTileIndex
+
+# Pravidlá zápasu dvoch hráčov bez surface, zvukov a displeja. TestField ich len poháňa vstupmi
+# a vykresľuje (sprity čítajú stav odtiaľto), headless runner (headless/match.py) ich volá priamo.
+# Čas zápasu beží v pevných krokoch: posúva ho iba tick(), takže počas pauzy stojí a výsledok
+# závisí len od mapy, rng a vstupov.
+
+Tile = Tuple[int, int]
+
+ACTIONS = ("up", "down", "left", "right", "bomb")
+MOVES = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+SPAWN_TILES = {name: (x // config.GRID_SIZE, y // config.GRID_SIZE) for name, (x, y) in config.SPAWN_POINTS.items()}
+
+BOMB_FUSE = 3.0
+EXPLOSION_LIFETIME = 0.5
+POWERUP_EXPLOSION_GRACE = 1.0   # výbuch, ktorý power-up odkryl, ho ešte nezničí
+TRAP_COOLDOWN = 1.0
+DARKNESS_DURATION = 15
+POWERUP_TYPES = ["bomb_powerup", "range_powerup", "freeze_powerup", "live+_powerup", "shield_powerup"]
+
+
+@dataclass(eq=False)
+class MatchPlayer:
+    player_id: int
+    x: int
+    y: int
+    health: int = config.HEALTH
+    max_bombs: int = config.MAXBOMBS
+    current_bomb: int = config.CURRENTBOMB
+    power: int = config.POWER
+    last_move_ms: int = config.LAST_MOVE_TIME
+    freeze_until: float = config.FREEZE_TIMER
+    last_trap_time: float = config.LAST_TRAP_TIME
+    hit_this_tick: bool = False
+    active_powerups: Dict[str, float] = field(default_factory=dict)   # type -> expire time
+
+
+@dataclass(eq=False)
+class MatchBomb:
+    owner: MatchPlayer
+    x: int
+    y: int
+    power: int
+    fuse_time: float
+    passable: bool = False
+
+
+@dataclass(eq=False)
+class MatchExplosion:
+    owner: MatchPlayer
+    x: int
+    y: int
+    start_time: float
+
+
+@dataclass(eq=False)
+class MatchPowerUp:
+    type: str
+    x: int
+    y: int
+    reveal_time: float
+
+
+class MatchEvent(NamedTuple):
+    """Something that happened during the last tick: "moved", "exploded", "tile", "hit", "shielded" or "pickup"."""
+    kind: str
+    player: Optional[MatchPlayer] = None
+    value: Any = None
+
+
+class Match:
+    """Two-player match state plus a tick() that advances it by one simulation step.
+
+    Movement, bombs and their fuse, explosions, power-ups, sewer traps and the
+    win check all live here. What happened during the last tick is listed in
+    *events*, for the sounds and messages of whoever draws the match.
+
+    "What is on this tile" is a dictionary lookup: *bombs* and *powerups*
+    are keyed by tile and *explosion_tiles* holds the burning tiles.
+    """
+
+    def __init__(self, tile_map: List[List[int]], map_name: str = "Classic", rng: Optional[random.Random] = None,
+                 step: float = 1.0 / config.SIMULATION_FPS):
+        self.map_name = map_name
+        self.rng = rng if rng is not None else random.Random()
+        self.tile_map = copy.deepcopy(tile_map)
+        self.special_tiles = SpecialTileIndex(self.tile_map)
+
+        self.step = step
+        self.ticks = 0
+        self.now = 0.0
+
+        self.players = [MatchPlayer(1, *SPAWN_TILES["spawn1"]), MatchPlayer(2, *SPAWN_TILES["spawn4"])]
+        self.bombs: Dict[Tile, MatchBomb] = {}   # na políčku môže byť najviac jedna bomba
+        self.explosions: List[MatchExplosion] = []
+        self.explosion_tiles: set[Tile] = set()
+        self.powerups: Dict[Tile, MatchPowerUp] = {}
+        self.hidden_powerups: Dict[Tile, str] = {}
+        self.darkness_until = config.DARKNESS_TIMER
+        self.winner: Optional[int] = None
+        self.events: List[MatchEvent] = []
+
+        self.available_powerups = list(POWERUP_TYPES)
+        if map_name == "Crystal Caves":
+            self.available_powerups.append("darkness_powerup")
+        self.place_hidden_powerups()
+
+    @property
+    def over(self) -> bool:
+        return self.winner is not None
+
+    @property
+    def darkness_active(self) -> bool:
+        return self.now < self.darkness_until
+
+    # ------------------------------------------------------------------ setup
+    def place_hidden_powerups(self) -> None:
+        bricks = [(x, y) for y, row in enumerate(self.tile_map) for x, tile in enumerate(row) if tile == config.BRICK]
+        count = int(len(bricks) * config.POWERUP_SPAWNING_RATE)
+        for pos in self.rng.sample(bricks, min(count, len(bricks))):
+            self.hidden_powerups[pos] = self.rng.choice(self.available_powerups)
+
+    # ------------------------------------------------------------------ tick
+    def tick(self, actions: Dict[int, Optional[str]]) -> None:
+        """Advance one step. *actions* maps player_id to a held action from ACTIONS (or None)."""
+        if self.over:
+            return
+        self.events = []
+        self.ticks += 1
+        self.now = self.ticks * self.step
+        now_ms = int(self.now * 1000)
+
+        for player in self.players:
+            self.handle_action(player, actions.get(player.player_id), now_ms)
+            for powerup_type in [p for p, t in player.active_powerups.items() if self.now >= t]:
+                del player.active_powerups[powerup_type]
+
+        for bomb in [b for b in self.bombs.values() if self.now >= b.fuse_time]:
+            self.explode(bomb)
+        self.explosions = [e for e in self.explosions if self.now - e.start_time <= EXPLOSION_LIFETIME]
+        self.explosion_tiles = {(e.x, e.y) for e in self.explosions}
+
+        self.handle_explosions()
+        self.check_powerup_collisions()
+        self.powerups = {pos: p for pos, p in self.powerups.items()
+                         if self.now - p.reveal_time <= config.FIELD_DURATION
+                         and not (pos in self.explosion_tiles and self.now - p.reveal_time >= POWERUP_EXPLOSION_GRACE)}
+        self.check_trap_collisions()
+
+    def handle_action(self, player: MatchPlayer, action: Optional[str], now_ms: int) -> None:
+        move_delay = config.MOVE_COOLDOWN * 2 if self.now < player.freeze_until else config.MOVE_COOLDOWN
+        if action is None or now_ms - player.last_move_ms < move_delay:
+            return
+        if action == "bomb":
+            self.deploy_bomb(player)
+        elif action in MOVES:
+            self.move(player, *MOVES[action])
+        player.last_move_ms = now_ms
+
+    def move(self, player: MatchPlayer, dx: int, dy: int) -> bool:
+        x = max(0, min(player.x + dx, config.GRID_WIDTH - 1))
+        y = max(0, min(player.y + dy, config.GRID_HEIGHT - 1))
+        tile = self.tile_map[y][x]
+        if tile in (config.WALL, config.BRICK, config.MENU):
+            return False
+        if tile in (config.PORTAL_BLUE, config.PORTAL_RED):
+            x, y = self.special_tiles.paired_teleport(x, y) or (x, y)
+        bomb = self.bombs.get((x, y))
+        if bomb is not None and not bomb.passable:
+            return False
+        player.x, player.y = x, y
+        self.events.append(MatchEvent("moved", player))
+        return True
+
+    def deploy_bomb(self, player: MatchPlayer) -> None:
+        if player.current_bomb <= 0 or (player.x, player.y) in self.bombs:
+            return
+        self.bombs[(player.x, player.y)] = MatchBomb(player, player.x, player.y, player.power, self.now + BOMB_FUSE)
+        player.current_bomb -= 1
+
+    def explode(self, bomb: MatchBomb) -> None:
+        for x, y, destroys_brick in blast_cells(self.tile_map, bomb.x, bomb.y, bomb.power):
+            if destroys_brick:
+                self.destroy_tile(x, y)
+            self.explosions.append(MatchExplosion(bomb.owner, x, y, self.now))
+        bomb.owner.current_bomb += 1
+        del self.bombs[(bomb.x, bomb.y)]
+        self.events.append(MatchEvent("exploded", bomb.owner, (bomb.x, bomb.y)))
+
+    def destroy_tile(self, x: int, y: int) -> None:
+        if self.tile_map[y][x] != config.BRICK:
+            return
+        powerup_type = self.hidden_powerups.pop((x, y), None)
+        if powerup_type is not None:
+            self.powerups[(x, y)] = MatchPowerUp(powerup_type, x, y, self.now)
+        self.tile_map[y][x] = config.GROUND
+        self.special_tiles.set_tile(x, y, config.GROUND)
+        self.events.append(MatchEvent("tile", value=(x, y, config.GROUND)))
+
+    # ------------------------------------------------------------------ rules
+    def handle_explosions(self) -> None:
+        for player in self.players:
+            if (player.x, player.y) not in self.explosion_tiles:
+                player.hit_this_tick = False
+                continue
+            if not player.hit_this_tick:
+                if player.active_powerups.get("shield_powerup", 0) > self.now:
+                    self.events.append(MatchEvent("shielded", player))
+                else:
+                    player.health = max(0, player.health - 1)
+                    self.events.append(MatchEvent("hit", player))
+                    if player.health <= 0:
+                        self.end(player)
+                        return
+            player.hit_this_tick = True
+
+    def check_powerup_collisions(self) -> None:
+        for player in self.players:
+            powerup = self.powerups.pop((player.x, player.y), None)
+            if powerup is not None:
+                self.apply_powerup(player, powerup.type)
+                self.events.append(MatchEvent("pickup", player, powerup.type))
+
+    def apply_powerup(self, player: MatchPlayer, powerup_type: str) -> None:
+        if powerup_type == "darkness_powerup":
+            self.darkness_until = self.now + DARKNESS_DURATION
+            return
+        duration = config.POWERUP_DURATIONS.get(powerup_type, 10)
+        if powerup_type == "bomb_powerup":
+            if player.max_bombs >= config.MAX_BOMB_LIMIT:
+                return
+            player.max_bombs += 1
+            player.current_bomb += 1
+        elif powerup_type == "range_powerup":
+            player.power += 1
+        elif powerup_type == "freeze_powerup":
+            self.opponent(player).freeze_until = self.now + duration
+        elif powerup_type == "live+_powerup":
+            player.health = min(player.health + 1, config.PLAYER_MAX_HEALTH)
+        player.active_powerups[powerup_type] = self.now + duration
+
+    def check_trap_collisions(self) -> None:
+        for player in self.players:
+            if not self.special_tiles.is_sewer(player.x, player.y) or self.now - player.last_trap_time <= TRAP_COOLDOWN:
+                continue
+            player.health = max(0, player.health - 1)
+            player.last_trap_time = self.now
+            if player.health <= 0:
+                self.end(player)
+                return
+
+    def opponent(self, player: MatchPlayer) -> MatchPlayer:
+        return self.players[1] if player is self.players[0] else self.players[0]
+
+    def end(self, loser: MatchPlayer) -> None:
+        if self.winner is None:
+            self.winner = self.opponent(loser).player_id
@@ -0,0 +1,32 @@
+import pygame
+import config
+
+from game_objects.general.bomb import bomb_image, explosion_images
+from game_objects.singleplayer.match import MatchBomb, MatchExplosion
+
+# Sprity bômb a výbuchov singleplayer zápasu: len kreslia objekt z Match, o jeho živote
+# (fuse, dĺžka výbuchu) rozhoduje jadro - TestField ich pridáva a odoberá podľa neho.
+
+
+class BombSprite(pygame.sprite.Sprite):
+    def __init__(self, bomb: MatchBomb, bomb_skin="Classic"):
+        super().__init__()
+        self.bomb = bomb
+        self.image = bomb_image(bomb_skin)
+        self.rect = self.image.get_rect(topleft=(bomb.x * config.GRID_SIZE, bomb.y * config.GRID_SIZE))
+
+
+class ExplosionSprite(pygame.sprite.Sprite):
+    SWITCH_AFTER = 0.25   # prestup na image_c po 0.25s
+
+    def __init__(self, explosion: MatchExplosion, explosion_skin="Classic"):
+        super().__init__()
+        self.explosion = explosion
+        self.image_a, self.image_c = explosion_images(explosion_skin)
+        self.image = self.image_a
+        self.rect = self.image.get_rect(topleft=(explosion.x * config.GRID_SIZE, explosion.y * config.GRID_SIZE))
+
+    def update(self, now):
+        """Show the second frame once the explosion is SWITCH_AFTER seconds old (match time)."""
+        if now >= self.explosion.start_time + self.SWITCH_AFTER:
+            self.image = self.image_c
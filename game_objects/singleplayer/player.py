@@ -1,9 +1,9 @@
 import pygame
 import config
 import os
-import time
-from game_objects.general.bomb import Bomb
-from managers.music_manager import MusicManager
+from game_objects.singleplayer.match import MatchPlayer
+from managers.asset_manager import asset_manager
+from managers.time_manager import sim_clock
 from typing import Optional, Tuple, Union, List
 
 ColorLike = Union[pygame.Color, Tuple[int, int, int], Tuple[int, int, int, int]]
@@ -11,35 +11,19 @@ SkinPayload = Union[None, ColorLike, Tuple[ColorLike, str]]
 
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, player_id: int, starting_location: str | tuple, test_field, skin: SkinPayload = None):
+    """Sprite of one MatchPlayer: turns held keys into a Match action and draws the player's state."""
+
+    def __init__(self, state: MatchPlayer, skin: SkinPayload = None):
         super().__init__()
 
-        self.player_id = player_id
+        self.state = state
+        self.player_id = state.player_id
         self.skin = skin
-        self.test_field = test_field
-        self.music_manager = MusicManager()
-        self.bomb_group = self.test_field.bomb_group
-        self.explosion_group = self.test_field.explosion_group
 
         if self.player_id not in config.PLAYER_CONFIG:
             raise ValueError(f"Invalid player id {self.player_id}")
 
-        # Gameplay premenné
-        self.health = config.HEALTH
-        self.max_bomb_limit = config.MAX_BOMB_LIMIT
-        self.currentBomb = config.CURRENTBOMB
-        self.maxBombs = config.MAXBOMBS
-        self.power = config.POWER
-        self.queued_keys: List[int] = []
         self.held_down_keys: List[int] = []
-        self.last_move_time = config.LAST_MOVE_TIME
-        self.score = config.SCORE
-        self.last_trap_time = config.LAST_TRAP_TIME
-
-        # Power-upy
-        self.active_powerups: dict[str, float] = {}
-        self.freeze_timer = config.FREEZE_TIMER
-        self.iframe_timer = config.IFRAME_TIMER
 
         # Animácie
         self.player_config = config.PLAYER_CONFIG[self.player_id]
@@ -47,34 +31,21 @@ class Player(pygame.sprite.Sprite):
         self.current_direction = "idle"
         self.moving = False
         self.frame_index = config.FRAME_INDEX
-        self.last_anim_update = pygame.time.get_ticks()
+        self.last_anim_update = sim_clock.get_ticks()
         self.anim_fps = config.ANIM_FPS
         self.frame_duration = 1000 // self.anim_fps
 
         # Idle systém
-        self.idle_start = pygame.time.get_ticks()
+        self.idle_start = sim_clock.get_ticks()
         self.afk_delay = config.AFK_DELAY
 
         # Načítanie obrázkov z configu do self.images
-        self.images: dict[str, list[pygame.Surface]] = {}
-        for key, frames in self.player_config["images"].items():
-            if isinstance(frames, list):
-                self.images[key] = [
-                    pygame.transform.scale(f.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                    for f in frames
-                ]
-            else:
-                self.images[key] = [
-                    pygame.transform.scale(frames.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                ]
+        self.images: dict[str, list[pygame.Surface]] = self._base_frames()
 
         # Východzia snímka a pozícia
         self.image = self.images["down"][0]
         self.rect = self.image.get_rect()
-        if isinstance(starting_location, str):
-            self.rect.topleft = config.SPAWN_POINTS[starting_location]
-        else:
-            self.rect.topleft = starting_location
+        self.rect.topleft = (state.x * config.GRID_SIZE, state.y * config.GRID_SIZE)
 
         # --- Skin & Hat podpora ---
         self.hat: Optional[str] = None
@@ -128,143 +99,55 @@ class Player(pygame.sprite.Sprite):
 
         return None
 
+    def _base_frames(self) -> dict[str, list[pygame.Surface]]:
+        """Zmenšené snímky animácií zo zdieľanej cache (spoločné pre všetkých hráčov)."""
+        size = (config.GRID_SIZE, config.GRID_SIZE)
+        return {
+            key: [asset_manager.load_image(path, size) for path in paths]
+            for key, paths in self.player_config["image_paths"].items()
+        }
+
     def apply_skin(self):
         if not self.skin:
             return
 
-        color = self.skin
-        for key, frames in self.player_config["images"].items():
-            tinted_frames = []
-            iterable = frames if isinstance(frames, list) else [frames]
-            for frame in iterable:
-                base = pygame.transform.scale(frame.convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-                tinted = base.copy()
-                tinted.fill(color, special_flags=pygame.BLEND_MULT)
-                tinted_frames.append(tinted)
-            self.images[key] = tinted_frames
+        # zafarbené snímky zo zdieľanej cache, hráči s rovnakou farbou ich zdieľajú
+        size = (config.GRID_SIZE, config.GRID_SIZE)
+        for key, frames in self._base_frames().items():
+            self.images[key] = asset_manager.get_tinted_frames(("player_frame", self.player_id, key, size), frames, self.skin)
 
         self.image = self.images[self.current_direction][self.frame_index]
 
-    # ------------------------------------------------------------------ gameplay
-    def check_hit(self):
-        now = time.time()
-        if not now - self.iframe_timer >= config.PLAYER_IFRAMES:
-            return
-        if bool(pygame.sprite.spritecollide(self, self.explosion_group, False)):
-            self.iframe_timer = time.time()
-            self.music_manager.play_sound("hit", "level_volume")
-            self.health -= 1
-            return True
-        return False
-
-    def activate_powerup(self, powerup_type, duration=10):
-        now = time.time()
-        if powerup_type == "range_powerup":
-            self.power += 1
-        elif powerup_type == "bomb_powerup":
-            self.maxBombs += 1
-            self.currentBomb += 1
-        elif powerup_type == "freeze_powerup":
-            other_player = self.test_field.player2 if self.player_id == 1 else self.test_field.player1
-            other_player.freeze_timer = time.time() + duration
-        elif powerup_type == "live+_powerup":
-            self.health = min(self.health + 1, config.PLAYER_MAX_HEALTH)
-        elif powerup_type == "shield_powerup":
-            self.iframe_timer = now + duration
-        self.active_powerups[powerup_type] = now + duration
-
-    def update_powerups(self):
-        now = time.time()
-        expired = [p for p, t in self.active_powerups.items() if now >= t]
-        for p in expired:
-            del self.active_powerups[p]
+    # ------------------------------------------------------------------ stav zo zápasu
+    @property
+    def active_powerups(self) -> dict[str, float]:
+        return self.state.active_powerups
 
     def get_player_location(self):
         return self.rect.x, self.rect.y
 
     def get_health(self) -> int:
-        return self.health
+        return self.state.health
 
     def get_max_bombs(self) -> int:
-        return self.maxBombs
-
-    def handle_queued_keys(self, now):
-        now_ticks = pygame.time.get_ticks()
-        move_keys = self.move_keys
-
-        is_frozen = time.time() < self.freeze_timer
-        move_delay = config.MOVE_COOLDOWN * 2 if is_frozen else config.MOVE_COOLDOWN
-
-        if now_ticks - self.last_move_time >= move_delay and self.held_down_keys:
-            key = self.held_down_keys[-1]
-            if key == move_keys[0]:
-                self.move(0, -1, "up")
-            elif key == move_keys[2]:
-                self.move(0, 1, "down")
-            elif key == move_keys[1]:
-                self.move(-1, 0, "left")
-            elif key == move_keys[3]:
-                self.move(1, 0, "right")
-            elif key == move_keys[4]:
-                self.deploy_bomb(self.bomb_group, self.explosion_group)
-            self.last_move_time = now_ticks
-
-    def move(self, dx, dy, direction):
-        new_x = self.rect.x + dx * config.GRID_SIZE
-        new_y = self.rect.y + dy * config.GRID_SIZE
-
-        bound_x = max(0, min(new_x, config.SCREEN_WIDTH - config.GRID_SIZE))
-        bound_y = max(0, min(new_y, config.SCREEN_HEIGHT - config.GRID_SIZE))
-
-        tile_type = self.test_field.tile_map[bound_y // config.GRID_SIZE][bound_x // config.GRID_SIZE]
-        if tile_type in [1, 2, 3]:
-            self.moving = False
-            self.current_direction = direction
-            return
+        return self.state.max_bombs
 
-        if tile_type in [4, 5]:
-            paired = self.find_paired_teleport(tile_type, bound_x, bound_y)
-            if paired:
-                bound_x, bound_y = paired
-
-        future_rect = self.rect.copy()
-        future_rect.topleft = (bound_x, bound_y)
-        for bomb in self.bomb_group:
-            if not bomb.passable and bomb.rect.colliderect(future_rect):
-                self.moving = False
-                self.current_direction = direction
-                return
-
-        self.rect.topleft = (bound_x, bound_y)
-        self.moving = True
-        self.current_direction = direction
-        self.idle_start = pygame.time.get_ticks()
-        self.music_manager.play_sound("walk", "walk_volume")
-
-    def deploy_bomb(self, bomb_group, explosion_group):
-        if self.currentBomb > 0:
-            for bomb in bomb_group:
-                if bomb.rect.topleft == self.rect.topleft:
-                    return
-            Bomb(self, bomb_group, explosion_group, self.test_field, self.bomb, self.explosion)
-            self.currentBomb -= 1
-
-    def find_paired_teleport(self, teleport_type, current_x, current_y):
-        tiles = []
-        for y, row in enumerate(self.test_field.tile_map):
-            for x, tile in enumerate(row):
-                if tile == teleport_type:
-                    tile_x = x * config.GRID_SIZE
-                    tile_y = y * config.GRID_SIZE
-                    if tile_x == current_x and tile_y == current_y:
-                        continue
-                    tiles.append((tile_x, tile_y))
-        if tiles:
-            return tiles[0]
-        return None
+    def held_action(self) -> Optional[str]:
+        """Match action ("up", "left", "down", "right", "bomb") of the last held key, None when nothing is held."""
+        if not self.held_down_keys:
+            return None
+        key = self.held_down_keys[-1]
+        if key not in self.move_keys:
+            return None
+        return ("up", "left", "down", "right", "bomb")[self.move_keys.index(key)]
+
+    def sync(self):
+        """Move the sprite onto the player's tile and set the direction from the held keys."""
+        self.rect.topleft = (self.state.x * config.GRID_SIZE, self.state.y * config.GRID_SIZE)
+        self.update_movement_status()
 
     def update_animation(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         anim_key = self.current_direction if self.moving else "idle"
         if anim_key not in self.images:
             anim_key = "idle"
@@ -286,17 +169,11 @@ class Player(pygame.sprite.Sprite):
             frame = pygame.image.load(os.path.join("assets/player_animations", f"p_{self.player_id}_idle_{i}.png")).convert_alpha()
             self.idle_frames.append(pygame.transform.scale(frame, (frame.get_width()*8, frame.get_height()*8)))
         if self.skin and self.skin[0]:
-            self.idle_frames = [self.tint_image(f, self.skin[0]) for f in self.idle_frames]
+            key = ("player_idle", self.player_id, self.idle_frames[0].get_size())
+            self.idle_frames = asset_manager.get_tinted_frames(key, self.idle_frames, self.skin[0])
         self.image = self.idle_frames[0]
         self.rect = self.image.get_rect()
 
-    def tint_image(self, image, color):
-        tinted = image.copy()
-        tint = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        tint.fill((*color, 255))
-        tinted.blit(tint, (0, 0), special_flags=pygame.BLEND_MULT)
-        return tinted
-
     def update_movement_status(self):
         self.moving = False
         if self.held_down_keys:
@@ -1,13 +1,14 @@
 import pygame
 import random
 import config
-import time
 import os
 
-from game_objects.singleplayer import player 
+from managers.asset_manager import asset_manager
 
 
 class PowerUp(pygame.sprite.Sprite):
+    """Image of a revealed power-up; when it is picked up or expires is decided by the Match."""
+
     def __init__(self, x, y, powerup_type=None):
         super().__init__()
 
@@ -28,26 +29,17 @@ class PowerUp(pygame.sprite.Sprite):
         try:
             image_path = f"assets/power_ups/{self.type}.png"
             if os.path.exists(image_path):
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (25, 25))
+                self.image = asset_manager.load_image(image_path, (25, 25))
             else:
-                self.image = self.create_fallback_image()
+                self.image = asset_manager.get_surface(("powerup_fallback", __name__, self.type), self.create_fallback_image)
         except (pygame.error, FileNotFoundError):
-            self.image = self.create_fallback_image()
+            self.image = asset_manager.get_surface(("powerup_fallback", __name__, self.type), self.create_fallback_image)
 
         # pozícia pre power-up
         self.rect = self.image.get_rect()
         self.rect.x = x * config.GRID_SIZE
         self.rect.y = y * config.GRID_SIZE
 
-        # nastav vlastnosti pre efekty a časovače
-        self.reveal_time = time.time()
-        self.field_duration = config.FIELD_DURATION  # power-up sa objaví na určitý čas po zničení tehly
-        self.collected = False
-        self.effect_duration = config.EFFECT_DURATION
-        self.hidden = True  
-        self.frozen_until = config.FROZEN_UNTIL 
-
     def create_fallback_image(self):
         """Create a colored rectangle as fallback for missing images"""
         image = pygame.Surface((config.GRID_SIZE, config.GRID_SIZE))
@@ -79,46 +71,19 @@ class PowerUp(pygame.sprite.Sprite):
         image.blit(text, text_rect)
         return image
 
-    def update(self):
-        if not self.hidden:
-            # odstráni sa po čase
-            if time.time() - self.reveal_time > self.field_duration:
-                self.kill()
-
-    def reveal(self):
-        """Reveal the power-up when the brick hiding it is destroyed"""
-        self.hidden = False
-        self.reveal_time = time.time()  # Reset časovač pre zobrazenie
-
-    def apply_effect(self, player):
-        """Apply the power-up effect to the player who collected it"""
-        self.collected = True
-        if self.type == "bomb_powerup":
-            if player.maxBombs < player.max_bomb_limit:  # optional limit
-                player.activate_powerup("bomb_powerup")
-            return f"Player {player.player_id} can place more bombs permanently!"
-
-        elif self.type == "range_powerup":
-            player.activate_powerup('range_powerup')
-            return f"Player {player.player_id}'s explosion range increased permanently!"
-
-        elif self.type == "freeze_powerup":
-            # nastav efekt zamrazenia na určitý čas
-            freeze_duration = config.POWERUP_DURATIONS.get("freeze_powerup", 5)
-            player.activate_powerup("freeze_powerup", freeze_duration)
-            return f"Player {player.player_id} froze the opponent for {freeze_duration}s!"
-
-        elif self.type == "live+_powerup":
-            player.activate_powerup("live+_powerup")
-            return f"Player {player.player_id} gained an extra life!"
 
-        elif self.type == "shield_powerup":
-            # čiastočná nezraniteľnosť na určitý čas
-            shield_duration = config.POWERUP_DURATIONS.get("shield_powerup", 15)
-            player.activate_powerup("shield_powerup", shield_duration)
-            return f"Player {player.player_id} is invincible for {shield_duration}s!"
-
-        elif self.type == "darkness_powerup":
-            player.test_field.activate_darkness(15)
-            return "Darkness falls!"
-        return f"Player {player.player_id} collected a power-up!"
\ No newline at end of file
+def pickup_message(powerup_type, player_id):
+    """Message shown when player *player_id* picks up a power-up of *powerup_type*."""
+    if powerup_type == "bomb_powerup":
+        return f"Player {player_id} can place more bombs permanently!"
+    elif powerup_type == "range_powerup":
+        return f"Player {player_id}'s explosion range increased permanently!"
+    elif powerup_type == "freeze_powerup":
+        return f"Player {player_id} froze the opponent for {config.POWERUP_DURATIONS.get('freeze_powerup', 5)}s!"
+    elif powerup_type == "live+_powerup":
+        return f"Player {player_id} gained an extra life!"
+    elif powerup_type == "shield_powerup":
+        return f"Player {player_id} is invincible for {config.POWERUP_DURATIONS.get('shield_powerup', 15)}s!"
+    elif powerup_type == "darkness_powerup":
+        return "Darkness falls!"
+    return f"Player {player_id} collected a power-up!"
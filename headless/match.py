@@ -0,0 +1,46 @@
+import random
+
+from typing import Callable, Dict, List, Optional
+from game_objects.singleplayer.match import ACTIONS, MOVES, Match, MatchPlayer
+from maps.map_generator import generate_map
+
+# Headless zápas: to isté jadro pravidiel (game_objects/singleplayer/match.py), ktoré vykresľuje
+# TestField, len bez okna. Mapa aj power-upy idú zo seed-u, takže výsledok závisí len od seed-u a vstupov.
+
+__all__ = ["ACTIONS", "MOVES", "HeadlessMatch", "random_script", "run_match"]
+
+
+class HeadlessMatch(Match):
+    """Match on the map generated from *seed*, with power-ups hidden by the same seed."""
+
+    def __init__(self, map_name: str = "Classic", seed: int = 0, tile_map: Optional[List[List[int]]] = None):
+        rng = random.Random(seed)
+        super().__init__(tile_map if tile_map is not None else generate_map(map_name, seed), map_name, rng)
+
+
+Script = Callable[[HeadlessMatch, MatchPlayer], Optional[str]]
+
+
+def random_script(seed: int, bomb_chance: float = 0.05, hold_ticks: int = 20) -> Script:
+    """Bot that holds a random direction for a while and sometimes drops a bomb."""
+    rng = random.Random(seed)
+    state = {"action": None, "left": 0}
+
+    def script(match: HeadlessMatch, player: MatchPlayer) -> Optional[str]:
+        if rng.random() < bomb_chance:
+            return "bomb"
+        if state["left"] <= 0:
+            state["action"] = rng.choice(ACTIONS[:4] + (None,))
+            state["left"] = rng.randint(1, hold_ticks)
+        state["left"] -= 1
+        return state["action"]
+
+    return script
+
+
+def run_match(map_name: str, seed: int, scripts: Dict[int, Script], max_ticks: int = 60 * 60 * 5) -> HeadlessMatch:
+    """Play one match with scripted inputs until someone wins or *max_ticks* pass."""
+    match = HeadlessMatch(map_name, seed)
+    while not match.over and match.ticks < max_ticks:
+        match.tick({p.player_id: scripts[p.player_id](match, p) for p in match.players if p.player_id in scripts})
+    return match
@@ -0,0 +1,64 @@
+import argparse
+import sys
+import time
+import config
+
+from headless.match import HeadlessMatch, random_script
+
+# Soak test pravidiel bez okna: python -m headless.soak --matches 200
+
+
+def check_invariants(match: HeadlessMatch) -> list[str]:
+    errors = []
+    for player in match.players:
+        tag = f"tick {match.ticks} P{player.player_id}"
+        if not 0 <= player.health <= config.PLAYER_MAX_HEALTH:
+            errors.append(f"{tag}: health {player.health}")
+        if not 0 <= player.current_bomb <= player.max_bombs <= config.MAX_BOMB_LIMIT:
+            errors.append(f"{tag}: bombs {player.current_bomb}/{player.max_bombs}")
+        placed = sum(1 for bomb in match.bombs.values() if bomb.owner is player)
+        if placed + player.current_bomb != player.max_bombs:
+            errors.append(f"{tag}: {placed} placed + {player.current_bomb} left != {player.max_bombs}")
+        if match.tile_map[player.y][player.x] in (config.WALL, config.BRICK, config.MENU):
+            errors.append(f"{tag}: inside tile {match.tile_map[player.y][player.x]} at {(player.x, player.y)}")
+    return errors
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run scripted headless matches and check game invariants.")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=config.SIMULATION_FPS * 60 * 5)
+    parser.add_argument("--maps", nargs="*", default=list(config.MAP_FIXED_SPECIALS) or ["Classic"])
+    args = parser.parse_args(argv)
+
+    total_ticks = 0
+    wins = {1: 0, 2: 0, None: 0}
+    errors: list[str] = []
+    start = time.perf_counter()
+
+    for i in range(args.matches):
+        seed = args.seed + i
+        map_name = args.maps[i % len(args.maps)]
+        match = HeadlessMatch(map_name, seed)
+        scripts = {1: random_script(seed * 2 + 1), 2: random_script(seed * 2 + 2)}
+        while not match.over and match.ticks < args.max_ticks:
+            match.tick({p.player_id: scripts[p.player_id](match, p) for p in match.players})
+            match_errors = check_invariants(match)
+            if match_errors:
+                errors += [f"[{map_name} seed={seed}] {e}" for e in match_errors]
+                break
+        total_ticks += match.ticks
+        wins[match.winner] += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"[SOAK] {args.matches} matches, {total_ticks} ticks in {elapsed:.2f}s "
+          f"({total_ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"[SOAK] P1 wins: {wins[1]}, P2 wins: {wins[2]}, unfinished: {wins[None]}")
+    for error in errors:
+        print(f"[SOAK] FAIL {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,54 +2,88 @@ import os
 import pygame
 import config
 from typing import List, Dict
+from managers.asset_manager import asset_manager
+
+# Všetko ide cez asset_manager: každý obrázok sa načíta raz za beh a malé sprity
+# (dlaždice, ikony, power-upy, bomby, výbuchy, klobúky) sa berú z atlasu, ak je postavený.
+# tools/build_atlas.py balí práve cesty a veľkosti deklarované tu.
+TILE_SIZE = (config.GRID_SIZE, config.GRID_SIZE)
+ICON_SIZE = (30, 30)
+PREVIEW_SIZE = (48, 48)
+THUMB_SIZE = (36, 36)
+GAME_HAT_SIZE = (int(config.GRID_SIZE * config.HAT_SCALE_FACTOR),) * 2
+
+BACKGROUND_IMAGES = {
+    # Backgrounds
+    'cave_bg': "assets/backgrounds/map/cave-bg.png",
+    'grass_bg': "assets/backgrounds/map/grass-bg.png",
+    'ruins_bg': "assets/backgrounds/map/ruins_bg.png",
+    'sand_bg': "assets/backgrounds/map/sand-bg.png",
+    'urban_bg': "assets/backgrounds/map/urban_bg.png",
+    # Menu backgrounds
+    'menu_bg': "assets/backgrounds/menu/bg.png",
+    'pause_bg': "assets/backgrounds/menu/pause.png",
+    'skinselector_bg': "assets/backgrounds/menu/skinselector_bg.png",
+    'battlefield_bg': "assets/backgrounds/menu/battlefield-bg.png",
+    # Titles
+    'title': "assets/backgrounds/titles/bomber-man-text.png",
+}
+
+# Unbreakable and breakable tiles
+TILE_IMAGES = {
+    'unbreakable_stone': "assets/environment/stone-black.png",
+    'breakable_barrel': "assets/environment/barrel.png",
+    'breakable_bush': "assets/environment/bush.png",
+    'unbreakable_rock': "assets/environment/black-block-rock.png",
+    'breakable_rock': "assets/environment/rock.png",
+    'breakable_diamond': "assets/environment/diamond.png",
+    'breakable_cactus': "assets/environment/cactus.png",
+    'unbreakable_box': "assets/environment/box.png",
+    'breakable_wall': "assets/environment/wall.png",
+    'unbreakable_wall': "assets/environment/brick.png",
+    'blue_cave': "assets/environment/blue_cave.png",
+    'red_cave': "assets/environment/red_cave.png",
+    'trap_image': "assets/environment/manhole.png",
+}
+
+# Icons and other
+ICON_IMAGES = {
+    'heart_image': "assets/menu_items/heart.png",
+    'bomb_icon': "assets/player_bombs/classic_bomb.png",
+}
+
 
 def load_images():
     images = {}
-    
-    # Backgrounds
-    images['cave_bg'] = pygame.image.load("assets/backgrounds/map/cave-bg.png").convert_alpha()
-    images['grass_bg'] = pygame.image.load("assets/backgrounds/map/grass-bg.png").convert_alpha()
-    images['ruins_bg'] = pygame.image.load("assets/backgrounds/map/ruins_bg.png").convert_alpha()
-    images['sand_bg'] = pygame.image.load("assets/backgrounds/map/sand-bg.png").convert_alpha()
-    images['urban_bg'] = pygame.image.load("assets/backgrounds/map/urban_bg.png").convert_alpha()
 
-    # Menu backgrounds
-    images['menu_bg'] = pygame.image.load("assets/backgrounds/menu/bg.png").convert_alpha()
-    images['pause_bg'] = pygame.image.load("assets/backgrounds/menu/pause.png").convert_alpha()
-    images['skinselector_bg'] = pygame.image.load("assets/backgrounds/menu/skinselector_bg.png").convert_alpha()
-    images['battlefield_bg'] = pygame.image.load("assets/backgrounds/menu/battlefield-bg.png").convert_alpha()
+    for name, path in BACKGROUND_IMAGES.items():
+        images[name] = asset_manager.load_image(path)
+    for name, path in TILE_IMAGES.items():
+        images[name] = asset_manager.load_image(path, TILE_SIZE)
 
-    # Titles
-    images['title'] = pygame.image.load("assets/backgrounds/titles/bomber-man-text.png").convert_alpha()
-    # Unbreakable and breakable tiles
-    images['unbreakable_stone'] = pygame.transform.scale(pygame.image.load("assets/environment/stone-black.png").convert_alpha(), (30, 30))
-    images['breakable_barrel'] = pygame.transform.scale(pygame.image.load("assets/environment/barrel.png").convert_alpha(), (30, 30))
-    images['breakable_bush'] = pygame.transform.scale(pygame.image.load("assets/environment/bush.png").convert_alpha(), (30, 30))
-    images['unbreakable_rock'] = pygame.transform.scale(pygame.image.load("assets/environment/black-block-rock.png").convert_alpha(), (30, 30))
-    images['breakable_rock'] = pygame.transform.scale(pygame.image.load("assets/environment/rock.png").convert_alpha(), (30, 30))
-    images['breakable_diamond'] = pygame.transform.scale(pygame.image.load("assets/environment/diamond.png").convert_alpha(), (30, 30))
-    images['breakable_cactus'] = pygame.transform.scale(pygame.image.load("assets/environment/cactus.png").convert_alpha(), (30, 30))
-    images['unbreakable_box'] = pygame.transform.scale(pygame.image.load("assets/environment/box.png").convert_alpha(), (30, 30))
-    images['breakable_wall'] = pygame.transform.scale(pygame.image.load("assets/environment/wall.png").convert_alpha(), (30, 30))
-    images['unbreakable_wall'] = pygame.transform.scale(pygame.image.load("assets/environment/brick.png").convert_alpha(), (30, 30))
-    images['blue_cave'] = pygame.transform.scale(pygame.image.load("assets/environment/blue_cave.png").convert_alpha(), (30, 30))
-    images['red_cave'] = pygame.transform.scale(pygame.image.load("assets/environment/red_cave.png").convert_alpha(), (30, 30))
-    images['trap_image'] = pygame.transform.scale(pygame.image.load("assets/environment/manhole.png").convert_alpha(), (config.GRID_SIZE, config.GRID_SIZE))
-    
     # Player animations
     images['player_idle'] = [
-    pygame.image.load(f"assets/player_animations/p_1_idle_{i}.png").convert_alpha()
-    for i in range(3)]
-
-    # Icons and other
-    images['heart_image'] = pygame.image.load("assets/menu_items/heart.png").convert_alpha()
-    images['heart_image'] = pygame.transform.scale(images['heart_image'], (30, 30))
-    images["bomb_icon"] = pygame.image.load("assets/player_bombs/classic_bomb.png").convert_alpha()
-    images["bomb_icon"] = pygame.transform.scale(images["bomb_icon"], (30, 30))
-    
+        asset_manager.load_image(path) for path in config.PLAYER1_IMAGE_PATHS["idle"]
+    ]
+
+    for name, path in ICON_IMAGES.items():
+        images[name] = asset_manager.load_image(path, ICON_SIZE)
+
     return images
 
 
+def hat_path(file: str) -> str:
+    return os.path.join("assets/player_hats", file)
+
+
+def bomb_path(file: str) -> str:
+    return os.path.join("assets", "player_bombs", file)
+
+
+def explosion_path(file: str) -> str:
+    return os.path.join("assets", "player_explosions", file)
+
+
 def load_hat_images():
     hat_images = {}
     hat_thumbs = {}
@@ -63,11 +97,9 @@ def load_hat_images():
             hat_thumbs[name] = None
             continue
 
-        path = os.path.join("assets/player_hats", file)
-        img = pygame.image.load(path).convert_alpha()
-
-        hat_images[name] = pygame.transform.smoothscale(img, (48, 48))
-        hat_thumbs[name] = pygame.transform.smoothscale(img, (36, 36))
+        path = hat_path(file)
+        hat_images[name] = asset_manager.load_image(path, PREVIEW_SIZE, smooth=True)
+        hat_thumbs[name] = asset_manager.load_image(path, THUMB_SIZE, smooth=True)
 
     return hat_images, hat_thumbs
 
@@ -82,10 +114,7 @@ def load_game_hat_images():
             hat_images[name] = None
             continue
 
-        path = os.path.join("assets/player_hats", file)
-        img = pygame.image.load(path).convert_alpha()
-        game_size = int(config.GRID_SIZE * config.HAT_SCALE_FACTOR)
-        hat_images[name] = pygame.transform.smoothscale(img, (game_size, game_size))
+        hat_images[name] = asset_manager.load_image(hat_path(file), GAME_HAT_SIZE, smooth=True)
 
     return hat_images
 
@@ -94,20 +123,18 @@ def load_bomb_images():
     images, thumbs = {}, {}
     for bomb in config.BOMBS:
         name = bomb["name"]
-        path = os.path.join("assets", "player_bombs", bomb["file"])
+        path = bomb_path(bomb["file"])
         if os.path.exists(path):
-            img = pygame.image.load(path).convert_alpha()
-            images[name] = pygame.transform.scale(img, (48, 48))
-            thumbs[name]  = pygame.transform.scale(img, (36, 36))
+            images[name] = asset_manager.load_image(path, PREVIEW_SIZE)
+            thumbs[name] = asset_manager.load_image(path, THUMB_SIZE)
     return images, thumbs
 
 def load_explosion_images():
     images, thumbs = {}, {}
     for expl in config.EXPLOSIONS:
         name = expl["name"]
-        path = os.path.join("assets", "player_explosions", expl["file"])
+        path = explosion_path(expl["file"])
         if os.path.exists(path):
-            img = pygame.image.load(path).convert_alpha()
-            images[name] = pygame.transform.scale(img, (48, 48))
-            thumbs[name]  = pygame.transform.scale(img, (36, 36))
-    return images, thumbs
\ No newline at end of file
+            images[name] = asset_manager.load_image(path, PREVIEW_SIZE)
+            thumbs[name] = asset_manager.load_image(path, THUMB_SIZE)
+    return images, thumbs
@@ -1,12 +1,16 @@
 import config
 import os
+import logging
 import pygame
 from managers.state_manager import StateManager
+from managers.time_manager import sim_clock
+from managers.music_manager import MusicManager, sound_bank
 
 class BomberManApp:
     def __init__(self):
         pygame.init()
         pygame.mixer.init()
+        sound_bank.preload(MusicManager.SOUNDS)
 
         self.game_canvas = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
@@ -14,6 +18,9 @@ class BomberManApp:
         self.h1_font = pygame.font.Font(None, config.H1_SIZE)
         self.state_stack = []
         self.running = False
+        self.dirty_rect_rendering = config.DIRTY_RECT_RENDERING
+        self._last_rendered_state = None
+        self.render_alpha = 0.0  # how far (0..1) rendering is between the last and the next logic step
         self.photos_dir = os.path.join("assets")
         self.state_manager = StateManager(self)
         self.load_states()  # Load initial states
@@ -25,20 +32,49 @@ class BomberManApp:
     def run(self):
         clock = pygame.time.Clock()
         self.running = True
+        accumulator = 0.0
         while self.running:
-            clock.tick(60)  # FPS limit
+            frame_time = clock.tick(config.RENDER_FPS)  # render FPS limit, 0 = uncapped
+            accumulator += min(frame_time, config.MAX_FRAME_TIME)
             self.get_events()  # Handle input events
-            self.update()
+
+            # Logic runs in fixed steps, as many as fit into the elapsed time
+            steps = 0
+            while accumulator >= sim_clock.step_ms and steps < config.MAX_SIMULATION_STEPS:
+                self.update()
+                accumulator -= sim_clock.step_ms
+                steps += 1
+            if steps == config.MAX_SIMULATION_STEPS:
+                accumulator = min(accumulator, sim_clock.step_ms)  # too far behind, drop the rest
+
+            self.render_alpha = accumulator / sim_clock.step_ms
             self.render()  # Render current state
 
     def update(self):
+        """One fixed simulation step."""
+        sim_clock.advance()
+        sound_bank.next_frame()  # zvuky sa spúšťajú z update(), limit na efekt platí pre jeden krok
         current_stack = self.state_stack[-1]
         current_stack.update()
 
     def render(self):
-        self.state_stack[-1].render(self.game_canvas)
-        self.screen.blit(self.game_canvas, (0, 0))
-        pygame.display.flip()
+        state = self.state_stack[-1]
+        state.render(self.game_canvas)
+        dirty_rects = state.get_dirty_rects()
+
+        # Full frame: fallback mode, states without dirty tracking, or right after a state switch
+        if (not self.dirty_rect_rendering or dirty_rects is None
+                or state is not self._last_rendered_state
+                or len(dirty_rects) > config.MAX_DIRTY_RECTS):
+            self.screen.blit(self.game_canvas, (0, 0))
+            pygame.display.flip()
+        else:
+            screen_rect = self.screen.get_rect()
+            dirty_rects = [rect.clip(screen_rect) for rect in dirty_rects]
+            for rect in dirty_rects:
+                self.screen.blit(self.game_canvas, rect, rect)
+            pygame.display.update(dirty_rects)
+        self._last_rendered_state = state
 
     def load_states(self):
         self.state_manager.change_state("MainMenu")
@@ -59,6 +95,7 @@ class BomberManApp:
         screen.blit(text_surface, text_rect)
         
 if __name__ == '__main__':
+    logging.basicConfig(format="[%(levelname)s] %(name)s: %(message)s")
     app = BomberManApp()
     app.run()
     pygame.quit()
@@ -0,0 +1,128 @@
+import json
+import logging
+import mmap
+import struct
+import pygame
+from typing import Dict, Optional, Tuple
+from managers.atlas import SpriteKey, sprite_key, stale_sources, Size
+
+logger = logging.getLogger(__name__)
+
+# Archív = jeden súbor s hotovými pixelmi (už zmenšenými na veľkosti, ktoré hra používa)
+# a dekódovanými zvukovými efektmi, takže pri štarte sa nič nedekóduje ani neškáluje.
+# Rozloženie: MAGIC, dĺžka indexu (uint32), JSON index, bloby zarovnané na BLOB_ALIGN bajtov;
+# offsety v indexe sú od začiatku blobov (data_start); index si pamätá aj mtime a veľkosť
+# zdrojových súborov, položky zo zmenených súborov sa ignorujú.
+# Generuje ho tools/build_asset_archive.py.
+MAGIC = b"BMPAK\x00\x00\x02"
+HEADER = struct.Struct("<8sI")
+BLOB_ALIGN = 16
+PIXEL_FORMAT = "BGRA"   # poradie bajtov ARGB8888 na little-endian, t.j. formát convert_alpha
+
+
+def align(offset: int) -> int:
+    return -(-offset // BLOB_ALIGN) * BLOB_ALIGN
+
+
+def data_start(index_length: int) -> int:
+    return align(HEADER.size + index_length)
+
+
+class AssetArchive:
+    """Pre-scaled images and pre-decoded sound effects read straight from a memory map.
+
+    Image blobs become surfaces through pygame.image.frombuffer over the map
+    itself; when their layout already matches convert_alpha the surface is
+    used as is, so pixels are paged in on first blit instead of being decoded.
+    The map is copy-on-write, drawing onto a shared surface never touches the
+    file. Sounds are copied out of the map into mixer Sounds when the mixer
+    runs in the format they were decoded for. Without the archive every
+    lookup misses and callers fall back to the loose files, and so do lookups
+    of assets whose source file changed after the archive was built.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._images: Optional[Dict[SpriteKey, Tuple[int, Size]]] = None
+        self._sounds: Dict[str, Tuple[int, int]] = {}
+        self._mixer: Optional[Tuple[int, int, int]] = None
+        self._native: Optional[bool] = None
+        self.hits = 0
+
+    def _open(self) -> Dict[SpriteKey, Tuple[int, Size]]:
+        self._images = {}
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except FileNotFoundError:
+            return self._images
+        except (OSError, ValueError) as e:
+            logger.warning("[ARCHIVE] Could not map %s: %s", self.path, e)
+            return self._images
+        try:
+            magic, index_length = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise ValueError("not an asset archive of this version, rebuild it with tools/build_asset_archive.py")
+            index = json.loads(mapped[HEADER.size:HEADER.size + index_length])
+            if index["pixel_format"] != PIXEL_FORMAT:
+                raise ValueError(f"pixel format {index['pixel_format']}, expected {PIXEL_FORMAT}")
+            base = data_start(index_length)
+            stale = stale_sources(index["sources"])
+            images = {
+                sprite_key(image["path"], image["size"], image["smooth"]): (base + image["offset"], tuple(image["pixels"]))
+                for image in index["images"] if image["path"] not in stale
+            }
+            sounds = {
+                sprite_key(sound["path"], None, False)[0]: (base + sound["offset"], sound["length"])
+                for sound in index["sounds"] if sound["path"] not in stale
+            }
+            mixer = tuple(index["mixer"]) if index.get("mixer") else None
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            logger.warning("[ARCHIVE] Could not read %s: %s", self.path, e)
+            mapped.close()
+            return self._images
+        if stale:
+            logger.warning("[ARCHIVE] %d source files changed since %s was built, loading them from disk;"
+                           " rebuild it with tools/build_asset_archive.py", len(stale), self.path)
+        self._map, self._images, self._sounds, self._mixer = mapped, images, sounds, mixer
+        return self._images
+
+    def _is_native(self, surface: pygame.Surface) -> bool:
+        """Whether surfaces in PIXEL_FORMAT already have the layout convert_alpha would give them."""
+        if self._native is None:
+            reference = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+            self._native = surface.get_masks() == reference.get_masks() and surface.get_bitsize() == reference.get_bitsize()
+        return self._native
+
+    def get_image(self, path: str, size: Optional[Size] = None, smooth: bool = False, alpha: bool = True) -> Optional[pygame.Surface]:
+        """*path* scaled to *size* in display format, None when the archive does not have it."""
+        images = self._images if self._images is not None else self._open()
+        entry = images.get(sprite_key(path, size, smooth))
+        if entry is None:
+            return None
+        offset, pixels = entry
+        view = memoryview(self._map)[offset:offset + pixels[0] * pixels[1] * 4]
+        surface = pygame.image.frombuffer(view, pixels, PIXEL_FORMAT)
+        self.hits += 1
+        if not alpha:
+            return surface.convert()
+        return surface if self._is_native(surface) else surface.convert_alpha()
+
+    def get_sound(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """Pre-decoded sound effect, None when missing or decoded for a different mixer format."""
+        if self._images is None:
+            self._open()
+        entry = self._sounds.get(sprite_key(path, None, False)[0])
+        if entry is None or pygame.mixer.get_init() != self._mixer:
+            return None
+        offset, length = entry
+        self.hits += 1
+        return pygame.mixer.Sound(buffer=memoryview(self._map)[offset:offset + length])
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "images": len(self._images or ()),
+            "sounds": len(self._sounds),
+            "hits": self.hits,
+        }
@@ -0,0 +1,100 @@
+import pygame
+import config
+from managers.asset_archive import AssetArchive
+from managers.atlas import Atlas
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Size = Tuple[int, int]
+Color = Sequence[int]
+
+
+class AssetManager:
+    """Process-wide cache of converted (and scaled) surfaces.
+
+    Surfaces handed out by the cache are shared between sprites, so callers
+    must copy them before drawing onto them. Sprites found in the texture atlas
+    are subsurfaces of its sheets, other images come pre-scaled from the asset
+    archive and only what neither has is decoded from its own file.
+    """
+
+    def __init__(self) -> None:
+        self._surfaces: Dict[Hashable, pygame.Surface] = {}
+        self.archive = AssetArchive(config.ASSET_ARCHIVE)
+        self.atlas = Atlas(config.ATLAS_DIR, self.archive)
+        self.hits = 0
+        self.misses = 0
+
+    def get_surface(self, key: Hashable, factory: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """Return the surface stored under *key*, building it with *factory* on a miss."""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = factory()
+        self._surfaces[key] = surface
+        return surface
+
+    def load_image(self, path: str, size: Optional[Size] = None, *, alpha: bool = True, smooth: bool = False) -> pygame.Surface:
+        """Load *path* once, converted to display format and scaled to *size*."""
+        key = ("image", path, tuple(size) if size else None, alpha, smooth)
+        return self.get_surface(key, lambda: self._load(path, size, alpha, smooth))
+
+    def _load(self, path: str, size: Optional[Size], alpha: bool, smooth: bool) -> pygame.Surface:
+        # atlas hárky sú convert_alpha, nepriehľadné obrázky sa vždy čítajú zo súboru
+        packed = self.atlas.get(path, size, smooth) if alpha else None
+        if packed is None:
+            packed = self.archive.get_image(path, size, smooth, alpha)
+        if packed is not None:
+            return packed
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if alpha else image.convert()
+        if size and image.get_size() != tuple(size):
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            image = scale(image, size)
+        return image
+
+    # ---------------- Tinted frames ----------------
+    # Skins are the white base frames multiplied by the player's color. Every
+    # (color, frame key) pair is tinted once and shared by all players, previews
+    # and states that show it; *key* identifies the base frame, e.g.
+    # ("player_frame", 1, "down", size) plus the frame index.
+    def get_tinted(self, key: Hashable, base: pygame.Surface, color: Color) -> pygame.Surface:
+        """*base* multiplied by *color*, built once per (color, key)."""
+        rgb = tuple(color[:3])
+        return self.get_surface(("tinted", rgb, key), lambda: self.tint(base, rgb))
+
+    def get_tinted_frames(self, key: Hashable, frames: Sequence[pygame.Surface], color: Color) -> List[pygame.Surface]:
+        """One animation tinted with *color*, frame i stored under (key, i)."""
+        return [self.get_tinted((key, i), frame, color) for i, frame in enumerate(frames)]
+
+    def warm_tints(self, key: Hashable, frames: Sequence[pygame.Surface], colors: Iterable[Color]) -> None:
+        """Tint an animation for all *colors* up front (e.g. every color a picker can scroll through)."""
+        for color in colors:
+            self.get_tinted_frames(key, frames, color)
+
+    @staticmethod
+    def tint(base: pygame.Surface, color: Color) -> pygame.Surface:
+        tinted = base.copy()
+        tinted.fill((*color[:3], 255), special_flags=pygame.BLEND_MULT)
+        return tinted
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self._surfaces),
+            **{f"atlas_{name}": value for name, value in self.atlas.get_stats().items()},
+            **{f"archive_{name}": value for name, value in self.archive.get_stats().items()},
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self.reset_stats()
+
+
+asset_manager = AssetManager()
@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Size = Tuple[int, int]
+SpriteKey = Tuple[str, Optional[Size], bool]   # (path, size, smoothscale)
+
+# Atlas = pár PNG hárkov s už zmenšenými spritami + index.json s ich obdĺžnikmi.
+# Generuje ho tools/build_atlas.py, za behu sa z hárkov vyrezávajú subsurfaces.
+# Index si pamätá mtime a veľkosť každého zdrojového PNG; sprity zo zmenených súborov sa preskočia.
+INDEX_FILE = "index.json"
+VERSION = 2
+
+
+def sprite_key(path: str, size: Optional[Size], smooth: bool) -> SpriteKey:
+    """Lookup key of one packed sprite; paths are compared with forward slashes on every OS."""
+    return os.path.normpath(path).replace(os.sep, "/"), tuple(size) if size else None, smooth
+
+
+def source_stamp(path: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a source file as recorded in generated indexes, None when it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def stale_sources(sources: Dict[str, List[int]]) -> set:
+    """Paths from a {path: stamp} index whose file changed (or vanished) since it was recorded."""
+    return {path for path, stamp in sources.items() if source_stamp(path) != list(stamp)}
+
+
+class Atlas:
+    """Sprites packed by tools/build_atlas.py, handed out as subsurfaces of a few sheets.
+
+    The index is read on the first lookup and every sheet is loaded and
+    converted once, when the first of its sprites is requested (from *archive*
+    when it has the sheet). Without an index (the atlas was never built) every
+    lookup misses and callers load the loose file instead; so do lookups of
+    sprites whose source PNG changed after the atlas was built.
+    """
+
+    def __init__(self, directory: str, archive=None) -> None:
+        self.directory = directory
+        self.archive = archive
+        self._rects: Optional[Dict[SpriteKey, Tuple[str, pygame.Rect]]] = None
+        self._sheet_files: Dict[str, str] = {}
+        self._sheets: Dict[str, pygame.Surface] = {}
+
+    def _read_index(self) -> Dict[SpriteKey, Tuple[str, pygame.Rect]]:
+        self._rects = {}
+        path = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return self._rects
+        try:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != VERSION:
+                logger.warning("[ATLAS] %s has version %s, expected %s; rebuild it with tools/build_atlas.py",
+                               path, index.get('version'), VERSION)
+                return self._rects
+            self._sheet_files = dict(index["sheets"])
+            stale = stale_sources(index["sources"])
+            for sprite in index["sprites"]:
+                if sprite["path"] in stale:
+                    continue
+                key = sprite_key(sprite["path"], sprite["size"], sprite["smooth"])
+                self._rects[key] = (sprite["sheet"], pygame.Rect(sprite["rect"]))
+            if stale:
+                logger.warning("[ATLAS] %d source images changed since the atlas was built, loading them from disk;"
+                               " rebuild it with tools/build_atlas.py", len(stale))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("[ATLAS] Could not read %s: %s", path, e)
+            self._rects = {}
+        return self._rects
+
+    def get(self, path: str, size: Optional[Size] = None, smooth: bool = False) -> Optional[pygame.Surface]:
+        """Subsurface holding *path* scaled to *size*, None when the atlas does not have it."""
+        rects = self._rects if self._rects is not None else self._read_index()
+        entry = rects.get(sprite_key(path, size, smooth))
+        if entry is None:
+            return None
+        sheet_name, rect = entry
+        sheet = self._sheets.get(sheet_name)
+        if sheet is None:
+            try:
+                sheet_path = os.path.join(self.directory, self._sheet_files[sheet_name])
+                sheet = self.archive.get_image(sheet_path) if self.archive is not None else None
+                if sheet is None:
+                    sheet = pygame.image.load(sheet_path).convert_alpha()
+            except (pygame.error, FileNotFoundError, KeyError) as e:
+                logger.warning("[ATLAS] Sheet '%s' unavailable, using loose files: %s", sheet_name, e)
+                self._rects = {key: value for key, value in rects.items() if value[0] != sheet_name}
+                return None
+            self._sheets[sheet_name] = sheet
+        return sheet.subsurface(rect)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "sprites": len(self._rects or ()),
+            "sheets_loaded": len(self._sheets),
+        }
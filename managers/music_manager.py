@@ -1,22 +1,122 @@
 import config
+import logging
 import pygame
+from typing import Dict, List, Optional
+from managers.asset_manager import asset_manager
+
+logger = logging.getLogger(__name__)
+
+
+class SoundBank:
+    """Decoded sound effects shared by the whole game, played through a fixed channel pool.
+
+    Every Sound is loaded once. When all channels are busy the quietest-priority,
+    oldest voice is stolen (never one with a higher priority), and the same
+    sound is started at most SOUND_MAX_PER_FRAME times per simulation step.
+    """
+
+    def __init__(self) -> None:
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._channels: List[pygame.mixer.Channel] = []
+        self._voices: Dict[int, tuple] = {}   # channel index -> (priority, start frame, sound name)
+        self._played_this_frame: Dict[str, int] = {}
+        self.frame = 0
+
+    def _ensure_channels(self) -> bool:
+        if self._channels:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        pygame.mixer.set_num_channels(config.SOUND_CHANNELS)
+        self._channels = [pygame.mixer.Channel(i) for i in range(config.SOUND_CHANNELS)]
+        return True
+
+    def load(self, name: str, path: str) -> pygame.mixer.Sound:
+        sound = self._sounds.get(name)
+        if sound is None:
+            # z archívu už dekódované PCM, inak sa súbor dekóduje tu
+            sound = asset_manager.archive.get_sound(path)
+            if sound is None:
+                sound = pygame.mixer.Sound(path)
+            self._sounds[name] = sound
+        return sound
+
+    def preload(self, sounds: Dict[str, str]) -> None:
+        """Decode all *sounds* up front so nothing is read from disk during play."""
+        if not self._ensure_channels():
+            return
+        for name, path in sounds.items():
+            try:
+                self.load(name, path)
+            except (FileNotFoundError, pygame.error) as e:
+                # chýbajúci súbor nezhodí štart hry, chyba sa ohlási až pri prehraní
+                logger.warning("[SOUND WARNING] Could not preload '%s': %s", name, e)
+
+    def next_frame(self) -> None:
+        self.frame += 1
+        self._played_this_frame.clear()
+
+    def play(self, name: str, path: str, volume: float = 1) -> Optional[pygame.mixer.Channel]:
+        if not self._ensure_channels():
+            return None
+        if self._played_this_frame.get(name, 0) >= config.SOUND_MAX_PER_FRAME:
+            return None
+
+        priority = config.SOUND_PRIORITIES.get(name, 0)
+        index = self._find_channel(priority)
+        if index is None:
+            return None
+
+        channel = self._channels[index]
+        channel.stop()
+        channel.set_volume(volume)
+        channel.play(self.load(name, path))
+        self._voices[index] = (priority, self.frame, name)
+        self._played_this_frame[name] = self._played_this_frame.get(name, 0) + 1
+        return channel
+
+    def _find_channel(self, priority: int) -> Optional[int]:
+        victim = None
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+            voice_priority, started, _ = self._voices.get(index, (0, 0, None))
+            if voice_priority > priority:
+                continue
+            if victim is None or (voice_priority, started) < victim[0]:
+                victim = ((voice_priority, started), index)
+        return victim[1] if victim else None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "sounds": len(self._sounds),
+            "channels": len(self._channels),
+            "busy": sum(1 for channel in self._channels if channel.get_busy()),
+        }
+
+
+sound_bank = SoundBank()
+
 
 class MusicManager:
+    MUSIC = {
+        "title": "assets/sounds/title.mp3",
+        "game_over": "assets/sounds/game_over.mp3",
+        "level": "assets/sounds/level.mp3",
+        "pause": "assets/sounds/pausemusic.mp3"
+    }
+    SOUNDS = {
+        "explosion": "assets/sounds/explosion.mp3",
+        "walk": "assets/sounds/walk.mp3",
+        "hit": "assets/sounds/hit.mp3",
+        "death": "assets/sounds/death.wav",
+        'move_map_selector': "assets/sounds/move.wav",
+        'final_map_selector': "assets/sounds/final.wav"
+    }
+
     def __init__(self):
-        self.music = {
-            "title": "assets/sounds/title.mp3",
-            "game_over": "assets/sounds/game_over.mp3",
-            "level": "assets/sounds/level.mp3",
-            "pause": "assets/sounds/pausemusic.mp3"
-        }
-        self.sounds = {
-            "explosion": "assets/sounds/explosion.mp3",
-            "walk": "assets/sounds/walk.mp3",
-            "hit": "assets/sounds/hit.mp3",
-            "death": "assets/sounds/death.wav",
-            'move_map_selector': "assets/sounds/move.wav",
-            'final_map_selector': "assets/sounds/final.wav"
-        }
+        self.music = self.MUSIC
+        self.sounds = self.SOUNDS
 
     def play_music(self, name: str, volume: str | float = 1, loop: int | bool = False):
         try:
@@ -35,9 +135,6 @@ class MusicManager:
 
     def play_sound(self, name: str, volume: int | str = 1):
         try:
-            sound_file = self.sounds.get(name, name)
-            sound = pygame.mixer.Sound(sound_file)
-            sound.set_volume(config.MUSIC_VOLUME.get(volume, volume))
-            sound.play()
-        except (AttributeError, TypeError, pygame.error) as e:
+            sound_bank.play(name, self.sounds.get(name, name), config.MUSIC_VOLUME.get(volume, volume))
+        except (AttributeError, TypeError, FileNotFoundError, pygame.error) as e:
             raise RuntimeError(f"Failed to play sound '{name}': {e}")
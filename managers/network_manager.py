@@ -1,84 +1,270 @@
-import json
 import time
+import heapq
 import socket
-from typing import Dict, Tuple, Any, Optional, Set, ItemsView
+import logging
+import config
+from collections import deque
+from managers import packet_codec
+from managers.network_stats import NetworkStats
+from managers.network_transport import UdpTransport, make_transport
+from typing import Deque, Dict, Iterable, List, NamedTuple, Tuple, Any, Optional
 
 
 Addr = Tuple[str, int]
 Packet = Dict[str, Any]
+StreamKey = Tuple[Addr, int, Optional[str]]   # (peer, channel id, packet type on sequenced channels)
+
+ACK_WINDOW = 64
+
+logger = logging.getLogger(__name__)
+logger.setLevel(config.NETWORK_LOG_LEVEL)
+
+
+class SequenceWindow:
+    """Reliable sequence numbers received from one peer: the newest one plus a bitfield of the 64 before it."""
+
+    __slots__ = ('latest', 'mask')
+
+    def __init__(self) -> None:
+        self.latest = 0
+        self.mask = 0
+
+    def is_below(self, seq: int) -> bool:
+        """Whether *seq* is too old for the window, i.e. whether it was received cannot be told."""
+        return self.latest - seq > ACK_WINDOW
+
+    def mark(self, seq: int) -> bool:
+        """Record *seq*. False if it was already received or is too old to tell."""
+        if seq > self.latest:
+            shift = seq - self.latest
+            if self.latest and shift <= ACK_WINDOW:
+                self.mask = ((self.mask << shift) | (1 << (shift - 1))) & ((1 << ACK_WINDOW) - 1)
+            else:
+                self.mask = 0
+            self.latest = seq
+            return True
+        distance = self.latest - seq
+        if distance == 0 or distance > ACK_WINDOW:
+            return False
+        bit = 1 << (distance - 1)
+        if self.mask & bit:
+            return False
+        self.mask |= bit
+        return True
+
+    @staticmethod
+    def acknowledges(ack: int, ack_bits: int, seq: int) -> bool:
+        """Whether a remote window (ack, ack_bits) contains *seq*."""
+        distance = ack - seq
+        if distance == 0:
+            return True
+        return 0 < distance <= ACK_WINDOW and bool(ack_bits >> (distance - 1) & 1)
+
+
+class RttEstimator:
+    """Smoothed round-trip time of one peer and the retransmission timeout derived from it (RFC 6298)."""
+
+    __slots__ = ('srtt', 'rttvar', 'rto')
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(self, initial_rto: float) -> None:
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.rto = initial_rto
+
+    def sample(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.rto = min(max(self.srtt + 4 * self.rttvar, config.NETWORK_MIN_RTO), config.NETWORK_MAX_RTO)
+
+    def timeout(self, tries: int) -> float:
+        """RTO for the next attempt, doubled for every resend already made."""
+        return min(self.rto * 2 ** tries, config.NETWORK_MAX_RTO)
+
+
+class Channel(NamedTuple):
+    id: int           # on the wire
+    reliable: bool    # ACK + resend
+    ordered: bool     # reliable: held back until every earlier one arrived; unreliable: older than the newest are dropped
+    priority: int     # higher leaves first when the bandwidth cap is hit
 
 
 class NetworkManager:
-    # True: reliable (ACK + resend), False: unreliable (send once).
-    PACKET_RELIABILITY: Dict[str, bool] = {
+    CHANNELS: Dict[str, Channel] = {
+        'unreliable': Channel(0, reliable=False, ordered=False, priority=2),
+        'sequenced':  Channel(1, reliable=False, ordered=True,  priority=2),
+        'ordered':    Channel(2, reliable=True,  ordered=True,  priority=3),
+        'reliable':   Channel(3, reliable=True,  ordered=False, priority=1),
+    }
+    CHANNEL_BY_ID: Dict[int, Channel] = {channel.id: channel for channel in CHANNELS.values()}
+
+    # Channel of every packet type; unknown types go on 'ordered'.
+    PACKET_CHANNELS: Dict[str, str] = {
         # Discovery / lobby browse
-        'DISCOVER_HOSTS': False,
-        'HOST_OFFER': False,
+        'DISCOVER_HOSTS': 'unreliable',
+        'HOST_OFFER': 'unreliable',
+        'HEARTBEAT': 'unreliable',
 
-        # High-frequency gameplay updates
-        'PLAYER_UPDATE': False,
+        # High-frequency updates, only the newest matters
+        'PLAYER_UPDATE': 'sequenced',
+        'MOVE_SELECTION': 'sequenced',
 
         # Lobby flow
-        'JOIN': True,
-        'LEAVE': True,
-        'READY_TOGGLE': True,
-        'PLAYER_LIST': True,
-        'SKIN_UPDATE': True,
-        'STATE_CHANGE': True,
-        'SAME_DATA': True,
+        'JOIN': 'ordered',
+        'LEAVE': 'ordered',
+        'READY_TOGGLE': 'ordered',
+        'PLAYER_LIST': 'ordered',
+        'STATE_CHANGE': 'ordered',
+        'SAME_DATA': 'ordered',
+
+        # Cosmetic, order does not matter
+        'SKIN_UPDATE': 'reliable',
 
         # Map selector flow
-        'MAP_SELECTION': True,
-        'MOVE_SELECTION': False,     
-        'CONFIRM_SELECTION': True,
-        'CANCEL_SELECTION': True,
-        'FINAL_MAP_SELECTION': True,
+        'MAP_SELECTION': 'ordered',
+        'CONFIRM_SELECTION': 'ordered',
+        'CANCEL_SELECTION': 'ordered',
+        'FINAL_MAP_SELECTION': 'ordered',
+        'READY_TO_TRANSITION': 'ordered',
 
         # Match events
-        'BOMB_UPDATE': True,
-        'POWERUP_UPDATE': True,
+        'BOMB_UPDATE': 'ordered',
+        'POWERUP_UPDATE': 'ordered',
+        'MAP_STATE': 'ordered',
+        'MAP_DELTA': 'ordered',
+        'MAP_RESYNC': 'ordered',
+        'POWERUP_PICKUP': 'ordered',
+        'GAME_OVER': 'ordered',
+
+        # Host-authoritative match: guest commands and host snapshots, only the newest counts
+        'INPUT': 'sequenced',
+        'SNAPSHOT': 'sequenced',
     }
 
+    # Unreliable packets where only the newest one per key is worth handling
+    # (packet type -> data field identifying the sender's object).
+    COALESCED_PACKETS: Dict[str, str] = {
+        'PLAYER_UPDATE': 'player_name',
+    }
+
+    # Ordered packets kept per stream while waiting for a missing one. A live peer resends the missing one
+    # until ACKed, so a gap this long (~17 s of per-tick traffic, past the heartbeat timeout) is not
+    # going to be filled and is skipped.
+    MAX_EARLY_PACKETS = 1024
+
     def __init__(
         self,
         socket: socket.socket,
         *,
         resend_timeout: float = 0.5,
         resend_tries: int = 5,
+        wire_format: str = config.NETWORK_WIRE_FORMAT,
+        transport: Optional[UdpTransport] = None,
     ) -> None:
         self.socket = socket
         self.socket.setblocking(False)
-
-        # Outgoing sequence number.
-        self._seq = 0
-        self._pending: Dict[int, Tuple[Addr, Packet, float, int]] = {}
-        self._processed_seq: Dict[Addr, set[int]] = {}
-        self._completed_seq: Dict[Addr, set[int]] = {}
+        # Datagrams go through the transport; the socket itself stays reachable for bind/setsockopt.
+        self.transport = transport if transport is not None else make_transport(socket)
+
+        # Preferred wire format of this side. Every peer starts on JSON (what any
+        # version understands) and switches to binary once negotiated in JOIN.
+        self.wire_format = wire_format if wire_format in packet_codec.WIRE_FORMATS else packet_codec.WIRE_JSON
+        self._peer_formats: Dict[Addr, str] = {}
+
+        # Reused by poll_batch() so draining the socket does not allocate per datagram.
+        self._recv_buffer = bytearray(65535)
+        self._recv_view = memoryview(self._recv_buffer)
+        # Packets of a bundled datagram that poll() has not returned yet.
+        self._inbox: Deque[Tuple[Packet, Addr]] = deque()
+
+        # Packets for scopes the current state does not read yet (e.g. the next
+        # state's packets right behind a STATE_CHANGE). Reliable ones were already
+        # ACKed and wait until a state reads their scope, the rest only for a short while.
+        self._held: Dict[str, Deque[Tuple[float, Tuple[Packet, Addr]]]] = {}
+
+        # Everything sent during a frame waits here and leaves in flush() as
+        # few MTU-sized datagrams per peer, highest channel priority first and
+        # within NETWORK_BANDWIDTH_CAP. Reliable packets over the cap wait for the next flush.
+        self.mtu = config.NETWORK_MTU
+        self._outgoing: Dict[Addr, List[Packet]] = {}
+        self._queued: set[Tuple[Addr, int]] = set()
+        self._send_budget: Dict[Addr, Tuple[float, float]] = {}   # addr -> (bytes left, last refill)
+
+        # Per stream (see _stream_key): last channel seq sent, newest received (sequenced)
+        # or next expected (ordered), and ordered packets that arrived too early.
+        self._channel_seq: Dict[StreamKey, int] = {}
+        self._channel_recv: Dict[StreamKey, int] = {}
+        self._early: Dict[StreamKey, Dict[int, Packet]] = {}
+
+        # Sequence numbers are per peer. Every outgoing packet carries our receive
+        # window for that peer (ack + ack_bits), so there are no ACK datagrams
+        # except a bare 'ACK' when nothing else goes to a peer that frame.
+        self._seq: Dict[Addr, int] = {}
+        # addr -> seq -> (packet, first sent, resends so far, resend deadline)
+        self._pending: Dict[Addr, Dict[int, Tuple[Packet, float, int, float]]] = {}
+        # (deadline, addr, seq); entries whose packet got ACKed or rescheduled are skipped when popped
+        self._resend_heap: List[Tuple[float, Addr, int]] = []
+        self._rtt: Dict[Addr, RttEstimator] = {}
+        self._lost_seq: Dict[Addr, set[int]] = {}
+        self._recv_windows: Dict[Addr, SequenceWindow] = {}
+        self._ack_due: set[Addr] = set()
+        # Reliable seqs received since the last flush, and those of them (or late resends) too old
+        # for the ACK window by then; the latter are ACKed one by one in an explicit ACK.
+        self._received_seq: Dict[Addr, List[int]] = {}
+        self._explicit_acks: Dict[Addr, List[int]] = {}
 
         self.resend_tries = resend_tries
-        self.resend_timeout = resend_timeout
-        self.last_cleanup = time.time()
-        self.cleanup_interval = 30
+        self.resend_timeout = resend_timeout   # RTO until the first RTT sample of a peer
+
+        self.stats = NetworkStats()
 
-        # Heartbeat tracking
-        self.peer: Optional[Addr] = None
-        self.last_recieved_heartbeat: Optional[float] = None
+        # Heartbeat tracking: registered peer -> when its last heartbeat arrived (our clock)
+        self.peers: Dict[Addr, float] = {}
         self.last_sent_heartbeat: float = 0.0
         self.heartbeat_interval = 2
-        self.peer_timedout: bool = False
+        # Peers dropped for missing heartbeats, states collect them with pop_timed_out_peers()
+        self.timed_out_peers: List[Addr] = []
 
 
     def close_socket(self) -> None:
         self.close_connection()
 
     # ---------------- Sending ----------------
+    @classmethod
+    def get_packet_channel(cls, packet_type: str) -> str:
+        return cls.PACKET_CHANNELS.get(packet_type, 'ordered')
+
+    @classmethod
+    def _packet_channel(cls, packet: Packet) -> Channel:
+        """Channel a received packet came on (by its header, else by its type)."""
+        channel = cls.CHANNEL_BY_ID.get(packet.get('channel'))
+        return channel if channel is not None else cls.CHANNELS[cls.get_packet_channel(packet.get('type'))]
+
+    @staticmethod
+    def _stream_key(addr: Addr, channel: Channel, packet_type: Optional[str]) -> StreamKey:
+        """Counter of channel_seq: per peer and channel, and per packet type on sequenced channels
+        (a late PLAYER_UPDATE must not be dropped as stale just because a newer SNAPSHOT arrived)."""
+        return addr, channel.id, None if channel.reliable else packet_type
+
+    @classmethod
+    def set_packet_channel(cls, packet_type: str, channel: str) -> None:
+        if channel not in cls.CHANNELS:
+            raise ValueError(f'Unknown channel {channel!r}')
+        cls.PACKET_CHANNELS[packet_type] = channel
+
     @classmethod
     def is_reliable_packet_type(cls, packet_type: str) -> bool:
-        return cls.PACKET_RELIABILITY.get(packet_type, True)
+        return cls.CHANNELS[cls.get_packet_channel(packet_type)].reliable
 
     @classmethod
     def set_packet_reliability(cls, packet_type: str, reliable: bool) -> None:
-        cls.PACKET_RELIABILITY[packet_type] = reliable
+        cls.set_packet_channel(packet_type, 'reliable' if reliable else 'unreliable')
 
     @classmethod
     def get_packet_reliability(cls, packet_type: str) -> bool:
@@ -92,24 +278,42 @@ class NetworkManager:
         scope: str = 'Game',
         *,
         reliable: Optional[bool] = None,
+        channel: Optional[str] = None,
     ) -> int:
-        if reliable is None:
-            reliable = self.is_reliable_packet_type(packet_type)
-
-        self._seq += 1
+        if channel is None:
+            if reliable is None:
+                channel = self.get_packet_channel(packet_type)
+            else:
+                channel = 'reliable' if reliable else 'unreliable'
+        channel_info = self.CHANNELS[channel]
+
+        # Only reliable packets take a transport seq, so the ACK window is not used up by movement spam
+        seq = 0
+        if channel_info.reliable:
+            seq = self._seq.get(addr, 0) + 1
+            self._seq[addr] = seq
+        channel_key = self._stream_key(addr, channel_info, packet_type)
+        channel_seq = self._channel_seq.get(channel_key, 0) + 1
+        self._channel_seq[channel_key] = channel_seq
         packet = {
             'scope': scope,
             'type': packet_type,
-            'seq': self._seq,
+            'seq': seq,
+            'channel': channel_info.id,
+            'channel_seq': channel_seq,
             'data': data
         }
 
         self._send_raw_packet(addr, packet)
-        if not reliable:
-            return self._seq
+        if not channel_info.reliable:
+            return seq
 
-        self._pending[self._seq] = (addr, packet, time.time(), 0)
-        return self._seq
+        now = time.time()
+        deadline = now + self._get_rtt(addr).timeout(0)
+        self._pending.setdefault(addr, {})[seq] = (packet, now, 0, deadline)
+        heapq.heappush(self._resend_heap, (deadline, addr, seq))
+        self._queued.add((addr, seq))
+        return seq
 
     def send_reliable(self, addr: Addr, packet_type: str, data: Optional[dict] = None, scope: str = 'Game') -> int:
         return self.send_packet(addr, packet_type, data, scope, reliable=True)
@@ -144,134 +348,471 @@ class NetworkManager:
     def _send_raw_packet(self, addr: Addr, packet: Packet) -> None:
         if self.socket is None:
             return
-        raw_packet = json.dumps(packet).encode('utf-8')
-        self.socket.sendto(raw_packet, addr)
+        self._outgoing.setdefault(addr, []).append(packet)
+
+    def flush(self) -> None:
+        """Send everything queued since the last flush, packed into as few datagrams per peer as fit the MTU."""
+        if self.socket is None:
+            self._outgoing.clear()
+            self._ack_due.clear()
+            self._received_seq.clear()
+            self._explicit_acks.clear()
+            return
+
+        for addr, seqs in self._received_seq.items():
+            # a burst of more than ACK_WINDOW seqs pushes its first ones out of the window before it is sent
+            window = self._recv_windows[addr]
+            self._explicit_acks.setdefault(addr, []).extend(seq for seq in seqs if window.is_below(seq))
+        self._received_seq.clear()
+        for addr, seqs in self._explicit_acks.items():
+            if not seqs:
+                continue
+            self._send_raw_packet(addr, {'type': 'ACK', 'data': {'seqs': seqs}})
+        self._explicit_acks.clear()
+        for addr in self._ack_due:
+            if addr not in self._outgoing:
+                self._send_raw_packet(addr, {'type': 'ACK'})
+        self._ack_due.clear()
+
+        now = time.time()
+        deferred: Dict[Addr, List[Packet]] = {}
+        # A broadcast queues the same data object for every peer; its binary payload is encoded
+        # once per flush and only the header (seq, ack, channel) per peer.
+        payloads: Dict[Tuple[int, str], Tuple[int, bytes]] = {}
+        for addr, packets in self._outgoing.items():
+            window = self._recv_windows.get(addr)
+            wire_format = self.get_wire_format(addr)
+            budget = self._refill_budget(addr, now)
+            peer_stats = self.stats.peer(addr)
+            packets.sort(key=self._send_priority, reverse=True)
+            datagram: List[bytes] = []
+            size = packet_codec.BUNDLE_HEADER.size
+            for packet in packets:
+                channel = self.CHANNEL_BY_ID.get(packet.get('channel'))
+                if budget <= 0 and channel is not None:
+                    # Over the cap: reliable packets wait for the next flush, the rest is dropped
+                    if channel.reliable:
+                        deferred.setdefault(addr, []).append(packet)
+                    else:
+                        peer_stats.drops['over_cap'] += 1
+                    continue
+                if window is not None:
+                    packet['ack'] = window.latest
+                    packet['ack_bits'] = window.mask
+                started = time.perf_counter()
+                message = self._encode(packet, wire_format, payloads)
+                self.stats.record_encode(time.perf_counter() - started)
+                peer_stats.packets_out[packet.get('type')] += 1
+                peer_stats.bytes_out[packet.get('type')] += len(message)
+                budget -= len(message)
+                self._queued.discard((addr, packet.get('seq')))
+                message_size = packet_codec.BUNDLE_ITEM.size + len(message)
+                if datagram and size + message_size > self.mtu:
+                    self.transport.sendto(packet_codec.encode_bundle(datagram), addr)
+                    peer_stats.datagrams_out += 1
+                    datagram = []
+                    size = packet_codec.BUNDLE_HEADER.size
+                datagram.append(message)
+                size += message_size
+            if datagram:
+                self.transport.sendto(packet_codec.encode_bundle(datagram), addr)
+                peer_stats.datagrams_out += 1
+            self._send_budget[addr] = (budget, now)
+        self._outgoing = deferred
+
+    @staticmethod
+    def _encode(packet: Packet, wire_format: str, payloads: Dict[Tuple[int, str], Tuple[int, bytes]]) -> bytes:
+        data = packet.get('data')
+        if wire_format != packet_codec.WIRE_BINARY or data is None:
+            return packet_codec.encode(packet, wire_format)
+        key = (id(data), packet.get('type'))
+        payload = payloads.get(key)
+        if payload is None:
+            payload = payloads[key] = packet_codec.encode_payload(packet.get('type'), data)
+        return packet_codec.encode_binary(packet, payload)
+
+    def _send_priority(self, packet: Packet) -> int:
+        channel = self.CHANNEL_BY_ID.get(packet.get('channel'))
+        # bare ACKs first, they are tiny and unblock the peer's resends
+        return channel.priority if channel else 99
+
+    def _refill_budget(self, addr: Addr, now: float) -> float:
+        """Token bucket of bytes *addr* may still receive this flush (may go negative by one packet)."""
+        cap = config.NETWORK_BANDWIDTH_CAP
+        if not cap:
+            return float('inf')
+        budget, last = self._send_budget.get(addr, (config.NETWORK_BANDWIDTH_BURST, now))
+        return min(config.NETWORK_BANDWIDTH_BURST, budget + (now - last) * cap)
 
     # ---------------- Receiving ----------------
     def poll(self) -> None | Tuple[Packet, Addr]:
+        if self._inbox:
+            return self._inbox.popleft()
         if self.socket is None:
             return
         try:
-            raw, addr = self.socket.recvfrom(65535)
+            raw, addr = self.transport.recvfrom(65535)
         except (BlockingIOError, InterruptedError, OSError):
             return
+        self._inbox.extend(self._process_datagram(raw, addr))
+        if self._inbox:
+            return self._inbox.popleft()
 
+    def poll_batch(
+        self,
+        scopes: Optional[Iterable[str]] = None,
+        max_packets: int = config.NETWORK_BATCH_MAX_PACKETS,
+        max_time: float = config.NETWORK_BATCH_MAX_TIME,
+    ) -> Dict[str, List[Tuple[Packet, Addr]]]:
+        """Drain up to *max_packets* datagrams (or *max_time* seconds) and return them grouped by scope.
+
+        Packets keep their arrival order inside a scope. Of several coalesced
+        packets (COALESCED_PACKETS) from the same sender only the newest is
+        returned, unless another packet from that sender arrived in between.
+        Whatever is left in the socket is picked up by the next call.
+
+        With *scopes* given, packets of other scopes are held back and returned
+        to the first call that asks for their scope, so packets sent right after
+        a STATE_CHANGE reach the next state. Reliable packets are held until then
+        (or until the connection closes), the others for NETWORK_SCOPE_HOLD_TIME seconds.
+        """
+        batch: Dict[str, List[Tuple[Packet, Addr]]] = {}
+        if self.socket is None:
+            return batch
+        now = time.time()
+        wanted = None if scopes is None else set(scopes)
+        self._expire_held(now)
+        for scope in list(self._held) if wanted is None else wanted & self._held.keys():
+            batch[scope] = [result for _, result in self._held.pop(scope)]
+
+        received: List[Optional[Tuple[Packet, Addr]]] = []
+        latest: Dict[Addr, Dict[Any, int]] = {}
+        deadline = time.perf_counter() + max_time
+
+        def collect(result: Tuple[Packet, Addr]) -> None:
+            packet, addr = result
+            key_field = self.COALESCED_PACKETS.get(packet.get('type'))
+            data = packet.get('data')
+            if key_field and isinstance(data, dict):
+                key = (packet.get('type'), data.get(key_field))
+                slots = latest.setdefault(addr, {})
+                if key in slots:
+                    received[slots[key]] = None
+                slots[key] = len(received)
+            else:
+                # Any other packet from this sender may depend on its last update.
+                latest.pop(addr, None)
+            received.append(result)
+
+        while self._inbox:
+            collect(self._inbox.popleft())
+
+        for _ in range(max_packets):
+            try:
+                nbytes, addr = self.transport.recvfrom_into(self._recv_buffer)
+            except (BlockingIOError, InterruptedError, OSError):
+                break
+
+            for result in self._process_datagram(bytes(self._recv_view[:nbytes]), addr):
+                collect(result)
+
+            if time.perf_counter() >= deadline:
+                break
+
+        for result in received:
+            if result is None:
+                continue
+            scope = result[0].get('scope')
+            if wanted is None or scope in wanted:
+                batch.setdefault(scope, []).append(result)
+            else:
+                self._held.setdefault(scope, deque()).append((now, result))
+        return batch
+
+    def _expire_held(self, now: float) -> None:
+        for scope, held in list(self._held.items()):
+            if now - held[0][0] <= config.NETWORK_SCOPE_HOLD_TIME:
+                continue
+            # spoľahlivé pakety sú už ACKnuté, odosielateľ ich znova nepošle - nesmú sa zahodiť
+            held = deque(
+                entry for entry in held
+                if now - entry[0] <= config.NETWORK_SCOPE_HOLD_TIME or self._packet_channel(entry[1][0]).reliable
+            )
+            if held:
+                self._held[scope] = held
+            else:
+                del self._held[scope]
+
+    def _process_datagram(self, raw: bytes, addr: Addr) -> List[Tuple[Packet, Addr]]:
+        peer_stats = self.stats.peer(addr)
+        peer_stats.datagrams_in += 1
+        started = time.perf_counter()
         try:
-            packet = json.loads(raw.decode('utf-8'))
+            packets = packet_codec.decode_datagram(raw)
         except Exception:
-            print(f'[WARN] Invalid packet: {raw} from {addr}')
-            return
+            peer_stats.drops['invalid'] += 1
+            logger.warning('Invalid packet: %r from %s', raw, addr)
+            return []
+        self.stats.record_decode(time.perf_counter() - started)
+        if packets:
+            share = len(raw) / len(packets)
+            for packet in packets:
+                peer_stats.packets_in[packet.get('type')] += 1
+                peer_stats.bytes_in[packet.get('type')] += share
+        if packet_codec.is_binary(raw) and self.wire_format == packet_codec.WIRE_BINARY:
+            # The other side already negotiated binary with us, answer the same way.
+            self._peer_formats[addr] = packet_codec.WIRE_BINARY
+
+        results = []
+        for packet in packets:
+            results.extend((delivered, addr) for delivered in self._process_packet(packet, addr))
+        return results
+
+    def _process_packet(self, packet: Packet, addr: Addr) -> List[Packet]:
+        """Handle the transport part of *packet* and return the packets now ready for the game (0, 1 or more)."""
         packet_type = packet.get('type')
         seq = packet.get('seq')
         data = packet.get('data')
 
-        if packet_type == 'HEARTBEAT' and self.peer == addr:
-            print(f'[DEBUG] Received HEARTBEAT from {addr}')
-            self.last_recieved_heartbeat = data['timestamp']
-            return
-        
-        # Incoming ACK
-        if packet_type == 'ACK' and isinstance(seq, int):
-            self._pending.pop(seq, None)
-            self._completed_seq.setdefault(addr, set()).add(seq)
+        ack = packet.get('ack')
+        if isinstance(ack, int) and ack > 0:
+            self._apply_ack(addr, ack, packet.get('ack_bits') or 0)
+        if packet_type == 'ACK':
+            if isinstance(data, dict) and isinstance(data.get('seqs'), list):
+                self._apply_explicit_acks(addr, data['seqs'])
+            return []
+
+        if packet_type == 'HEARTBEAT' and addr in self.peers:
+            logger.debug('Received HEARTBEAT from %s', addr)
+            self.peers[addr] = time.time()
+            return []
+
+        channel = self._packet_channel(packet)
+        if isinstance(seq, int) and seq > 0 and channel.reliable:
+            # Duplicates are ACKed again (the first ACK may have been lost) but not returned.
+            self._ack_due.add(addr)
+            peer_stats = self.stats.peer(addr)
+            peer_stats.reliable_in += 1
+            window = self._recv_windows.setdefault(addr, SequenceWindow())
+            if window.is_below(seq):
+                # Late resend the window cannot ACK: it gets its own ACK, else it is resent forever
+                # (and an ordered channel stalls). On ordered channels channel_seq below tells
+                # whether it is new; on the others it is taken for a copy of one already delivered.
+                self._explicit_acks.setdefault(addr, []).append(seq)
+                if not channel.ordered:
+                    peer_stats.duplicates += 1
+                    return []
+            elif window.mark(seq):
+                self._received_seq.setdefault(addr, []).append(seq)
+            else:
+                peer_stats.duplicates += 1
+                return []
+
+        channel_seq = packet.get('channel_seq')
+        if not channel.ordered or not isinstance(channel_seq, int):
+            return [packet]
+
+        key = self._stream_key(addr, channel, packet_type)
+        if not channel.reliable:
+            # Sequenced: anything older than what was already delivered is stale
+            if channel_seq <= self._channel_recv.get(key, 0):
+                self.stats.peer(addr).drops['stale'] += 1
+                return []
+            self._channel_recv[key] = channel_seq
+            return [packet]
+
+        expected = self._channel_recv.get(key, 1)
+        if channel_seq < expected:
+            self.stats.peer(addr).drops['stale'] += 1
+            return []
+        if channel_seq > expected:
+            early = self._early.setdefault(key, {})
+            early[channel_seq] = packet
+            if len(early) <= self.MAX_EARLY_PACKETS:
+                return []
+            # The missing packet is not coming (its sender gave up on it): skip the gap rather than stall for good
+            skipped = min(early) - expected
+            logger.warning('Ordered stream from %s stalled at %d, skipping %d missing packets', addr, expected, skipped)
+            self.stats.peer(addr).drops['gap_skipped'] += skipped
+            expected = min(early)
+            packet = early.pop(expected)
+        delivered = [packet]
+        early = self._early.get(key, {})
+        expected += 1
+        while expected in early:
+            delivered.append(early.pop(expected))
+            expected += 1
+        self._channel_recv[key] = expected
+        if not early:
+            self._early.pop(key, None)
+        return delivered
+
+    def _apply_ack(self, addr: Addr, ack: int, ack_bits: int) -> None:
+        pending = self._pending.get(addr)
+        if not pending:
             return
+        self._acknowledge(addr, [seq for seq in pending if SequenceWindow.acknowledges(ack, ack_bits, seq)])
 
-        if isinstance(seq, int):
-            is_reliable = self.is_reliable_packet_type(packet_type)
-            if not is_reliable:
-                return (packet, addr)
-
-            seen = self._processed_seq.setdefault(addr, set())
-            if seq in seen:
-                self._send_ack(addr, seq)
-                return
-            seen.add(seq)
-            self._send_ack(addr, seq)
-            return (packet, addr)
-
-        return (packet, addr)
+    def _apply_explicit_acks(self, addr: Addr, seqs: List[int]) -> None:
+        pending = self._pending.get(addr)
+        if pending:
+            self._acknowledge(addr, [seq for seq in seqs if seq in pending])
 
-    def _send_ack(self, addr: Addr, seq: int) -> None:
-        self._send_raw_packet(addr, {'type': 'ACK', 'seq': seq})
+    def _acknowledge(self, addr: Addr, seqs: List[int]) -> None:
+        pending = self._pending[addr]
+        now = time.time()
+        for seq in seqs:
+            _, first_sent, tries, _ = pending.pop(seq)
+            # Karn: a resent packet's ACK could belong to any of the copies, so it is no RTT sample
+            if tries == 0:
+                self._get_rtt(addr).sample(now - first_sent)
+                self.stats.peer(addr).record_rtt(now - first_sent)
 
     def update(self) -> None:
-        """Resend un-ACKed packets"""
+        """Resend un-ACKed packets, send heartbeats and flush the outgoing queue"""
         if self.socket is None:
             return
         now = time.time()
 
-        for seq, (addr, packet, last_time_sent, resend_try) in list(self._pending.items()):
-            if now - last_time_sent >= self.resend_timeout and resend_try <= self.resend_tries:
-                self._send_raw_packet(addr, packet)
-                resend_try += 1
-                self._pending[seq] = (addr, packet, now, resend_try)
-            elif resend_try > self.resend_tries:
-                self._pending.pop(seq)
-
-        # Periodically clean up old sequence records
-        if now - self.last_cleanup >= self.cleanup_interval:
-            self._cleanup_sequences()
-            self.last_cleanup = now
-        
+        while self._resend_heap and self._resend_heap[0][0] <= now:
+            deadline, addr, seq = heapq.heappop(self._resend_heap)
+            pending = self._pending.get(addr)
+            entry = pending.get(seq) if pending else None
+            if entry is None or entry[3] != deadline:
+                continue
+            packet, first_sent, tries, _ = entry
+            channel = self.CHANNEL_BY_ID.get(packet.get('channel'))
+            if (addr, seq) in self._queued:
+                # still waiting in the outgoing queue (bandwidth cap), a second copy would not help
+                deadline = now + self._get_rtt(addr).timeout(tries)
+                pending[seq] = (packet, first_sent, tries, deadline)
+                heapq.heappush(self._resend_heap, (deadline, addr, seq))
+                continue
+            # An ordered channel would stall behind a dropped packet, so those are resent until
+            # ACKed; a dead peer is caught by the heartbeat timeout instead, and an address that
+            # never became a peer (e.g. JOIN to a host that is gone) gets NETWORK_UNREGISTERED_TIMEOUT.
+            if channel and channel.ordered:
+                give_up = addr not in self.peers and now - first_sent > config.NETWORK_UNREGISTERED_TIMEOUT
+            else:
+                give_up = tries >= self.resend_tries
+            if give_up:
+                del pending[seq]
+                self._lost_seq.setdefault(addr, set()).add(seq)
+                self.stats.peer(addr).drops['gave_up'] += 1
+                continue
+            tries += 1
+            self.stats.peer(addr).resends += 1
+            self._send_raw_packet(addr, packet)
+            self._queued.add((addr, seq))
+            deadline = now + self._get_rtt(addr).timeout(tries)
+            pending[seq] = (packet, first_sent, tries, deadline)
+            heapq.heappush(self._resend_heap, (deadline, addr, seq))
+
         # Heartbeat System
-        if self.peer:
+        if self.peers:
             if now - self.last_sent_heartbeat >= self.heartbeat_interval:
                 self.send_heartbeat()
                 self.last_sent_heartbeat = now
-            if self.last_recieved_heartbeat and now - self.last_recieved_heartbeat > self.heartbeat_interval * 4:
-                print(f'[WARN] No heartbeat from {self.peer} for {now - self.last_recieved_heartbeat:.1f}s, disconnecting.')
-                self.unregister_peer()
-                self.peer_timedout = True
-
-    def _cleanup_sequences(self) -> None:
-        # Keep only last 20 (highest) sequences per address.
-        for addr, seqs in list(self._processed_seq.items()):
-            if not seqs:
-                del self._processed_seq[addr]
-                continue
-            self._processed_seq[addr] = set(sorted(seqs)[-20:])
+            for addr, last_heartbeat in list(self.peers.items()):
+                if now - last_heartbeat > self.heartbeat_interval * 4:
+                    logger.warning('No heartbeat from %s for %.1fs, disconnecting.', addr, now - last_heartbeat)
+                    self.unregister_peer(addr)
+                    self._give_up_pending(addr)
+                    self.timed_out_peers.append(addr)
 
-        for addr, seqs in list(self._completed_seq.items()):
-            if not seqs:
-                del self._completed_seq[addr]
-                continue
-            self._completed_seq[addr] = set(sorted(seqs)[-20:])
+        self.flush()
 
     def close_connection(self) -> None:
         if self.socket is None:
             return
         try:
-            self.socket.close()
+            self.flush()
+            self.transport.close()
         finally:
             self.socket = None
+            self._held.clear()
+            self._drop_streams()
 
     # ----------------- HeartBeat System ----------------
 
     def register_peer(self, addr: Addr) -> None:
-        self.peer = addr
-        self.last_recieved_heartbeat = time.time()
+        self.peers[addr] = time.time()
         self.last_sent_heartbeat = 0.0
-        self.peer_timedout = False
+        if addr in self.timed_out_peers:
+            self.timed_out_peers.remove(addr)
+
+    def unregister_peer(self, addr: Optional[Addr] = None) -> None:
+        """Stop the heartbeat with *addr*, or with every peer when no address is given."""
+        if addr is None:
+            self.peers.clear()
+        else:
+            self.peers.pop(addr, None)
+        self._drop_streams(addr)
+
+    def _drop_streams(self, addr: Optional[Addr] = None) -> None:
+        """Forget the channel streams of *addr* (of everyone when None), so a peer that comes back starts from seq 1."""
+        for streams in (self._channel_seq, self._channel_recv, self._early):
+            for key in [key for key in streams if addr is None or key[0] == addr]:
+                del streams[key]
+
+    def pop_timed_out_peers(self) -> List[Addr]:
+        timed_out, self.timed_out_peers = self.timed_out_peers, []
+        return timed_out
 
-    def unregister_peer(self) -> None:
-        self.peer = None
-    
     def send_heartbeat(self) -> None:
-        if self.peer and self.socket is not None:
-            print(f'[DEBUG] Sending HEARTBEAT to {self.peer}')
-            self.send_unreliable(self.peer, 'HEARTBEAT', {'timestamp': time.time()})
+        if self.peers and self.socket is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Sending HEARTBEAT to %s', ', '.join(f'{host}:{port}' for host, port in self.peers))
+            self.broadcast_unreliable(tuple(self.peers), 'HEARTBEAT', {'timestamp': time.time()})
+
+    def _give_up_pending(self, addr: Addr) -> None:
+        """A dead peer will not ACK anything: stop resending to it (ordered packets would otherwise retry forever)."""
+        pending = self._pending.pop(addr, {})
+        self._lost_seq.setdefault(addr, set()).update(pending)
+        self.stats.peer(addr).drops['gave_up'] += len(pending)
+        self._drop_streams(addr)
+
+    # ---------------- Wire format ----------------
+    def get_wire_format(self, addr: Addr) -> str:
+        return self._peer_formats.get(addr, packet_codec.WIRE_JSON)
+
+    def negotiate_wire_format(self, addr: Addr, requested: Optional[str]) -> str:
+        """Pick the format for *addr* from what it asked for in JOIN; binary only if both sides want it."""
+        if requested == packet_codec.WIRE_BINARY and self.wire_format == packet_codec.WIRE_BINARY:
+            wire_format = packet_codec.WIRE_BINARY
+        else:
+            wire_format = packet_codec.WIRE_JSON
+        self._peer_formats[addr] = wire_format
+        return wire_format
+
     # ---------------- Getters and Setters ----------------
-    def get_completed_seq(
-        self,
-        addr: Optional[Addr] = None,
-        *,
-        seq: Optional[int] = None,
-    ) -> ItemsView[Addr, Set[int]] | set[int] | bool | None:
-        """Check if outgoing packets got ACKed"""
-        if addr is None and seq is None:
-            return self._completed_seq.items()
-        if addr and seq is None:
-            return self._completed_seq.get(addr, set())
-        if addr and seq:
-            return seq in self._completed_seq.get(addr, set())
-        return None
+    def _get_rtt(self, addr: Addr) -> RttEstimator:
+        estimator = self._rtt.get(addr)
+        if estimator is None:
+            estimator = self._rtt[addr] = RttEstimator(self.resend_timeout)
+        return estimator
+
+    def get_rtt(self, addr: Addr) -> Optional[float]:
+        """Smoothed round-trip time to *addr* in seconds, None before the first sample."""
+        estimator = self._rtt.get(addr)
+        return estimator.srtt if estimator else None
+
+    def get_stats(self, addr: Optional[Addr] = None) -> Dict[str, Any]:
+        """Counters of network_stats.NetworkStats plus current RTT, RTO and queue depths per peer."""
+        snapshot = self.stats.snapshot(addr)
+        for peer, peer_snapshot in snapshot['peers'].items():
+            estimator = self._rtt.get(peer)
+            peer_snapshot['rtt'] = estimator.srtt if estimator else None
+            peer_snapshot['rto'] = estimator.rto if estimator else self.resend_timeout
+            peer_snapshot['pending'] = len(self._pending.get(peer, ()))
+            peer_snapshot['queued'] = len(self._outgoing.get(peer, ()))
+        snapshot['held'] = sum(len(held) for held in self._held.values())
+        return snapshot
+
+    def get_completed_seq(self, addr: Addr, *, seq: int) -> bool:
+        """Check if the reliable packet *seq* sent to *addr* got ACKed"""
+        if not 0 < seq <= self._seq.get(addr, 0):
+            return False
+        if seq in self._pending.get(addr, ()):
+            return False
+        return seq not in self._lost_seq.get(addr, ())
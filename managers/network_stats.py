@@ -0,0 +1,120 @@
+import bisect
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+Addr = Tuple[str, int]
+
+# Hranice RTT histogramu v ms, posledný stĺpec je "viac ako 500 ms"
+RTT_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500)
+
+
+class PeerStats:
+    """Counters of the traffic exchanged with one peer since the last reset."""
+
+    def __init__(self) -> None:
+        self.packets_out: Counter = Counter()   # packet type -> count
+        self.bytes_out: Counter = Counter()
+        self.packets_in: Counter = Counter()
+        self.bytes_in: Counter = Counter()      # datagram bytes split evenly over the packets it carried
+        self.datagrams_out = 0
+        self.datagrams_in = 0
+        self.resends = 0
+        self.reliable_in = 0
+        self.duplicates = 0
+        self.drops: Counter = Counter()         # reason -> count
+        self.rtt_histogram = [0] * (len(RTT_BUCKETS_MS) + 1)
+
+    def record_rtt(self, rtt: float) -> None:
+        self.rtt_histogram[bisect.bisect_left(RTT_BUCKETS_MS, rtt * 1000)] += 1
+
+    @property
+    def duplicate_rate(self) -> float:
+        return self.duplicates / self.reliable_in if self.reliable_in else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "packets_out": dict(self.packets_out),
+            "bytes_out": dict(self.bytes_out),
+            "packets_in": dict(self.packets_in),
+            "bytes_in": dict(self.bytes_in),
+            "datagrams_out": self.datagrams_out,
+            "datagrams_in": self.datagrams_in,
+            "resends": self.resends,
+            "duplicates": self.duplicates,
+            "duplicate_rate": self.duplicate_rate,
+            "drops": dict(self.drops),
+            "rtt_histogram": dict(zip([f"<{b}ms" for b in RTT_BUCKETS_MS] + [f">{RTT_BUCKETS_MS[-1]}ms"], self.rtt_histogram)),
+        }
+
+
+class NetworkStats:
+    """Per-peer PeerStats plus codec timings of one NetworkManager."""
+
+    def __init__(self) -> None:
+        self.peers: Dict[Addr, PeerStats] = {}
+        self.encode_time = 0.0
+        self.encode_count = 0
+        self.decode_time = 0.0
+        self.decode_count = 0
+
+    def peer(self, addr: Addr) -> PeerStats:
+        stats = self.peers.get(addr)
+        if stats is None:
+            stats = self.peers[addr] = PeerStats()
+        return stats
+
+    def record_encode(self, seconds: float) -> None:
+        self.encode_time += seconds
+        self.encode_count += 1
+
+    def record_decode(self, seconds: float) -> None:
+        self.decode_time += seconds
+        self.decode_count += 1
+
+    @property
+    def average_encode_us(self) -> float:
+        return self.encode_time / self.encode_count * 1e6 if self.encode_count else 0.0
+
+    @property
+    def average_decode_us(self) -> float:
+        return self.decode_time / self.decode_count * 1e6 if self.decode_count else 0.0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def snapshot(self, addr: Optional[Addr] = None) -> Dict[str, Any]:
+        peers = [addr] if addr is not None else list(self.peers)
+        return {
+            "peers": {peer: self.peer(peer).snapshot() for peer in peers},
+            "encode_us": self.average_encode_us,
+            "decode_us": self.average_decode_us,
+        }
+
+
+def format_bytes(count: float) -> str:
+    if count < 1024:
+        return f"{count:.0f} B"
+    if count < 1024 * 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count / (1024 * 1024):.1f} MB"
+
+
+def overlay_lines(snapshot: Dict[str, Any]) -> List[str]:
+    """Short human readable lines for the F3 overlay from NetworkManager.get_stats()."""
+    lines = [f"encode {snapshot['encode_us']:.1f} us  decode {snapshot['decode_us']:.1f} us"]
+    for addr, peer in snapshot["peers"].items():
+        rtt = peer.get("rtt")
+        rtt_text = f"{rtt * 1000:.1f} ms" if rtt is not None else "-"
+        lines.append(f"{addr[0]}:{addr[1]}  rtt {rtt_text}  rto {peer.get('rto', 0) * 1000:.0f} ms")
+        lines.append(
+            f"  out {sum(peer['packets_out'].values())} pkt in {peer['datagrams_out']} dgram"
+            f" / {format_bytes(sum(peer['bytes_out'].values()))}"
+            f"  in {sum(peer['packets_in'].values())} pkt in {peer['datagrams_in']} dgram"
+            f" / {format_bytes(sum(peer['bytes_in'].values()))}"
+        )
+        drops = ", ".join(f"{reason} {count}" for reason, count in sorted(peer["drops"].items())) or "0"
+        lines.append(f"  resends {peer['resends']}  dup {peer['duplicate_rate'] * 100:.1f}%  drops {drops}")
+        lines.append(f"  pending {peer.get('pending', 0)}  queued {peer.get('queued', 0)}")
+        histogram = " ".join(str(count) for count in peer["rtt_histogram"].values())
+        lines.append(f"  rtt hist [{histogram}]")
+    return lines
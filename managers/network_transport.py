@@ -0,0 +1,186 @@
+import heapq
+import random
+import socket
+import time
+import config
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+Addr = Tuple[str, int]
+
+# Transport = to, cez čo NetworkManager posiela a prijíma datagramy.
+# UdpTransport je priamo socket, SimulatedTransport pridá oneskorenie, straty,
+# duplikáty, prehádzanie poradia a limit šírky pásma, aby sa dalo testovať na localhoste.
+
+
+class NetworkProfile(NamedTuple):
+    """One-way link conditions applied to every datagram (in both directions)."""
+    latency: float = 0.0        # s, base delay
+    jitter: float = 0.0         # s, spread of the delay distribution
+    distribution: str = "uniform"   # "uniform", "normal" or "pareto" (long tail)
+    loss: float = 0.0           # probability a datagram is dropped
+    duplicate: float = 0.0      # probability a datagram arrives twice
+    reorder: float = 0.0        # probability a datagram is held back behind later ones
+    reorder_delay: float = 0.03  # s, how long a reordered datagram is held back
+    bandwidth: int = 0          # bytes/s, 0 = unlimited
+
+
+PROFILES: Dict[str, NetworkProfile] = {
+    "perfect": NetworkProfile(),
+    "lan": NetworkProfile(latency=0.001, jitter=0.001),
+    "wifi": NetworkProfile(latency=0.005, jitter=0.01, distribution="pareto", loss=0.01, reorder=0.01),
+    "dsl": NetworkProfile(latency=0.02, jitter=0.005, distribution="normal", loss=0.005, bandwidth=128 * 1024),
+    "mobile": NetworkProfile(latency=0.06, jitter=0.03, distribution="pareto", loss=0.03, duplicate=0.01,
+                             reorder=0.03, bandwidth=48 * 1024),
+    "lossy": NetworkProfile(latency=0.03, jitter=0.01, loss=0.15, duplicate=0.05, reorder=0.1),
+    "terrible": NetworkProfile(latency=0.15, jitter=0.08, distribution="pareto", loss=0.25, duplicate=0.05,
+                               reorder=0.15, bandwidth=16 * 1024),
+}
+
+
+class UdpTransport:
+    """Plain non-blocking UDP socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.socket = sock
+
+    def sendto(self, data: bytes, addr: Addr) -> None:
+        self.socket.sendto(data, addr)
+
+    def recvfrom(self, bufsize: int) -> Tuple[bytes, Addr]:
+        return self.socket.recvfrom(bufsize)
+
+    def recvfrom_into(self, buffer: bytearray) -> Tuple[int, Addr]:
+        return self.socket.recvfrom_into(buffer)
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class SimulatedTransport(UdpTransport):
+    """UDP socket with NetworkProfile conditions applied on the way out and on the way in.
+
+    Outgoing datagrams wait in a heap until their delivery time and leave on the
+    next call to any method (NetworkManager touches the transport every frame).
+    Incoming datagrams are drained from the socket into a second heap and handed
+    out once due. Only one instance needs to be simulated to test a link, the
+    round trip then sees the profile twice.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        profile: NetworkProfile,
+        *,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(sock)
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.counters: Counter = Counter()
+        self._order = 0
+        self._outgoing: List[Tuple[float, int, bytes, Addr]] = []
+        self._incoming: List[Tuple[float, int, bytes, Addr]] = []
+        # the link is busy sending until this time (bandwidth limit), per direction
+        self._link_free = {"out": 0.0, "in": 0.0}
+
+    # ---------------- Link model ----------------
+    def _delay(self) -> float:
+        profile = self.profile
+        if profile.distribution == "normal":
+            jitter = abs(self.rng.gauss(0.0, profile.jitter)) if profile.jitter else 0.0
+        elif profile.distribution == "pareto":
+            jitter = (self.rng.paretovariate(3.0) - 1.0) * profile.jitter
+        else:
+            jitter = self.rng.uniform(0.0, profile.jitter)
+        return profile.latency + jitter
+
+    def _schedule(self, heap: list, direction: str, data: bytes, addr: Addr, now: float) -> None:
+        profile = self.profile
+        if self.rng.random() < profile.loss:
+            self.counters[f"{direction}_lost"] += 1
+            return
+
+        departure = now
+        if profile.bandwidth:
+            # datagrams queue behind each other on a slow link
+            departure = max(now, self._link_free[direction]) + len(data) / profile.bandwidth
+            self._link_free[direction] = departure
+
+        copies = 2 if self.rng.random() < profile.duplicate else 1
+        if copies == 2:
+            self.counters[f"{direction}_duplicated"] += 1
+        for _ in range(copies):
+            arrival = departure + self._delay()
+            if self.rng.random() < profile.reorder:
+                arrival += profile.reorder_delay
+                self.counters[f"{direction}_reordered"] += 1
+            self._order += 1
+            heapq.heappush(heap, (arrival, self._order, data, addr))
+
+    def pump(self) -> None:
+        """Send outgoing datagrams that are due and move everything the socket has into the incoming heap."""
+        now = self.clock()
+        while self._outgoing and self._outgoing[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self._outgoing)
+            try:
+                self.socket.sendto(data, addr)
+                self.counters["out_sent"] += 1
+            except OSError:
+                self.counters["out_failed"] += 1
+
+        while True:
+            try:
+                data, addr = self.socket.recvfrom(65535)
+            except (BlockingIOError, InterruptedError, OSError):
+                break
+            self._schedule(self._incoming, "in", data, addr, now)
+
+    # ---------------- Transport API ----------------
+    def sendto(self, data: bytes, addr: Addr) -> None:
+        self._schedule(self._outgoing, "out", bytes(data), addr, self.clock())
+        self.pump()
+
+    def recvfrom(self, bufsize: int) -> Tuple[bytes, Addr]:
+        self.pump()
+        if not self._incoming or self._incoming[0][0] > self.clock():
+            raise BlockingIOError("no simulated datagram due")
+        _, _, data, addr = heapq.heappop(self._incoming)
+        self.counters["in_delivered"] += 1
+        return data[:bufsize], addr
+
+    def recvfrom_into(self, buffer: bytearray) -> Tuple[int, Addr]:
+        data, addr = self.recvfrom(len(buffer))
+        buffer[:len(data)] = data
+        return len(data), addr
+
+    def in_flight(self) -> int:
+        return len(self._outgoing) + len(self._incoming)
+
+    def close(self) -> None:
+        # datagrams already "on the wire" still arrive, only without the rest of their delay
+        for _, _, data, addr in sorted(self._outgoing):
+            try:
+                self.socket.sendto(data, addr)
+            except OSError:
+                pass
+        self._outgoing.clear()
+        self._incoming.clear()
+        super().close()
+
+
+def get_profile(name: str) -> NetworkProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown network profile '{name}', expected one of {', '.join(PROFILES)}")
+
+
+def make_transport(sock: socket.socket, profile: Optional[str] = None) -> UdpTransport:
+    """Transport for *sock*: simulated when *profile* (default config.NETWORK_SIMULATION) names a profile."""
+    profile = config.NETWORK_SIMULATION if profile is None else profile
+    if not profile:
+        return UdpTransport(sock)
+    return SimulatedTransport(sock, get_profile(profile))
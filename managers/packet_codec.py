@@ -0,0 +1,390 @@
+import json
+import struct
+import config
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Packet = Dict[str, Any]
+
+# Binárny formát paketu:
+#   header  = magic (2B) | version (1B) | flags (1B) | scope id (1B) | type id (1B) | channel (1B)
+#             | seq (4B) | channel seq (4B)
+#             | ack (4B) | ack_bits (8B)   -- okno prijatých spoľahlivých paketov druhej strany
+#   payload = kompaktne zakódované data známych typov, inak JSON (flag FLAG_JSON_PAYLOAD)
+# Pakety, ktoré nezačínajú magic bajtmi, sú starý/ladiaci JSON formát.
+# Viac správ v jednom datagrame (bundle):
+#   binary = magic (2B) | version (1B) | FLAG_BUNDLE (1B) | { dĺžka (2B) | správa }*
+#   json   = zoznam paketov [{...}, {...}]
+
+MAGIC = b"BM"
+VERSION = 6
+HEADER = struct.Struct("!2sBBBBBIIIQ")
+
+FLAG_JSON_PAYLOAD = 0x01   # payload is json.dumps(data)
+FLAG_NAMED = 0x02          # scope/type unknown to the id tables, payload is the whole packet as JSON
+FLAG_BUNDLE = 0x04         # datagram holds several length-prefixed messages
+
+BUNDLE_HEADER = struct.Struct("!2sBB")
+BUNDLE_ITEM = struct.Struct("!H")
+
+WIRE_BINARY = "binary"
+WIRE_JSON = "json"
+WIRE_FORMATS = (WIRE_BINARY, WIRE_JSON)
+
+# Poradie sa nesmie meniť (id = index + 1), nové položky iba na koniec a zvýšiť VERSION.
+SCOPES = (
+    "Game",
+    "InputPopup",
+    "LobbyDiscovery",
+    "MultiplayerLobby",
+    "MultiplayerMapSelector",
+    "MultiplayerTestField",
+)
+PACKET_TYPES = (
+    "ACK",
+    "HEARTBEAT",
+    "DISCOVER_HOSTS",
+    "HOST_OFFER",
+    "JOIN",
+    "LEAVE",
+    "READY_TOGGLE",
+    "PLAYER_LIST",
+    "SKIN_UPDATE",
+    "STATE_CHANGE",
+    "SAME_DATA",
+    "MAP_SELECTION",
+    "MOVE_SELECTION",
+    "CONFIRM_SELECTION",
+    "CANCEL_SELECTION",
+    "FINAL_MAP_SELECTION",
+    "READY_TO_TRANSITION",
+    "PLAYER_UPDATE",
+    "BOMB_UPDATE",
+    "POWERUP_UPDATE",
+    "MAP_STATE",
+    "MAP_DELTA",
+    "MAP_RESYNC",
+    "INPUT",
+    "SNAPSHOT",
+    "POWERUP_PICKUP",
+    "GAME_OVER",
+)
+SCOPE_IDS = {name: i + 1 for i, name in enumerate(SCOPES)}
+TYPE_IDS = {name: i + 1 for i, name in enumerate(PACKET_TYPES)}
+
+DIRECTIONS = ("up", "down", "left", "right")
+POWERUP_NAMES = tuple(config.POWERUP_TYPES) + ("darkness_powerup",)
+
+
+# ---------------- Payload helpers ----------------
+def _pack_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    if len(raw) > 255:
+        raise ValueError("string too long")
+    return bytes((len(raw),)) + raw
+
+
+def _unpack_str(payload: bytes, offset: int) -> Tuple[str, int]:
+    length = payload[offset]
+    end = offset + 1 + length
+    if end > len(payload):
+        raise ValueError("truncated string")
+    return payload[offset + 1:end].decode("utf-8"), end
+
+
+def _check_keys(data: Any, keys: Tuple[str, ...]) -> None:
+    if not isinstance(data, dict) or tuple(sorted(data)) != tuple(sorted(keys)):
+        raise ValueError("unexpected payload shape")
+
+
+# ---------------- Compact payloads ----------------
+_SEQ = struct.Struct("!I")
+
+
+def _enc_ack(data: Any) -> bytes:
+    # bare ACK nesie len okno v hlavičke, explicitné ACK aj zoznam starších seq
+    if data is None:
+        return b""
+    _check_keys(data, ("seqs",))
+    return b"".join(_SEQ.pack(seq) for seq in data["seqs"])
+
+
+def _dec_ack(payload: bytes) -> Any:
+    if not payload:
+        return None
+    return {"seqs": [seq for (seq,) in _SEQ.iter_unpack(payload)]}
+
+
+_HEARTBEAT = struct.Struct("!d")
+
+
+def _enc_heartbeat(data: Any) -> bytes:
+    _check_keys(data, ("timestamp",))
+    return _HEARTBEAT.pack(float(data["timestamp"]))
+
+
+def _dec_heartbeat(payload: bytes) -> Any:
+    return {"timestamp": _HEARTBEAT.unpack(payload)[0]}
+
+
+_PLAYER_UPDATE = struct.Struct("!BBB")
+
+
+def _enc_player_update(data: Any) -> bytes:
+    _check_keys(data, ("player_name", "direction", "x", "y"))
+    return _pack_str(data["player_name"]) + _PLAYER_UPDATE.pack(DIRECTIONS.index(data["direction"]), data["x"], data["y"])
+
+
+def _dec_player_update(payload: bytes) -> Any:
+    name, offset = _unpack_str(payload, 0)
+    direction, x, y = _PLAYER_UPDATE.unpack_from(payload, offset)
+    return {"player_name": name, "direction": DIRECTIONS[direction], "x": x, "y": y}
+
+
+_TILE = struct.Struct("!BB")
+
+
+def _enc_bomb_update(data: Any) -> bytes:
+    _check_keys(data, ("player_name", "x", "y"))
+    return _pack_str(data["player_name"]) + _TILE.pack(data["x"], data["y"])
+
+
+def _dec_bomb_update(payload: bytes) -> Any:
+    name, offset = _unpack_str(payload, 0)
+    x, y = _TILE.unpack_from(payload, offset)
+    return {"player_name": name, "x": x, "y": y}
+
+
+_POWERUP = struct.Struct("!BBB")
+
+
+def _enc_powerup_update(data: Any) -> bytes:
+    _check_keys(data, ("pos", "powerup_type"))
+    x, y = map(int, data["pos"].split(","))
+    return _POWERUP.pack(x, y, POWERUP_NAMES.index(data["powerup_type"]))
+
+
+def _dec_powerup_update(payload: bytes) -> Any:
+    x, y, type_id = _POWERUP.unpack(payload)
+    return {"pos": f"{x},{y}", "powerup_type": POWERUP_NAMES[type_id]}
+
+
+_INDEX = struct.Struct("!h")
+
+
+def _enc_move_selection(data: Any) -> bytes:
+    _check_keys(data, ("player_name", "new_index"))
+    return _pack_str(data["player_name"]) + _INDEX.pack(data["new_index"])
+
+
+def _dec_move_selection(payload: bytes) -> Any:
+    name, offset = _unpack_str(payload, 0)
+    return {"player_name": name, "new_index": _INDEX.unpack_from(payload, offset)[0]}
+
+
+_MAP_DELTA = struct.Struct("!IIH")
+_TILE_CHANGE = struct.Struct("!BBB")
+
+
+def _enc_map_delta(data: Any) -> bytes:
+    _check_keys(data, ("rev", "changes", "crc"))
+    parts = [_MAP_DELTA.pack(data["rev"], data["crc"], len(data["changes"]))]
+    parts += [_TILE_CHANGE.pack(x, y, tile) for x, y, tile in data["changes"]]
+    return b"".join(parts)
+
+
+def _dec_map_delta(payload: bytes) -> Any:
+    rev, crc, count = _MAP_DELTA.unpack_from(payload)
+    changes = [list(_TILE_CHANGE.unpack_from(payload, _MAP_DELTA.size + i * _TILE_CHANGE.size)) for i in range(count)]
+    return {"rev": rev, "changes": changes, "crc": crc}
+
+
+_INPUT = struct.Struct("!IB")
+_COMMAND = struct.Struct("!IB")
+
+
+def _enc_input(data: Any) -> bytes:
+    _check_keys(data, ("ack", "commands"))
+    parts = [_INPUT.pack(data["ack"], len(data["commands"]))]
+    parts += [_COMMAND.pack(seq, action) for seq, action in data["commands"]]
+    return b"".join(parts)
+
+
+def _dec_input(payload: bytes) -> Any:
+    ack, count = _INPUT.unpack_from(payload)
+    commands = [list(_COMMAND.unpack_from(payload, _INPUT.size + i * _COMMAND.size)) for i in range(count)]
+    return {"ack": ack, "commands": commands}
+
+
+_SNAPSHOT = struct.Struct("!IIIIBB")
+_PLAYER_ENTRY = struct.Struct("!BBBBBBBH")
+
+
+def _enc_snapshot(data: Any) -> bytes:
+    _check_keys(data, ("tick", "time", "base", "ack", "players", "removed"))
+    parts = [_SNAPSHOT.pack(data["tick"], data["time"], data["base"], data["ack"], len(data["players"]), len(data["removed"]))]
+    for name, entry in data["players"].items():
+        parts.append(_pack_str(name) + _PLAYER_ENTRY.pack(*entry))
+    parts += [_pack_str(name) for name in data["removed"]]
+    return b"".join(parts)
+
+
+def _dec_snapshot(payload: bytes) -> Any:
+    tick, time_ms, base, ack, count, removed_count = _SNAPSHOT.unpack_from(payload)
+    offset = _SNAPSHOT.size
+    players = {}
+    for _ in range(count):
+        name, offset = _unpack_str(payload, offset)
+        players[name] = list(_PLAYER_ENTRY.unpack_from(payload, offset))
+        offset += _PLAYER_ENTRY.size
+    removed = []
+    for _ in range(removed_count):
+        name, offset = _unpack_str(payload, offset)
+        removed.append(name)
+    return {"tick": tick, "time": time_ms, "base": base, "ack": ack, "players": players, "removed": removed}
+
+
+PAYLOAD_CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "ACK": (_enc_ack, _dec_ack),
+    "HEARTBEAT": (_enc_heartbeat, _dec_heartbeat),
+    "PLAYER_UPDATE": (_enc_player_update, _dec_player_update),
+    "BOMB_UPDATE": (_enc_bomb_update, _dec_bomb_update),
+    "POWERUP_UPDATE": (_enc_powerup_update, _dec_powerup_update),
+    "MOVE_SELECTION": (_enc_move_selection, _dec_move_selection),
+    "MAP_DELTA": (_enc_map_delta, _dec_map_delta),
+    "INPUT": (_enc_input, _dec_input),
+    "SNAPSHOT": (_enc_snapshot, _dec_snapshot),
+}
+
+
+# ---------------- Public API ----------------
+def encode_json(packet: Packet) -> bytes:
+    return json.dumps(packet).encode("utf-8")
+
+
+def encode_payload(packet_type: Optional[str], data: Any) -> Tuple[int, bytes]:
+    """(flags, payload) of a binary message, the part that is the same for every peer it goes to."""
+    codec = PAYLOAD_CODECS.get(packet_type)
+    try:
+        if codec is None:
+            raise ValueError("no compact codec")
+        return 0, codec[0](data)
+    except (ValueError, KeyError, TypeError, AttributeError, struct.error):
+        return FLAG_JSON_PAYLOAD, json.dumps(data).encode("utf-8")
+
+
+def encode_binary(packet: Packet, payload: Optional[Tuple[int, bytes]] = None) -> bytes:
+    """Binary message of *packet*; *payload* from encode_payload() skips encoding the data again."""
+    scope = packet.get("scope")
+    packet_type = packet.get("type")
+    seq = packet.get("seq") or 0
+    channel = packet.get("channel") or 0
+    channel_seq = packet.get("channel_seq") or 0
+    ack = packet.get("ack") or 0
+    ack_bits = packet.get("ack_bits") or 0
+    data = packet.get("data")
+
+    scope_id = SCOPE_IDS.get(scope)
+    type_id = TYPE_IDS.get(packet_type)
+    if scope is None and packet_type == "ACK":
+        scope_id = 0
+    if scope_id is None or type_id is None:
+        return HEADER.pack(MAGIC, VERSION, FLAG_NAMED, 0, 0, channel, seq, channel_seq, ack, ack_bits) + encode_json(packet)
+
+    flags, payload = payload if payload is not None else encode_payload(packet_type, data)
+    return HEADER.pack(MAGIC, VERSION, flags, scope_id, type_id, channel, seq, channel_seq, ack, ack_bits) + payload
+
+
+def encode(packet: Packet, wire_format: str = WIRE_BINARY) -> bytes:
+    if wire_format == WIRE_JSON:
+        return encode_json(packet)
+    return encode_binary(packet)
+
+
+def is_binary(raw: bytes) -> bool:
+    return raw[:2] == MAGIC
+
+
+def encode_bundle(messages: List[bytes]) -> bytes:
+    """Join already encoded messages into one datagram (a single message is sent as is)."""
+    if len(messages) == 1:
+        return messages[0]
+    if not any(is_binary(message) for message in messages):
+        return b"[" + b",".join(messages) + b"]"
+    parts = [BUNDLE_HEADER.pack(MAGIC, VERSION, FLAG_BUNDLE)]
+    for message in messages:
+        parts.append(BUNDLE_ITEM.pack(len(message)))
+        parts.append(message)
+    return b"".join(parts)
+
+
+def decode_datagram(raw: bytes) -> List[Packet]:
+    """All packets carried by one datagram, single or bundled. Raises ValueError."""
+    if not is_binary(raw):
+        packets = json.loads(raw.decode("utf-8"))
+        if isinstance(packets, dict):
+            return [packets]
+        if not isinstance(packets, list) or not all(isinstance(packet, dict) for packet in packets):
+            raise ValueError("datagram is not a packet or a list of packets")
+        return packets
+
+    if len(raw) < BUNDLE_HEADER.size:
+        raise ValueError("truncated header")
+    _, version, flags = BUNDLE_HEADER.unpack_from(raw)
+    if not flags & FLAG_BUNDLE:
+        return [decode(raw)]
+    if version != VERSION:
+        raise ValueError(f"unsupported wire version {version}")
+
+    packets = []
+    offset = BUNDLE_HEADER.size
+    while offset < len(raw):
+        if offset + BUNDLE_ITEM.size > len(raw):
+            raise ValueError("truncated bundle")
+        (length,) = BUNDLE_ITEM.unpack_from(raw, offset)
+        offset += BUNDLE_ITEM.size
+        if offset + length > len(raw):
+            raise ValueError("truncated bundle")
+        packets.append(decode(raw[offset:offset + length]))
+        offset += length
+    return packets
+
+
+def decode(raw: bytes) -> Packet:
+    """Decode either format into the usual {'scope', 'type', 'seq', 'data'} dict. Raises ValueError."""
+    if not is_binary(raw):
+        packet = json.loads(raw.decode("utf-8"))
+        if not isinstance(packet, dict):
+            raise ValueError("packet is not an object")
+        return packet
+
+    if len(raw) < HEADER.size:
+        raise ValueError("truncated header")
+    _, version, flags, scope_id, type_id, channel, seq, channel_seq, ack, ack_bits = HEADER.unpack_from(raw)
+    if version != VERSION:
+        raise ValueError(f"unsupported wire version {version}")
+    payload = raw[HEADER.size:]
+
+    if flags & FLAG_NAMED:
+        return json.loads(payload.decode("utf-8"))
+    if not (0 <= scope_id <= len(SCOPES) and 1 <= type_id <= len(PACKET_TYPES)):
+        raise ValueError(f"unknown scope/type id {scope_id}/{type_id}")
+
+    packet_type = PACKET_TYPES[type_id - 1]
+    if flags & FLAG_JSON_PAYLOAD:
+        data = json.loads(payload.decode("utf-8"))
+    else:
+        codec = PAYLOAD_CODECS.get(packet_type)
+        if codec is None:
+            raise ValueError(f"no compact codec for {packet_type}")
+        try:
+            data = codec[1](payload)
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"bad {packet_type} payload: {e}")
+
+    packet: Packet = {
+        "type": packet_type, "seq": seq, "channel": channel, "channel_seq": channel_seq,
+        "data": data, "ack": ack, "ack_bits": ack_bits,
+    }
+    if scope_id:
+        packet = {"scope": SCOPES[scope_id - 1], **packet}
+    return packet
@@ -8,10 +8,9 @@ def load_settings():
             data = json.load(f)
             if "player1_keys" in data:
                 import config
-                config.PLAYER1_MOVE_KEYS[:] = data["player1_keys"]
-                config.PLAYER2_MOVE_KEYS[:] = data["player2_keys"]
-                config.PLAYER_CONFIG[1]['move_keys'] = config.PLAYER1_MOVE_KEYS
-                config.PLAYER_CONFIG[2]['move_keys'] = config.PLAYER2_MOVE_KEYS
+                # plain key codes, config builds PLAYER_CONFIG from these (no pygame needed here)
+                config.PLAYER1_MOVE_KEYS = list(data["player1_keys"])
+                config.PLAYER2_MOVE_KEYS = list(data["player2_keys"])
             return data
     return {}
 
@@ -0,0 +1,35 @@
+import time
+import config
+
+
+class SimulationClock:
+    """Game time that moves only in fixed simulation steps.
+
+    Gameplay code reads time from here instead of time.time() /
+    pygame.time.get_ticks(), so fuses, cooldowns and animations depend on
+    the number of simulated steps and not on how long a frame took to draw.
+    Network timeouts and heartbeats stay on wall-clock time.
+    """
+
+    def __init__(self, fps: int = config.SIMULATION_FPS) -> None:
+        self.step_ms = 1000.0 / fps
+        self.step = self.step_ms / 1000.0
+        self._start_time = time.time()
+        self._elapsed_ms = 0.0
+        self.steps = 0
+
+    def advance(self) -> None:
+        """Move the clock forward by one simulation step."""
+        self._elapsed_ms += self.step_ms
+        self.steps += 1
+
+    def time(self) -> float:
+        """Seconds, drop-in replacement for time.time()."""
+        return self._start_time + self._elapsed_ms / 1000.0
+
+    def get_ticks(self) -> int:
+        """Milliseconds since start, drop-in replacement for pygame.time.get_ticks()."""
+        return int(self._elapsed_ms)
+
+
+sim_clock = SimulationClock()
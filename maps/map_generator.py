@@ -1,5 +1,6 @@
 import random
 import config
+from maps.special_tiles import SpecialTileIndex
 
 # Konštanty
 rows = config.ROWS
@@ -40,11 +41,12 @@ def generate_map(map_name: str, seed: int | None = None) -> list[list[int]]:
 
     specials = config.MAP_FIXED_SPECIALS.get(map_name, {"portals_blue": [], "portals_red": [], "sewers": 0})
     
-    special_positions = {}
-    for pos in specials["portals_blue"]:
-        special_positions[pos] = portal_blue
-    for pos in specials["portals_red"]:
-        special_positions[pos] = portal_red
+    # Portály aj sewers sa evidujú v indexe - rovnaký index používa hra pri teleportoch a pasciach
+    special_tiles = SpecialTileIndex()
+    for r, c in specials["portals_blue"]:
+        special_tiles.set_tile(c, r, portal_blue)
+    for r, c in specials["portals_red"]:
+        special_tiles.set_tile(c, r, portal_red)
 
     grid = []
 
@@ -55,8 +57,8 @@ def generate_map(map_name: str, seed: int | None = None) -> list[list[int]]:
             pos = (r, c)
             if r == 0:
                 row.append(menu)
-            elif pos in special_positions:
-                row.append(special_positions[pos])
+            elif special_tiles.is_special(c, r):
+                row.append(special_tiles.get(c, r))
             elif is_fixed_wall(r, c):
                 row.append(wall)
             elif pos in all_safe:
@@ -74,7 +76,7 @@ def generate_map(map_name: str, seed: int | None = None) -> list[list[int]]:
                 pos = (r, c)
                 if pos in all_safe:
                     continue
-                if pos in special_positions:
+                if special_tiles.is_special(c, r):
                     continue
                 if is_fixed_wall(r, c):
                     continue
@@ -83,6 +85,7 @@ def generate_map(map_name: str, seed: int | None = None) -> list[list[int]]:
         chosen = random.sample(candidates, min(num_sewers, len(candidates)))
         for r, c in chosen:
             grid[r][c] = sewer
+            special_tiles.set_tile(c, r, sewer)
 
     return grid
 
@@ -0,0 +1,111 @@
+import zlib
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+from maps.map_generator import generate_map
+
+Tile = Tuple[int, int]
+TileMap = List[List[int]]
+Change = Tuple[int, int, int]   # (x, y, new tile)
+
+# Synchronizácia mapy v multiplayeri:
+#   MAP_STATE  = snapshot: meno mapy + seed generátora (hostia si mapu vygenerujú sami) a zoznam
+#                zmien od vygenerovania, alebo celá mapa (hex číslica na políčko); k tomu revízia a crc32 mapy
+#   MAP_DELTA  = zmeny políčok jedného ticku s novou revíziou a crc32 po ich aplikovaní
+#   MAP_RESYNC = host pošle nový snapshot (nesedí crc, chýba revízia, neskorý join)
+
+
+def checksum(tile_map: TileMap) -> int:
+    return zlib.crc32(bytes(chain.from_iterable(tile_map)))
+
+
+def pack_tiles(tile_map: TileMap) -> str:
+    """Row-major tiles as one hex digit each (all tile values are below 16)."""
+    return "".join(format(tile, "x") for tile in chain.from_iterable(tile_map))
+
+
+def unpack_tiles(packed: str, cols: int) -> TileMap:
+    if not packed or len(packed) % cols:
+        raise ValueError(f"packed map of {len(packed)} tiles does not fit {cols} columns")
+    flat = [int(char, 16) for char in packed]
+    return [flat[i:i + cols] for i in range(0, len(flat), cols)]
+
+
+class MapState:
+    """Revision counter and change log of one match's tile map.
+
+    The host records every tile change, sends them once per tick as a delta and
+    keeps the net changes since generation so a snapshot is just the seed plus
+    that list. Guests check each delta's revision and checksum and ask for a
+    new snapshot when something does not add up. *tile_map* is shared with the
+    state, MapState never modifies it.
+    """
+
+    def __init__(self, map_name: str, tile_map: TileMap, seed: Optional[int] = None):
+        self.map_name = map_name
+        self.tile_map = tile_map
+        self.seed = seed
+        self.base_crc = checksum(tile_map) if seed is not None else None
+        self.rev = 0
+        self.changes: Dict[Tile, int] = {}
+        self._pending: List[Change] = []
+
+    # ---------------- Host ----------------
+    def record(self, x: int, y: int, tile: int) -> None:
+        self.changes[(x, y)] = tile
+        self._pending.append((x, y, tile))
+
+    def take_delta(self) -> Optional[dict]:
+        """MAP_DELTA data for the changes recorded since the last call (None if nothing changed)."""
+        if not self._pending:
+            return None
+        self.rev += 1
+        delta = {"rev": self.rev, "changes": [list(change) for change in self._pending], "crc": checksum(self.tile_map)}
+        self._pending.clear()
+        return delta
+
+    def snapshot(self, full: bool = False) -> dict:
+        """MAP_STATE data: seed + change replay when possible, otherwise (or with *full*) all packed tiles."""
+        data = {"map_name": self.map_name, "rev": self.rev, "crc": checksum(self.tile_map)}
+        if self.seed is not None and not full:
+            data["seed"] = self.seed
+            data["base_crc"] = self.base_crc
+            data["changes"] = [[x, y, tile] for (x, y), tile in self.changes.items()]
+        else:
+            data["tiles"] = pack_tiles(self.tile_map)
+            data["cols"] = len(self.tile_map[0])
+        return data
+
+    # ---------------- Guest ----------------
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "MapState":
+        """Rebuild the map of a MAP_STATE. Raises ValueError when it does not match the host's checksum."""
+        if "seed" in data:
+            tile_map = generate_map(data["map_name"], data["seed"])
+            if checksum(tile_map) != data["base_crc"]:
+                raise ValueError("map generated from seed differs from the host's")
+            state = cls(data["map_name"], tile_map, data["seed"])
+            for x, y, tile in data["changes"]:
+                tile_map[y][x] = tile
+                state.changes[(x, y)] = tile
+        else:
+            state = cls(data["map_name"], unpack_tiles(data["tiles"], data["cols"]))
+        state.rev = data["rev"]
+        state.verify(data["crc"])
+        return state
+
+    def accept_delta(self, delta: dict) -> Optional[List[Change]]:
+        """Changes of *delta* to apply, None if the current snapshot already has them. Raises ValueError on a gap."""
+        rev = delta["rev"]
+        if rev <= self.rev:
+            return None
+        if rev != self.rev + 1:
+            raise ValueError(f"map revision {self.rev + 1} missing, got {rev}")
+        self.rev = rev
+        changes = [(x, y, tile) for x, y, tile in delta["changes"]]
+        for x, y, tile in changes:
+            self.changes[(x, y)] = tile
+        return changes
+
+    def verify(self, crc: int) -> None:
+        if checksum(self.tile_map) != crc:
+            raise ValueError(f"map checksum mismatch at revision {self.rev}")
@@ -0,0 +1,69 @@
+import bisect
+import config
+from typing import Dict, List, Optional, Tuple
+
+Tile = Tuple[int, int]
+
+# Políčka, ktorých pozície sa oplatí mať zaindexované (portály a kanály)
+SPECIAL_TILES = (config.PORTAL_BLUE, config.PORTAL_RED, config.SEWER)
+
+
+class SpecialTileIndex:
+    """Positions of portal and sewer tiles of one tile map.
+
+    Built once when the map loads and kept up to date through set_tile(),
+    so teleport pairing and sewer checks do not scan the whole map.
+    Positions are (x, y) tiles kept in row-major order, which is the order
+    the old full-map scan found them in.
+    """
+
+    def __init__(self, tile_map: Optional[List[List[int]]] = None):
+        self._positions: Dict[int, List[Tile]] = {tile: [] for tile in SPECIAL_TILES}
+        self._tiles: Dict[Tile, int] = {}
+        if tile_map is not None:
+            self.rebuild(tile_map)
+
+    def rebuild(self, tile_map: List[List[int]]) -> None:
+        for positions in self._positions.values():
+            positions.clear()
+        self._tiles.clear()
+        for y, row in enumerate(tile_map):
+            for x, tile in enumerate(row):
+                if tile in self._positions:
+                    self._add(x, y, tile)
+
+    def set_tile(self, x: int, y: int, tile: int) -> None:
+        """Update the index after tile (x, y) changed to *tile*."""
+        old = self._tiles.pop((x, y), None)
+        if old is not None:
+            positions = self._positions[old]
+            positions.pop(bisect.bisect_left(positions, (y, x), key=lambda pos: (pos[1], pos[0])))
+        if tile in self._positions:
+            self._add(x, y, tile)
+
+    def _add(self, x: int, y: int, tile: int) -> None:
+        self._tiles[(x, y)] = tile
+        bisect.insort(self._positions[tile], (x, y), key=lambda pos: (pos[1], pos[0]))
+
+    # ------------------------------------------------------------------ queries
+    def positions(self, tile: int) -> List[Tile]:
+        return list(self._positions.get(tile, ()))
+
+    def get(self, x: int, y: int) -> Optional[int]:
+        return self._tiles.get((x, y))
+
+    def is_special(self, x: int, y: int) -> bool:
+        return (x, y) in self._tiles
+
+    def is_sewer(self, x: int, y: int) -> bool:
+        return self._tiles.get((x, y)) == config.SEWER
+
+    def paired_teleport(self, x: int, y: int) -> Optional[Tile]:
+        """First other portal of the same colour as the one on (x, y)."""
+        tile = self._tiles.get((x, y))
+        if tile not in (config.PORTAL_BLUE, config.PORTAL_RED):
+            return None
+        for pos in self._positions[tile][:2]:
+            if pos != (x, y):
+                return pos
+        return None
@@ -7,6 +7,8 @@ from managers.state_manager import StateManager
 from custom_classes.button import Button
 from image_loader import load_images
 class MainMenu(State):
+    tracks_dirty_rects = True
+
     def __init__(self, game):
         State.__init__(self, game)
         pygame.display.set_caption("BomberMan: MainMenu")
@@ -26,6 +28,7 @@ class MainMenu(State):
 
         # Fade-in
         self.fade_alpha = config.FADE_ALPHA
+        self._background = None
 
         # Layout tlačidiel – stĺpec vycentrovaný
         btn_w  = config.BUTTON_WIDTH
@@ -117,15 +120,10 @@ class MainMenu(State):
         self.game.state_manager.change_state("SkinSelector")
 
     # ------------------------------------------------------------------ render
-    def render(self, screen):
-        pygame.display.set_caption("BomberMan: MainMenu")
-        if self.bg_image:
-            screen.blit(pygame.transform.scale(self.bg_image, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)), (0, 0))
-        # Fade-in
-        self.fade_alpha = max(self.fade_alpha - 8, 0)
-
-        # Pozadie
-        screen.fill(config.BG_BASE)
+    def _build_background(self):
+        """Pozadie, titulok a pätička sa nemenia - vykreslia sa raz do jedného surface."""
+        background = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)).convert()
+        background.fill(config.BG_BASE)
         if self.bg_image:
             bg_s = pygame.transform.scale(
                 self.bg_image, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
@@ -134,8 +132,8 @@ class MainMenu(State):
                 (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA
             )
             dark.fill((10, 12, 18, 180))
-            screen.blit(bg_s, (0, 0))
-            screen.blit(dark, (0, 0))
+            background.blit(bg_s, (0, 0))
+            background.blit(dark, (0, 0))
 
         cx = config.SCREEN_WIDTH // 2
 
@@ -143,16 +141,28 @@ class MainMenu(State):
         if self.text_bomberman:
             title_image = pygame.transform.scale(self.text_bomberman, (500, 200))
             title_rect  = title_image.get_rect(center=(cx, config.SCREEN_HEIGHT // 4))
-            screen.blit(title_image, title_rect)
-
-        # Tlačidlá
-        self.singleplayer_button.draw(screen)
-        self.multiplayer_button.draw(screen)
-        self.settings_button.draw(screen)
+            background.blit(title_image, title_rect)
 
         # Verzia / hint dole
-        self._text(screen, "© 2025  BOMBERMAN", self.font_xs, config.TEXT_HINT,
+        self._text(background, "© 2025  BOMBERMAN", self.font_xs, config.TEXT_HINT,
                    (cx, config.SCREEN_HEIGHT - 22), align="center")
+        return background
+
+    def render(self, screen):
+        pygame.display.set_caption("BomberMan: MainMenu")
+        if self._background is None:
+            self._background = self._build_background()
+        # Fade-in (kým beží, aj v poslednom frame bez overlay, posiela sa celá obrazovka)
+        if self.fade_alpha > 0:
+            self.request_full_redraw()
+        self.fade_alpha = max(self.fade_alpha - 8, 0)
+
+        screen.blit(self._background, (0, 0))
+
+        # Tlačidlá (hover sa mení, preto sa posielajú každý frame)
+        for button in (self.singleplayer_button, self.multiplayer_button, self.settings_button):
+            button.draw(screen)
+            self.mark_dirty(button.rect.inflate(4, 4))
 
         # Fade-in overlay
         if self.fade_alpha > 0:
@@ -3,8 +3,11 @@ import config
 import os
 from states.general.state import State
 from custom_classes.button import Button
+from managers.asset_manager import asset_manager
 from managers.settings_manager import save_settings
 
+SOUND_ICON_SIZE = (20, 20)
+
 
 class Settings(State):
     def __init__(self, game):
@@ -22,18 +25,15 @@ class Settings(State):
 
         # Pozadie
         try:
-            self.background_image = pygame.transform.scale(
-                pygame.image.load(os.path.join("assets","backgrounds", "menu", "bg.png")).convert_alpha(),
-                (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+            self.background_image = asset_manager.load_image(
+                os.path.join("assets","backgrounds", "menu", "bg.png"), (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
             )
         except Exception:
             self.background_image = None
 
         # Zvukové ikony
-        self.sound_on_img  = pygame.transform.scale(
-            pygame.image.load("assets/menu_items/not_muted.png").convert_alpha(), (20, 20))
-        self.sound_off_img = pygame.transform.scale(
-            pygame.image.load("assets/menu_items/mute.png").convert_alpha(), (20, 20))
+        self.sound_on_img  = asset_manager.load_image("assets/menu_items/not_muted.png", SOUND_ICON_SIZE)
+        self.sound_off_img = asset_manager.load_image("assets/menu_items/mute.png", SOUND_ICON_SIZE)
 
         # Key bindings
         self.key_bindings = {
@@ -1,7 +1,19 @@
+import pygame
+
+
 class State:
+    # States that report their changed areas through mark_dirty() set this to True.
+    # Everything else is pushed to the display as a full frame.
+    tracks_dirty_rects = False
+
     def __init__(self, game):
         self.game = game
         self.prev_state = None
+        self._dirty_rects: list[pygame.Rect] = []
+        self._last_dirty_rects: list[pygame.Rect] = []
+        self._full_redraw = True
+        self._overlay_key = None
+        self._overlay_rects: list[pygame.Rect] = []
 
     def render(self, screen):
         pass
@@ -19,3 +31,35 @@ class State:
 
     def exit_state(self):
         self.game.state_stack.pop()
+
+    # ---------------- Dirty rects ----------------
+    def mark_dirty(self, rect) -> None:
+        """Record an area drawn this frame that may differ from the last one."""
+        self._dirty_rects.append(pygame.Rect(rect))
+
+    def request_full_redraw(self) -> None:
+        self._full_redraw = True
+
+    def mark_overlay(self, key, rects) -> None:
+        """Mark a mostly static overlay (HUD, texts) only when *key* changed.
+
+        Both the old and the new rects are marked, so shrinking texts get erased.
+        """
+        if key == self._overlay_key:
+            return
+        for rect in self._overlay_rects:
+            self.mark_dirty(rect)
+        self._overlay_key = key
+        self._overlay_rects = [pygame.Rect(rect) for rect in rects]
+        for rect in self._overlay_rects:
+            self.mark_dirty(rect)
+
+    def get_dirty_rects(self) -> list[pygame.Rect] | None:
+        """Return this frame's dirty rects plus last frame's (to erase what moved away),
+        or None when the whole screen has to be pushed."""
+        rects, self._dirty_rects = self._dirty_rects, []
+        previous, self._last_dirty_rects = self._last_dirty_rects, rects
+        if not self.tracks_dirty_rects or self._full_redraw:
+            self._full_redraw = False
+            return None
+        return previous + rects
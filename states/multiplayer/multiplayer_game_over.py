@@ -17,7 +17,7 @@ class MultiplayerGameOver(State):
 
         self.images = load_images()
         self.bg = self.images['skinselector_bg']
-        self.winner: str = winner
+        self.winner: str | None = winner   # None = the last players died together
 
         # Create buttons
         self.exit_button = Button(config.SCREEN_WIDTH // 2 - 60,
@@ -40,10 +40,16 @@ class MultiplayerGameOver(State):
             self.exit_state()
             self.exit_state()
             self.network_manager.close_socket()
+    def update(self):
+        # keeps resending until the peers ACK it (GAME_OVER from the host, sent right before this state)
+        if self.network_manager.socket is not None:
+            self.network_manager.update()
+
     def render(self, screen):
         screen.blit(self.bg, (0, 0))
         self.game.draw_text(screen, "GAME OVER", config.COLOR_BLACK, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 4)
-        self.game.draw_text(screen, f"{self.winner} won!", config.COLOR_BLACK, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 3)
+        result = f"{self.winner} won!" if self.winner else "Nobody survived!"
+        self.game.draw_text(screen, result, config.COLOR_BLACK, config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 3)
         self.exit_button.draw(screen)
 
 
@@ -125,7 +125,8 @@ class InputPopup(State):
             self._set_status('Select a discovered lobby.')
 
     def send_join_request(self, player_name, join_addr):
-        self.network_manager.send_packet(join_addr, 'JOIN', {'player_name': player_name}, 'MultiplayerLobby')
+        data = {'player_name': player_name, 'wire_format': self.network_manager.wire_format}
+        self.network_manager.send_packet(join_addr, 'JOIN', data, 'MultiplayerLobby')
 
     def request_lobby_discovery(self, force=False):
         now = time.time()
@@ -269,11 +270,11 @@ class InputPopup(State):
             self._set_status(packet_data.get('msg', 'Unable to join selected game.'))
             return        
     def update(self):
-        while True:
-            packet_poll = self.network_manager.poll()
-            if not packet_poll:
-                break
-            self.handle_packet(packet_poll)
+        scopes = ('InputPopup', 'MultiplayerLobby', 'LobbyDiscovery')
+        batch = self.network_manager.poll_batch(scopes)
+        for scope in scopes:
+            for packet_poll in batch.get(scope, ()):
+                self.handle_packet(packet_poll)
 
         if self.status_text and time.time() - self.status_time > self.status_duration:
             self.status_text = ''
@@ -1,14 +1,16 @@
 import os
+import logging
 import socket
 import pygame
 import config
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from states.general.state import State
 from custom_classes.button import Button
 from managers.music_manager import MusicManager
 from managers.state_manager import StateManager
 from managers.network_manager import NetworkManager
+from managers.asset_manager import asset_manager
 from image_loader import load_images, load_hat_images, load_bomb_images, load_explosion_images
 
 # --------------------------------------------------------------------------- #
@@ -17,6 +19,9 @@ from image_loader import load_images, load_hat_images, load_bomb_images, load_ex
 Addr   = Tuple[str, int]
 Packet = Dict[str, Any]
 
+logger = logging.getLogger(__name__)
+logger.setLevel(config.NETWORK_LOG_LEVEL)
+
 # --------------------------------------------------------------------------- #
 # Constants
 # --------------------------------------------------------------------------- #
@@ -108,10 +113,7 @@ class MultiplayerLobby(State):
                            or f"{player_name}'s Lobby"
 
         # Network / state-change bookkeeping
-        self.leave_seq:                Optional[int]          = None
-        self.leave_target_addr:        Optional[Addr]         = None
-        self.pending_state_change:     Optional[str]          = None
-        self.state_change_seq_by_addr: Dict[Addr, int]        = {}
+        self.leave_seqs:               Dict[Addr, int]        = {}
         self.host_setup_failed = False
         self.host_setup_error  = ""
 
@@ -119,7 +121,7 @@ class MultiplayerLobby(State):
         self.players_list: Dict[str, PlayerData] = (
             self._deserialize_player_list(players_list) if players_list else {}
         )
-        self.max_players = 2
+        self.max_players = config.MAX_PLAYERS
 
         # Animation
         self.last_idle_update = pygame.time.get_ticks()
@@ -188,13 +190,13 @@ class MultiplayerLobby(State):
                 f"Could not start lobby on port {config.SERVER_PORT}. "
                 "Another game instance may already be running."
             )
-            print(f"[LOBBY ERROR] {self.host_setup_error} ({exc})")
+            logger.warning("[LOBBY ERROR] %s (%s)", self.host_setup_error, exc)
 
         if not resolved_ip:
-            print("[LOBBY WARNING] Could not resolve a LAN IP – falling back to 127.0.0.1.")
+            logger.warning("[LOBBY WARNING] Could not resolve a LAN IP – falling back to 127.0.0.1.")
 
         host_addr = (self.host_ip, config.SERVER_PORT)
-        print(f"[LOBBY CREATED] host={self.host_ip}  lobby='{self.lobby_name}'")
+        logger.info("[LOBBY CREATED] host=%s  lobby='%s'", self.host_ip, self.lobby_name)
 
         self.players_list[self.player_name] = PlayerData(
             self.player_name, host_addr, is_host=True, is_ready=True
@@ -229,9 +231,8 @@ class MultiplayerLobby(State):
         self.idle_frames: list[pygame.Surface] = []
         for i in range(3):
             path  = os.path.join(self.game.photos_dir, "player_animations", f"p_1_idle_{i}.png")
-            frame = pygame.image.load(path).convert_alpha()
-            w, h  = frame.get_size()
-            self.idle_frames.append(pygame.transform.scale(frame, (w * 4, h * 4)))
+            w, h  = asset_manager.load_image(path).get_size()
+            self.idle_frames.append(asset_manager.load_image(path, (w * 4, h * 4)))
 
         self.hat_images,       self.hat_thumbs       = load_hat_images()
         self.bomb_images,      self.bomb_thumbs      = load_bomb_images()
@@ -239,32 +240,16 @@ class MultiplayerLobby(State):
 
     def _cache_tinted_frames(self, color_index: Optional[int] = None) -> None:
         """
-        Pre-generate tinted idle sprites for every player's current color,
-        or for a single *color_index* when one is supplied.
-        Already-cached indices are skipped.
+        Look up tinted idle sprites in the shared asset cache: every available
+        color at once, or a single *color_index* when one is supplied.
+        Each color is tinted only once per process, later lobbies reuse them.
         """
-        if not self.players_list:
-            return
-
-        indices_to_cache = (
-            [color_index] if color_index is not None
-            else [p.color_index for p in self.players_list.values()]
-        )
-
-        for idx in indices_to_cache:
-            if idx in self.tinted_idle_images:
-                continue
-            color  = self.available_colors[idx]
-            frames = tuple(self._tint_surface(f, color) for f in self.idle_frames)
-            self.tinted_idle_images[idx] = frames
-
-    @staticmethod
-    def _tint_surface(image: pygame.Surface, color: tuple) -> pygame.Surface:
-        tinted = image.copy()
-        overlay = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        overlay.fill((*color, 255))
-        tinted.blit(overlay, (0, 0), special_flags=pygame.BLEND_MULT)
-        return tinted
+        key = ("player_idle", 1, self.idle_frames[0].get_size())
+        indices = [color_index] if color_index is not None else range(len(self.available_colors))
+        for idx in indices:
+            if idx not in self.tinted_idle_images:
+                frames = asset_manager.get_tinted_frames(key, self.idle_frames, self.available_colors[idx])
+                self.tinted_idle_images[idx] = tuple(frames)
 
     # ---------------------------------------------------------------------- #
     # Index / selection sync helpers
@@ -379,36 +364,25 @@ class MultiplayerLobby(State):
         for player in self.players_list.values():
             if player.addr == self.my_player.addr:
                 continue
-            print(f"[PLAYER_LIST] Sending to {player.addr}")
+            logger.debug("[PLAYER_LIST] Sending to %s", player.addr)
             self.network_manager.send_packet(player.addr, PKT_PLAYER_LIST, data, LOBBY_SCOPE)
 
     def _begin_state_change(self, new_state: str) -> None:
-        """Host-only: notify all peers and wait for ACKs before transitioning."""
+        """Host-only: notify all peers and transition right away.
+
+        STATE_CHANGE goes on the ordered channel, so every peer handles it before
+        any packet the next state sends; those wait in NetworkManager for the new scope.
+        """
         if not (self.my_player and self.my_player.is_host):
             return
-        if self.pending_state_change:
-            return
-
-        self.pending_state_change     = new_state
-        self.state_change_seq_by_addr = {}
 
         for player in self.players_list.values():
             if player.addr == self.my_player.addr:
                 continue
-            seq = self.network_manager.send_packet(
+            self.network_manager.send_packet(
                 player.addr, PKT_STATE_CHANGE, {"state": new_state}, LOBBY_SCOPE
             )
-            self.state_change_seq_by_addr[player.addr] = seq
-
-        if not self.state_change_seq_by_addr:
-            self._complete_state_change()
 
-    def _complete_state_change(self) -> None:
-        if not self.pending_state_change:
-            return
-        new_state = self.pending_state_change
-        self.pending_state_change = None
-        self.state_change_seq_by_addr.clear()
         self.exit_state()
         self.state_manager.change_state(
             new_state, self.players_list, self.network_manager, self.player_name
@@ -430,12 +404,9 @@ class MultiplayerLobby(State):
                 self.network_manager.send_packet(player.addr, packet_type, data, scope)
                 return
 
-    def _get_peer_player(self) -> Optional[PlayerData]:
-        """Return the first player that is not the local player, or None."""
-        return next(
-            (p for name, p in self.players_list.items() if name != self.player_name),
-            None,
-        )
+    def _get_peer_players(self) -> List[PlayerData]:
+        """Return every player except the local one."""
+        return [p for name, p in self.players_list.items() if name != self.player_name]
 
     def _get_host_player(self) -> Optional[PlayerData]:
         return next((p for p in self.players_list.values() if p.is_host), None)
@@ -470,11 +441,11 @@ class MultiplayerLobby(State):
     # Network – packet dispatch
     # ---------------------------------------------------------------------- #
     def _drain_network_packets(self) -> None:
-        while True:
-            poll_data = self.network_manager.poll()
-            if not poll_data:
-                break
-            self._dispatch_packet(poll_data)
+        scopes = (LOBBY_DISCOVERY_SCOPE, LOBBY_SCOPE)
+        batch = self.network_manager.poll_batch(scopes)
+        for scope in scopes:
+            for poll_data in batch.get(scope, ()):
+                self._dispatch_packet(poll_data)
 
     def _dispatch_packet(self, poll_data: Tuple[Packet, Addr]) -> None:
         packet, addr = poll_data
@@ -525,11 +496,11 @@ class MultiplayerLobby(State):
         player_name = data.get("player_name", "UNKNOWN")
 
         if len(self.players_list) >= self.max_players:
-            print(f"[JOIN REJECTED] Lobby full – {player_name} from {addr}")
+            logger.warning("[JOIN REJECTED] Lobby full – %s from %s", player_name, addr)
             return
 
         if player_name in self.players_list:
-            print(f"[JOIN REJECTED] Name taken – {player_name} from {addr}")
+            logger.warning("[JOIN REJECTED] Name taken – %s from %s", player_name, addr)
             self.network_manager.send_packet(
                 addr, PKT_SAME_DATA,
                 {"msg": f"Player '{player_name}' is already in the lobby."},
@@ -538,7 +509,7 @@ class MultiplayerLobby(State):
             return
 
         if any(p.addr == addr for p in self.players_list.values()):
-            print(f"[JOIN REJECTED] Address already present – {addr}")
+            logger.warning("[JOIN REJECTED] Address already present – %s", addr)
             return
 
         # Build new player with a unique color
@@ -556,22 +527,26 @@ class MultiplayerLobby(State):
 
         self.players_list[player_name] = new_player
         self.network_manager.register_peer(addr)
-        print(f"[JOIN] {player_name} joined from {addr}")
+        wire_format = self.network_manager.negotiate_wire_format(addr, data.get("wire_format"))
+        logger.info("[JOIN] %s joined from %s (%s)", player_name, addr, wire_format)
         self._broadcast_player_list()
 
     def _on_leave(self, data: dict, addr: Addr) -> None:
         player_name = data.get("player_name")
         if player_name in self.players_list:
             del self.players_list[player_name]
-            print(f"[LEAVE] {player_name} left from {addr}")
+            self.network_manager.unregister_peer(addr)
+            logger.info("[LEAVE] %s left from %s", player_name, addr)
+            if self.is_host:
+                self._broadcast_player_list()
 
     def _on_player_list(self, data: dict, addr: Addr) -> None:
         self.players_list = self._deserialize_player_list(data.get("player_list", {}))
-        print(f"[PLAYER_LIST] Updated: {list(self.players_list.keys())}")
+        logger.debug("[PLAYER_LIST] Updated: %s", list(self.players_list))
 
     def _on_state_change(self, data: dict, addr: Addr) -> None:
         state = data.get("state")
-        print(f"[STATE_CHANGE] → {state} from {addr}")
+        logger.info("[STATE_CHANGE] → %s from %s", state, addr)
         self.exit_state()
         self.state_manager.change_state(
             MAP_SELECTOR_SCOPE, self.players_list, self.network_manager, self.player_name, self.lobby_name
@@ -580,19 +555,19 @@ class MultiplayerLobby(State):
     def _on_skin_update(self, data: dict, addr: Addr) -> None:
         player_name = data.get("player_name")
         if player_name not in self.players_list:
-            print(f"[SKIN_UPDATE ERROR] Unknown player '{player_name}' from {addr}")
+            logger.warning("[SKIN_UPDATE ERROR] Unknown player '%s' from %s", player_name, addr)
             return
         self._apply_skin_packet_to_player(self.players_list[player_name], data)
-        print(f"[SKIN_UPDATE] {player_name} updated skin.")
+        logger.debug("[SKIN_UPDATE] %s updated skin.", player_name)
 
     def _on_ready_toggle(self, data: dict, addr: Addr) -> None:
         player_name = data.get("player_name")
         if player_name not in self.players_list:
-            print(f"[READY_TOGGLE ERROR] Unknown player '{player_name}' from {addr}")
+            logger.warning("[READY_TOGGLE ERROR] Unknown player '%s' from %s", player_name, addr)
             return
         player = self.players_list[player_name]
         player.is_ready = not player.is_ready
-        print(f"[READY_TOGGLE] {player_name} is_ready={player.is_ready}")
+        logger.debug("[READY_TOGGLE] %s is_ready=%s", player_name, player.is_ready)
 
     # ---------------------------------------------------------------------- #
     # Periodic checks (called from update)
@@ -600,41 +575,31 @@ class MultiplayerLobby(State):
     def _handle_failed_host_setup(self) -> bool:
         if not self.host_setup_failed:
             return False
-        print(f"[LOBBY EXIT] {self.host_setup_error} Returning to MainMenu.")
+        logger.warning("[LOBBY EXIT] %s Returning to MainMenu.", self.host_setup_error)
         self.host_setup_failed = False
         self.exit_state()
         return True
 
-    def _check_state_change_acks(self) -> None:
-        if not self.pending_state_change:
-            return
-        all_acked = all(
-            self.network_manager.get_completed_seq(addr, seq=seq)
-            for addr, seq in self.state_change_seq_by_addr.items()
-        )
-        if all_acked:
-            self._complete_state_change()
-
     def _check_leave_seq(self) -> None:
-        if not (self.leave_seq and self.leave_target_addr):
+        if not self.leave_seqs:
             return
-        if self.network_manager.get_completed_seq(self.leave_target_addr, seq=self.leave_seq):
-            print(f"[LEFT LOBBY] {self.my_player.name} has left the lobby.")
+        if all(self.network_manager.get_completed_seq(addr, seq=seq) for addr, seq in self.leave_seqs.items()):
+            logger.info("[LEFT LOBBY] %s has left the lobby.", self.my_player.name)
             self.network_manager.close_socket()
             self.exit_state()
 
     def _check_timed_out_peer(self) -> None:
-        if not self.network_manager.peer_timedout:
+        timed_out = self.network_manager.pop_timed_out_peers()
+        if not timed_out:
             return
         if self.my_player.is_host:
-            # Remove the first non-host player that timed out
-            for name in list(self.players_list):
-                if name != self.my_player.name:
+            for name, player in list(self.players_list.items()):
+                if player.addr in timed_out and name != self.my_player.name:
                     del self.players_list[name]
-                    print(f"[TIMEOUT] {name} timed out – removed from lobby.")
-                    break
+                    logger.warning("[TIMEOUT] %s timed out – removed from lobby.", name)
+            self._broadcast_player_list()
         else:
-            print("[TIMEOUT] Host timed out – returning to MainMenu.")
+            logger.warning("[TIMEOUT] Host timed out – returning to MainMenu.")
             self.network_manager.close_socket()
             self.exit_state()
             self.exit_state()
@@ -647,7 +612,6 @@ class MultiplayerLobby(State):
             return
         self._check_timed_out_peer()
         self._check_leave_seq()
-        self._check_state_change_acks()
         self._update_idle_animation()
         self._drain_network_packets()
         self.network_manager.update()
@@ -700,21 +664,19 @@ class MultiplayerLobby(State):
     def _leave_lobby(self) -> None:
         packet_data = {"player_name": self.my_player.name}
         if self.my_player.is_host:
-            peer = self._get_peer_player()
-            if not peer:
+            peers = self._get_peer_players()
+            if not peers:
                 self.network_manager.close_socket()
                 self.exit_state()
                 return
-            self.leave_target_addr = peer.addr
-            self.leave_seq = self.network_manager.send_packet(
-                peer.addr, PKT_LEAVE, packet_data, LOBBY_SCOPE
-            )
+            addrs = tuple(peer.addr for peer in peers)
+            seqs = self.network_manager.broadcast_packet(addrs, PKT_LEAVE, packet_data, LOBBY_SCOPE)
+            self.leave_seqs = dict(zip(addrs, seqs))
         else:
             host = self._get_host_player()
-            self.leave_target_addr = host.addr
-            self.leave_seq = self.network_manager.send_packet(
-                host.addr, PKT_LEAVE, packet_data, LOBBY_SCOPE
-            )
+            self.leave_seqs = {
+                host.addr: self.network_manager.send_packet(host.addr, PKT_LEAVE, packet_data, LOBBY_SCOPE)
+            }
 
     # ---------------------------------------------------------------------- #
     # Rendering
@@ -735,12 +697,14 @@ class MultiplayerLobby(State):
         screen.blit(subtitle_surf, subtitle_surf.get_rect(center=(cx, 56)))
 
     def _draw_player_panels(self, screen: pygame.Surface) -> None:
-        for idx, player in enumerate(list(self.players_list.values())[:2]):
-            x, y = self._panel_position(idx)
+        players = list(self.players_list.values())[:self.max_players]
+        for idx, player in enumerate(players):
+            x, y = self._panel_position(idx, len(players))
             self._draw_player_panel(screen, player, x, y)
 
     def _draw_instructions(self, screen: pygame.Surface) -> None:
-        if not self.players_list:
+        # with more than two panels the middle of the screen is taken
+        if not self.players_list or len(self.players_list) > 2:
             return
         lines = [
             "Arrow Keys / WASD: Change Color",
@@ -854,6 +818,10 @@ class MultiplayerLobby(State):
         screen.blit(status_surf, status_surf.get_rect(center=(x + PANEL_WIDTH // 2, y + PANEL_HEIGHT - 20)))
 
     @staticmethod
-    def _panel_position(index: int) -> Tuple[int, int]:
-        x = 80 if index == 0 else config.SCREEN_WIDTH - 280
+    def _panel_position(index: int, count: int = 2) -> Tuple[int, int]:
+        if count <= 2:
+            x = 80 if index == 0 else config.SCREEN_WIDTH - 280
+        else:
+            gap = (config.SCREEN_WIDTH - count * PANEL_WIDTH) // (count + 1)
+            x = gap + index * (PANEL_WIDTH + gap)
         return x, 120
\ No newline at end of file
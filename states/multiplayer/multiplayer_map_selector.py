@@ -1,4 +1,5 @@
 import json
+import logging
 import time
 import pygame
 import random
@@ -9,16 +10,20 @@ from states.general.state import State
 from collections import Counter
 from managers.state_manager import StateManager
 from managers.network_manager import NetworkManager
+from managers.asset_manager import asset_manager
 from maps.test_field_map import MAP_NAMES
 Addr = tuple[str, int]
 Packet = Dict[str, Any]
 
+logger = logging.getLogger(__name__)
+logger.setLevel(config.NETWORK_LOG_LEVEL)
+
 class MultiplayerMapSelector(State):
     def __init__(self, game, player_list, network_manger: NetworkManager, my_player_name: str, lobby_name: str = ""):
         super().__init__(game)
         pygame.display.set_caption("BomberMan: Map Selector")
-        self.bg_image = pygame.image.load(os.path.join("assets","backgrounds", "menu", "battlefield-bg.png"))
-        self.battlefield_text = pygame.image.load(os.path.join("assets", "backgrounds", "titles", "battlefield.png"))
+        self.bg_image = asset_manager.load_image(os.path.join("assets","backgrounds", "menu", "battlefield-bg.png"))
+        self.battlefield_text = asset_manager.load_image(os.path.join("assets", "backgrounds", "titles", "battlefield.png"))
         
         self.network_manager = network_manger
         self.players_list = player_list
@@ -33,19 +38,17 @@ class MultiplayerMapSelector(State):
         self.last_map_sync_time = 0
         self.map_sync_interval = 0.7
         self.map_selection_seq_by_addr: Dict[Addr, int] = {}
-        self.pending_state_change: str | None = None
-        self.state_change_seq_by_addr: Dict[Addr, int] = {}
         
-        # Transition readiness tracking (single client)
-        self.waiting_for_ready = False
+        # Transition readiness tracking: clients that have not sent READY_TO_TRANSITION yet
+        self.waiting_for_ready: set[Addr] = set()
         # Fonts
         self.title_font = pygame.font.Font("CaveatBrush-Regular.ttf", 46)
         self.map_font = pygame.font.SysFont('Arial', 26)
         self.info_font = pygame.font.Font("CaveatBrush-Regular.ttf", 25)
 
         # UI parameters
-        self.card_width = 250
-        self.card_height = 160
+        self.card_width = config.MP_CARD_W
+        self.card_height = config.MP_CARD_H
         self.card_spacing = 30
         self.card_radius = 15
 
@@ -86,10 +89,7 @@ class MultiplayerMapSelector(State):
             self.network_manager.send_packet(player.addr, pkt_type, pkt_data, scope)
 
     def handle_network_packets(self):
-        while True:
-            poll_data = self.network_manager.poll()
-            if not poll_data:
-                break
+        for poll_data in self.network_manager.poll_batch(('MultiplayerMapSelector',)).get('MultiplayerMapSelector', ()):
             self.handle_packet(poll_data)
 
     def handle_packet(self, poll_data):
@@ -120,27 +120,27 @@ class MultiplayerMapSelector(State):
         new_index = pkt_data.get('new_index')
         
         if not (player_name in self.players_list):
-            print(f'[MOVE_SELECTION ERROR] Unknown player {player_name} from {addr}')
+            logger.warning('[MOVE_SELECTION ERROR] Unknown player %s from %s', player_name, addr)
             return
         
         self.players_list[player_name].selection_index = new_index
-        print(f'[MOVE_SELECTION] {player_name} moved to index {new_index} from {addr}')
+        logger.debug('[MOVE_SELECTION] %s moved to index %s from %s', player_name, new_index, addr)
 
     def _handle_map_selection_packet(self, pkt_data, addr):
         map_list = pkt_data.get('map_list')
         self.selected_maps = map_list
-        print(f'[MAP_SELECTION] Received map list from {addr}')
+        logger.debug('[MAP_SELECTION] Received map list from %s', addr)
 
     def _handle_confirm_selection_packet(self, pkt_data, addr):
         player_name = pkt_data.get('player_name')
         vote_index = pkt_data.get('vote_index')
         
         if not (player_name in self.players_list):
-            print(f'[CONFIRM_SELECTION ERROR] Unknown player {player_name} from {addr}')
+            logger.warning('[CONFIRM_SELECTION ERROR] Unknown player %s from %s', player_name, addr)
             return
         
         self.players_list[player_name].vote_index = vote_index
-        print(f'[CONFIRM_SELECTION] {player_name} voted for map index {vote_index} from {addr}')
+        logger.debug('[CONFIRM_SELECTION] %s voted for map index %s from %s', player_name, vote_index, addr)
         
         if all(player.vote_index is not None for player in self.players_list.values()) and self.my_player.is_host:
             self.determine_final_map()
@@ -149,20 +149,20 @@ class MultiplayerMapSelector(State):
         player_name = pkt_data.get('player_name')
         
         if not (player_name in self.players_list):
-            print(f'[CANCEL_SELECTION ERROR] Unknown player {player_name} from {addr}')
+            logger.warning('[CANCEL_SELECTION ERROR] Unknown player %s from %s', player_name, addr)
             return
         
         self.players_list[player_name].vote_index = None
-        print(f'[CANCEL_SELECTION] {player_name} canceled their vote from {addr}')
+        logger.debug('[CANCEL_SELECTION] %s canceled their vote from %s', player_name, addr)
 
     def _handle_final_map_selection_packet(self, pkt_data, addr):
         final_map = pkt_data.get('final_map')
         self.final_map = final_map
-        print(f'[FINAL_MAP_SELECTION] Final map selected: {final_map} from {addr}')
+        logger.info('[FINAL_MAP_SELECTION] Final map selected: %s from %s', final_map, addr)
 
     def _handle_state_change_packet(self, pkt_data, addr):
         new_state = pkt_data.get('state')
-        print(f'[STATE_CHANGE] Changing to state: {new_state} from {addr}')
+        logger.info('[STATE_CHANGE] Changing to state: %s from %s', new_state, addr)
         if self.my_player and self.my_player.is_host:
             return
         self.network_manager.send_packet(addr, 'READY_TO_TRANSITION', {'state': new_state}, 'MultiplayerMapSelector')
@@ -171,9 +171,11 @@ class MultiplayerMapSelector(State):
 
     def _handle_ready_to_transition_packet(self, pkt_data, addr):
         """Handle client's ready signal."""
-        print(f'[READY_TO_TRANSITION] Received from {addr}')
-        if self.my_player and self.my_player.is_host and self.waiting_for_ready:
-            self.waiting_for_ready = False
+        logger.debug('[READY_TO_TRANSITION] Received from %s', addr)
+        if not (self.my_player and self.my_player.is_host and addr in self.waiting_for_ready):
+            return
+        self.waiting_for_ready.discard(addr)
+        if not self.waiting_for_ready:
             self.exit_state()
             self.state_manager.change_state(
                 "MultiplayerTestField",
@@ -184,7 +186,7 @@ class MultiplayerMapSelector(State):
             )
 
     def _return_to_main(self, reason: str) -> None:
-        print(f"[RETURN TO MAIN MENU] {reason}")
+        logger.info('[RETURN TO MAIN MENU] %s', reason)
         if not self.my_player:
             return
         self.network_manager.unregister_peer()
@@ -208,49 +210,24 @@ class MultiplayerMapSelector(State):
     def begin_state_change(self, new_state: str) -> None:
         if not self.my_player or not self.my_player.is_host:
             return
-        if self.pending_state_change:
-            return
         
         if new_state == 'MultiplayerTestField':
-            self.waiting_for_ready = True
-            self.broadcast_state_change(new_state)
-            print('[STATE_CHANGE] Sent to clients, waiting for READY_TO_TRANSITION...')
+            self.waiting_for_ready = set(self.broadcast_state_change(new_state))
+            logger.debug('[STATE_CHANGE] Sent to clients, waiting for READY_TO_TRANSITION...')
             return
 
-        self.pending_state_change = new_state
-        self.state_change_seq_by_addr = self.broadcast_state_change(new_state)
-
-        # No peers to wait for, switch immediately.
-        if not self.state_change_seq_by_addr:
-            self._complete_pending_state_change()
-
-    def _complete_pending_state_change(self) -> None:
-        if not self.pending_state_change:
-            return
-
-        new_state = self.pending_state_change
-        self.pending_state_change = None
-        self.state_change_seq_by_addr.clear()
+        # STATE_CHANGE is on the ordered channel, so clients get it before anything
+        # the next state sends and we do not have to wait for the ACKs.
+        self.broadcast_state_change(new_state)
         self.exit_state()
         self.state_manager.change_state(new_state, self.final_map, self.network_manager, self.players_list, self.my_player.name)
 
-    def check_state_change_acks(self) -> None:
-        if not self.pending_state_change:
-            return
-
-        all_acked = all(
-            self.network_manager.get_completed_seq(addr, seq=seq)
-            for addr, seq in self.state_change_seq_by_addr.items()
-        )
-        if all_acked:
-            self._complete_pending_state_change()
-
     # ==================== GAME LOGIC ====================
     def move_selection(self, player_name, direction):
         current = self.players_list.get(player_name).selection_index
         self.players_list.get(player_name).selection_index = (current + direction) % len(self.selected_maps)
 
-        print(f"[MOVE] {player_name} moved from {current} to {self.players_list.get(player_name).selection_index}")
+        logger.debug('[MOVE] %s moved from %s to %s', player_name, current, self.players_list.get(player_name).selection_index)
 
         pkt_data = {
             'player_name': player_name,
@@ -313,13 +290,34 @@ class MultiplayerMapSelector(State):
                 self.last_map_sync_time = now
 
         self.handle_network_packets()
-        if self.my_player and self.network_manager.peer_timedout:
-            self.network_manager.peer_timedout = False
-            self._return_to_main("Peer timed out")
+        if self.my_player and self._handle_timed_out_peers():
             return
-        self.check_state_change_acks()
         self.network_manager.update()
 
+    def _handle_timed_out_peers(self) -> bool:
+        """Drop players whose heartbeat stopped; True when this state was left because of it."""
+        timed_out = self.network_manager.pop_timed_out_peers()
+        if not timed_out:
+            return False
+        if not self.my_player.is_host:
+            self._return_to_main("Host timed out")
+            return True
+        for name, player in list(self.players_list.items()):
+            if player.addr in timed_out and name != self.my_player.name:
+                del self.players_list[name]
+                logger.warning("[TIMEOUT] %s timed out – removed from the match.", name)
+        if len(self.players_list) < 2:
+            self._return_to_main("All peers timed out")
+            return True
+        if self.waiting_for_ready:
+            self.waiting_for_ready.difference_update(timed_out)
+            if not self.waiting_for_ready:
+                self.exit_state()
+                self.state_manager.change_state("MultiplayerTestField", self.final_map, self.network_manager,
+                                                self.players_list, self.my_player.name)
+                return True
+        return False
+
     # ==================== RENDERING ====================
     def draw_card(self, screen, i, map_name):
         map_count = len(self.selected_maps)
@@ -348,8 +346,8 @@ class MultiplayerMapSelector(State):
 
         # Map preview if available
         try:
-            preview_img = pygame.image.load(os.path.join("assets", "map_previews",f"{map_name.lower().replace(' ', '_')}_preview.png"))
-            preview_img = pygame.transform.scale(preview_img, (self.card_width - 20, self.card_height - 50))
+            preview_img = asset_manager.load_image(os.path.join("assets", "map_previews",f"{map_name.lower().replace(' ', '_')}_preview.png"),
+                                                   config.MP_MAP_PREVIEW_SIZE)
             screen.blit(preview_img, (x + 10, y + 40))
         except:
             pass
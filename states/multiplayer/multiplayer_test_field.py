@@ -1,22 +1,38 @@
 import random
+import logging
 import pygame
 import copy
 import config
-import time
 
-from typing import Dict,Tuple
+from collections import deque
+from typing import Deque, Dict, Tuple
 from game_objects.multiplayer.multiplayer_power_up import PowerUp
 from states.general.state import State
 from game_objects.multiplayer.multiplayer_player import Player
+from game_objects.multiplayer.match_sync import (
+    ACTIONS, MOVES, SNAPSHOT_DIRECTIONS, Command, InputBuffer, InterpolationBuffer, SnapshotClock, SnapshotDecoder, SnapshotEncoder,
+    player_entry,
+)
 from managers.music_manager import MusicManager
-from managers.network_manager import NetworkManager
+from managers.network_manager import Addr, NetworkManager
+from managers.network_stats import overlay_lines
 from managers.state_manager import StateManager
+from managers.time_manager import sim_clock
 from maps.map_generator import generate_map
 from image_loader import load_images, load_game_hat_images
 from game_objects.general.bomb import Bomb
+from game_objects.general.tile_layer import TileLayer
+from game_objects.general.tile_group import TileGroup
+from maps.special_tiles import SpecialTileIndex
+from maps.map_state import MapState
 from states.multiplayer.multiplayer_lobby import PlayerData
 
+logger = logging.getLogger(__name__)
+logger.setLevel(config.NETWORK_LOG_LEVEL)
+
 class MultiplayerTestField(State):
+    tracks_dirty_rects = True
+
     def __init__(self, game, selected_map, network_manager: NetworkManager, players_list: Dict[str, PlayerData], player_name: str):
         super().__init__(game)
         
@@ -44,9 +60,9 @@ class MultiplayerTestField(State):
         self.music_manager = MusicManager()
 
         # Sprite groups
-        self.bomb_group = pygame.sprite.Group()
-        self.explosion_group = pygame.sprite.Group()
-        self.powerup_group = pygame.sprite.Group()
+        self.bomb_group = TileGroup()
+        self.explosion_group = TileGroup()
+        self.powerup_group = TileGroup()
 
         # Hidden power-ups map
         self.hidden_powerups: Dict[Tuple[int, int], str] = {}
@@ -61,23 +77,60 @@ class MultiplayerTestField(State):
 
         # Players dict - musí byť definované PRED is_host blokom
         self.players: Dict[str, Player] = {}
-        self.remote_last_input: Dict[str, int] = {}
-        self.remote_idle_timeout_ms = 250
+        # Vyradení hráči (HUD ich ďalej ukazuje) a hostia, ktorým prestal chodiť heartbeat
+        self.eliminated: Dict[str, Player] = {}
+        self.disconnected: set[Addr] = set()
+        # Host prideľuje spawny v poradí config.SPAWN_ORDER, sám ide prvý
+        self.spawns: Dict[str, str] = {}
+
+        # F3 prepne prekrytie so štatistikami siete (obnovuje sa 2x za sekundu)
+        self.show_network_stats = False
+        self.network_overlay: pygame.Surface | None = None
+        self.network_overlay_time = 0
+        self.network_overlay_rect: pygame.Rect | None = None
 
         # tile_map - musí byť definované PRED is_host blokom
         self.tile_map = None
+        self.tile_layer: TileLayer | None = None
+        self.special_tiles = SpecialTileIndex()
+        # Revízie a zmeny mapy: host posiela MAP_DELTA každý tick, hostia si pri nezhode vypýtajú MAP_STATE
+        self.map_state: MapState | None = None
+        self.map_resync_requested = False
+
+        # Host simuluje celý zápas, hostia posielajú INPUT a dostávajú SNAPSHOT (pozri match_sync)
+        self.addr_to_name = {player.addr: player.name for player in self.players_list.values()}
+        self.snapshot_interval_ms = 1000 // config.NETWORK_SNAPSHOT_RATE
+        self.snapshot_encoder = SnapshotEncoder()       # host
+        self.last_input_seq: Dict[str, int] = {}        # host: newest command applied per player
+        self.queued_inputs: Dict[str, Deque[Command]] = {}   # host: received commands waiting for their move window
+        self.last_snapshot_time = 0
+        self.input_buffer = InputBuffer()               # guest
+        self.snapshot_decoder = SnapshotDecoder()       # guest
+        self.last_input_time = 0
+        self.input_ack_sent = 0
+        self.reconciliations = 0
+        # Ostatných hráčov kreslíme NETWORK_INTERPOLATION_DELAY ms v minulosti medzi dvoma známymi pozíciami,
+        # host zo svojej simulácie, hosť zo SNAPSHOT-ov (ich čas prepočíta SnapshotClock na lokálny)
+        self.snapshot_clock = SnapshotClock()           # guest
+        self.remote_buffers: Dict[str, InterpolationBuffer] = {}
 
         # ONLY HOST GENERATES MAP
         if self.my_player.is_host:
             if base_map is not None:
                 self.tile_map = copy.deepcopy(base_map)
+                self.map_state = MapState(self.map_name, self.tile_map)
             else:
-                self.tile_map = copy.deepcopy(generate_map(self.map_name))
+                # guests regenerate the same map from the seed instead of receiving all tiles
+                seed = random.randrange(2 ** 31)
+                self.tile_map = generate_map(self.map_name, seed)
+                self.map_state = MapState(self.map_name, self.tile_map, seed)
+            self._on_tile_map_loaded()
             
+            ordered = sorted(self.players_list.values(), key=lambda p: not p.is_host)
+            self.spawns = {p.name: config.SPAWN_ORDER[i % len(config.SPAWN_ORDER)] for i, p in enumerate(ordered)}
             for player in self.players_list.values():
-                spawn = "spawn1" if player.name == self.player_name else "spawn4"
                 self.players[player.name] = Player(
-                    spawn,
+                    self.spawns[player.name],
                     self,
                     player.name,
                     player.final_color,
@@ -96,10 +149,7 @@ class MultiplayerTestField(State):
 
     # ---------------- NETWORK ----------------
     def handle_network_packets(self):
-        while True:
-            poll_data = self.network_manager.poll()
-            if not poll_data:
-                break
+        for poll_data in self.network_manager.poll_batch(('MultiplayerTestField',)).get('MultiplayerTestField', ()):
             self.handle_packet(poll_data)
 
     def handle_packet(self, poll_data):
@@ -116,18 +166,24 @@ class MultiplayerTestField(State):
         
         if packet_type == 'PLAYER_LIST':
             self._handle_player_list_packet(packet_data, addr)
-        elif packet_type == "PLAYER_UPDATE":
-            self._handle_player_update_packet(packet_data, addr)
+        elif packet_type == 'INPUT':
+            self._handle_input_packet(packet_data, addr)
+        elif packet_type == 'SNAPSHOT':
+            self._handle_snapshot_packet(packet_data, addr)
         elif packet_type == 'BOMB_UPDATE':
             self._handle_bomb_update_packet(packet_data, addr)
         elif packet_type == 'POWERUP_UPDATE':
             self._handle_powerup_update_packet(packet_data, addr)
         elif packet_type == "MAP_STATE":
-            self.tile_map = packet_data["tile_map"]
-            self.hidden_powerups = {
-                tuple(map(int, k.split(","))): v
-                for k, v in packet_data["hidden_powerups"].items()
-            }
+            self._handle_map_state_packet(packet_data, addr)
+        elif packet_type == "MAP_DELTA":
+            self._handle_map_delta_packet(packet_data, addr)
+        elif packet_type == "MAP_RESYNC":
+            self._handle_map_resync_packet(packet_data, addr)
+        elif packet_type == 'POWERUP_PICKUP':
+            self._handle_powerup_pickup_packet(packet_data, addr)
+        elif packet_type == 'GAME_OVER':
+            self._handle_game_over_packet(packet_data, addr)
 
     def _handle_player_list_packet(self, packet_data, addr):
         for player_name, spawn in packet_data.get('list').items():
@@ -138,27 +194,91 @@ class MultiplayerTestField(State):
                 player_explosion = self.players_list[player_name].final_explosion
                 self.players[player_name] = Player(spawn, self, player_name, player_color, player_hat, player_bomb, player_explosion)
 
-    def _handle_player_update_packet(self, packet_data, addr):
-        player_name = packet_data.get('player_name')
-        direction = packet_data.get('direction')
-        if player_name in self.players and player_name != self.player_name:
-            if direction in ("up", "down", "left", "right"):
-                self.remote_last_input[player_name] = pygame.time.get_ticks()
-                dx, dy = 0, 0
-                if direction == "up":
-                    dy = -1
-                elif direction == "down":
-                    dy = 1
-                elif direction == "left":
-                    dx = -1
-                elif direction == "right":
-                    dx = 1
-                self.players[player_name].move(dx, dy, direction, send_packet=False)
+    def _handle_input_packet(self, packet_data, addr):
+        """Host: apply the guest's commands that were not applied yet, in order."""
+        if not self.my_player.is_host:
+            return
+        player_name = self.addr_to_name.get(addr)
+        player = self.players.get(player_name)
+        if player is None:
+            return
+        self.snapshot_encoder.acknowledge(addr, packet_data.get('ack', 0))
+        queue = self.queued_inputs.setdefault(player_name, deque(maxlen=InputBuffer.MAX_PENDING))
+        last_seq = queue[-1][0] if queue else self.last_input_seq.get(player_name, 0)
+        for seq, action in packet_data.get('commands', ()):
+            if seq <= last_seq or not 0 <= action < len(ACTIONS):
+                continue
+            queue.append((seq, ACTIONS[action]))
+            last_seq = seq
+
+    def apply_queued_inputs(self, now):
+        """Host: apply at most one queued guest command per MOVE_COOLDOWN (doubled while frozen), like local keys.
+
+        A burst of commands (or the backlog a guest resends after packet loss)
+        is spread over the following move windows instead of moving the player
+        several tiles in one tick. SNAPSHOTs acknowledge only applied commands,
+        so the guest keeps predicting the ones still queued here.
+        """
+        for name, queue in self.queued_inputs.items():
+            player = self.players.get(name)
+            if player is None or not queue:
+                continue
+            move_delay = config.MOVE_COOLDOWN * 2 if now < player.freeze_timer else config.MOVE_COOLDOWN
+            if now - player.last_move_time < move_delay:
+                continue
+            seq, action = queue.popleft()
+            self.apply_action(player, action)
+            player.last_move_time = now
+            self.last_input_seq[name] = seq
+
+    def _handle_snapshot_packet(self, packet_data, addr):
+        """Guest: take over the host's state, then replay own commands the host has not seen yet."""
+        if self.my_player.is_host:
+            return
+        state = self.snapshot_decoder.decode(packet_data)
+        if state is None:
+            return
+        now = sim_clock.get_ticks()
+        self.snapshot_clock.observe(packet_data['time'], now)
+        for name in [name for name in self.players if name not in state]:
+            self.eliminate_player(name)
+        for name, (x, y, direction, health, bombs, max_bombs, power, freeze) in state.items():
+            player = self.players.get(name)
+            if player is None:
+                continue
+            if health < player.health:
+                self.music_manager.play_sound("hit", "level_volume")
+            player.health, player.currentBomb, player.maxBombs, player.power = health, bombs, max_bombs, power
+            player.freeze_timer = now + freeze * 100
+            if name == self.player_name:
+                self._reconcile(player, x, y, packet_data['ack'])
+            else:
+                # drawn later from the buffer, rect is only the authoritative cell (hits, pickups)
+                player.rect.topleft = (x * config.GRID_SIZE, y * config.GRID_SIZE)
+                self.remote_buffer(name).push(packet_data['time'], *player.rect.topleft, SNAPSHOT_DIRECTIONS[direction])
+
+    def remote_buffer(self, name) -> InterpolationBuffer:
+        buffer = self.remote_buffers.get(name)
+        if buffer is None:
+            buffer = self.remote_buffers[name] = InterpolationBuffer(config.NETWORK_EXTRAPOLATION_LIMIT)
+        return buffer
+
+    def _reconcile(self, player, x, y, input_ack):
+        self.input_buffer.acknowledge(input_ack)
+        position = (x * config.GRID_SIZE, y * config.GRID_SIZE)
+        for _, action in self.input_buffer.pending:
+            if action in MOVES:
+                position = player.step_target(*MOVES[action], position) or position
+        if position != player.rect.topleft:
+            # prediction was wrong (blocked by a bomb we did not know about, lost command, ...)
+            self.reconciliations += 1
+            player.rect.topleft = position
 
     def _handle_bomb_update_packet(self, packet_data, addr):
         player_name = packet_data.get('player_name')
-        if player_name in self.players:
-            Bomb(self.players.get(player_name), self.bomb_group, self.explosion_group, self)
+        if player_name in self.players and not self.my_player.is_host:
+            position = (packet_data['x'] * config.GRID_SIZE, packet_data['y'] * config.GRID_SIZE)
+            Bomb(self.players.get(player_name), self.bomb_group, self.explosion_group, self, position=position)
 
     def _handle_powerup_update_packet(self, packet_data, addr):
         x, y = map(int, packet_data.get('pos').split(','))
@@ -167,24 +287,124 @@ class MultiplayerTestField(State):
         powerup.reveal()
         self.powerup_group.add(powerup)
  
+    def _handle_map_state_packet(self, packet_data, addr):
+        if self.my_player.is_host:
+            return
+        try:
+            self.map_state = MapState.from_snapshot(packet_data)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            logger.warning("[MAP_STATE] %s, requesting full map", e)
+            self.request_map_resync(addr, full=True)
+            return
+        self.map_resync_requested = False
+        self.tile_map = self.map_state.tile_map
+        self.hidden_powerups = {(x, y): powerup_type for x, y, powerup_type in packet_data.get("hidden_powerups", ())}
+        self._on_tile_map_loaded()
+
+    def _handle_map_delta_packet(self, packet_data, addr):
+        if self.my_player.is_host or self.map_state is None or self.map_resync_requested:
+            return
+        try:
+            changes = self.map_state.accept_delta(packet_data)
+            if changes is None:
+                return
+            for x, y, tile in changes:
+                self.set_tile(x, y, tile)
+            self.map_state.verify(packet_data["crc"])
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            logger.warning("[MAP_DELTA] %s, requesting resync", e)
+            self.request_map_resync(addr)
+
+    def _handle_map_resync_packet(self, packet_data, addr):
+        if not self.my_player.is_host or self.map_state is None:
+            return
+        logger.info("[MAP_RESYNC] %s at revision %s, host at %s", addr, packet_data.get('rev'), self.map_state.rev)
+        self.network_manager.send_packet(
+            addr, "MAP_STATE", self.map_state_packet(full=bool(packet_data.get("full"))), 'MultiplayerTestField'
+        )
+
+    def _handle_powerup_pickup_packet(self, packet_data, addr):
+        player = self.players.get(packet_data.get('player_name'))
+        x, y = map(int, packet_data.get('pos').split(','))
+        for powerup in self.powerup_group.at((x, y)):
+            if player is not None:
+                # stats come with the next SNAPSHOT, this is for the message and the HUD timers
+                self.powerup_message = powerup.apply_effect(player)
+                self.message_timer = sim_clock.get_ticks()
+                self.music_manager.play_sound("walk", "walk_volume")
+            powerup.kill()
+
+    def _handle_game_over_packet(self, packet_data, addr):
+        if self.my_player.is_host:
+            return
+        self.exit_state()
+        self.state_manager.change_state("MultiplayerGameOver", packet_data.get('winner'), self.map_name, self.network_manager)
+
+    def request_map_resync(self, addr, full: bool = False):
+        self.map_resync_requested = True
+        rev = self.map_state.rev if self.map_state else -1
+        self.network_manager.send_packet(addr, "MAP_RESYNC", {"rev": rev, "full": full}, 'MultiplayerTestField')
+
     def send_player_list(self):
-        indexes = {key: ('spawn1' if key == self.player_name else 'spawn4') for key in self.players.keys()}
-        packet_data = {'list': indexes}
+        packet_data = {'list': {name: self.spawns[name] for name in self.players}}
         self.send_packet('PLAYER_LIST', packet_data)
+    def map_state_packet(self, full: bool = False) -> dict:
+        packet_data = self.map_state.snapshot(full)
+        packet_data["hidden_powerups"] = [[x, y, v] for (x, y), v in self.hidden_powerups.items()]
+        return packet_data
+
     def send_map_state(self):
-        packet_data = {
-            "tile_map": self.tile_map,
-            "hidden_powerups": {f"{x},{y}": v for (x, y), v in self.hidden_powerups.items()}
-        }
-        self.send_packet("MAP_STATE", packet_data)
-    def send_packet(self, packet_type, packet_data):
-        scope = 'MultiplayerTestField'
+        self.send_packet("MAP_STATE", self.map_state_packet())
+
+    def send_map_delta(self):
+        if not self.my_player.is_host or self.map_state is None:
+            return
+        delta = self.map_state.take_delta()
+        if delta is not None:
+            self.send_packet("MAP_DELTA", delta)
+
+    def send_snapshots(self, now):
+        """Host: NETWORK_SNAPSHOT_RATE times a second, send each guest what changed since its last confirmed snapshot."""
+        if not self.my_player.is_host or now - self.last_snapshot_time < self.snapshot_interval_ms:
+            return
+        self.last_snapshot_time = now
+        state = {name: player_entry(player, now) for name, player in self.players.items()}
+        self.snapshot_encoder.next_tick()
         for player in self.players_list.values():
-            if player.addr == self.my_player.addr:
+            if player.addr == self.my_player.addr or player.addr in self.disconnected:
                 continue
-            self.network_manager.send_packet(player.addr, packet_type, packet_data, scope)
+            # sent even without changes: guests need an evenly spaced timeline to interpolate on
+            data = self.snapshot_encoder.encode(player.addr, state, self.last_input_seq.get(player.name, 0), now & 0xFFFFFFFF)
+            self.network_manager.send_packet(player.addr, 'SNAPSHOT', data, 'MultiplayerTestField')
+
+    def send_input(self, now):
+        """Guest: send new commands at once, repeat unconfirmed ones (and the snapshot ACK) at the snapshot rate."""
+        host = next((player for player in self.players_list.values() if player.is_host), None)
+        if self.my_player.is_host or host is None:
+            return
+        resend_due = now - self.last_input_time >= self.snapshot_interval_ms and (
+            self.input_buffer.pending or self.snapshot_decoder.latest != self.input_ack_sent
+        )
+        if not (self.input_buffer.dirty or resend_due):
+            return
+        self.last_input_time = now
+        self.input_ack_sent = self.snapshot_decoder.latest
+        packet_data = self.input_buffer.packet(self.snapshot_decoder.latest)
+        self.network_manager.send_packet(host.addr, 'INPUT', packet_data, 'MultiplayerTestField')
+
+    def send_packet(self, packet_type, packet_data):
+        addrs = tuple(
+            player.addr for player in self.players_list.values()
+            if player.addr != self.my_player.addr and player.addr not in self.disconnected
+        )
+        self.network_manager.broadcast_packet(addrs, packet_type, packet_data, 'MultiplayerTestField')
     # ---------------- Input ----------------
     def handle_events(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.show_network_stats = not self.show_network_stats
+            self.network_overlay = None
+            self.request_full_redraw()
+            return
         player = self.players.get(self.player_name)
         if not player:
             return
@@ -197,30 +417,35 @@ class MultiplayerTestField(State):
 
     # ---------------- Update ----------------
     def update(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
 
         self.handle_network_packets()
+        if self.handle_timed_out_peers():
+            return
+        self.update_match(now)
+        self.send_map_delta()
+        self.send_snapshots(now)
+        self.send_input(now)
+        # Resends + everything queued during this tick leave as one datagram per peer
+        self.network_manager.update()
+
+    def update_match(self, now):
+        for player in self.players.values():
+            player.update_animation()
+        self.bomb_group.update(self.explosion_group)
+        self.explosion_group.update()
 
-        # Move local player based on held keys
-        if self.players:
-            local_player = self.players.get(self.player_name)
-            if not local_player:
-                return
+        # Move local player based on held keys (an eliminated player just watches)
+        local_player = self.players.get(self.player_name)
+        if local_player:
             local_player.handle_queued_keys(now)
             local_player.update_powerups()
             # Only stop animation if no keys held AND animation cycle finished
             if not local_player.held_down_keys and now >= local_player.last_move_anim_time:
                 local_player.moving = False
-
-            # Stop remote player animation if no input received recently
-            for name, player in self.players.items():
-                if name == self.player_name:
-                    continue
-                last_input = self.remote_last_input.get(name)
-                if last_input is None:
-                    continue
-                if now - last_input > self.remote_idle_timeout_ms:
-                    player.moving = False
+        if self.my_player.is_host:
+            self.apply_queued_inputs(now)
+        self._update_remote_players(now)
 
         if self.powerup_group:
             self.check_powerup_collisions()
@@ -229,8 +454,58 @@ class MultiplayerTestField(State):
         if self.message_timer > 0 and now - self.message_timer > 1500:
             self.powerup_message = ""
             self.message_timer = 0
+    def _update_remote_players(self, now):
+        """Interpolated draw position, direction and walk animation of everyone except the local player."""
+        if self.my_player.is_host:
+            render_time = now - config.NETWORK_INTERPOLATION_DELAY
+        else:
+            host_now = self.snapshot_clock.to_host(now)
+            if host_now is None:
+                return
+            render_time = host_now - config.NETWORK_INTERPOLATION_DELAY
+        for name, player in self.players.items():
+            if name == self.player_name:
+                continue
+            buffer = self.remote_buffer(name)
+            if self.my_player.is_host:
+                buffer.push(now, *player.rect.topleft, player.current_direction)
+            sample = buffer.sample(render_time)
+            if sample is None:
+                continue
+            x, y, direction, moving = sample
+            half = config.GRID_SIZE // 2
+            cell = ((round(x) + half) // config.GRID_SIZE, (round(y) + half) // config.GRID_SIZE)
+            # host already played it in set_position when the command arrived
+            if not self.my_player.is_host and player.render_pos is not None and cell != player.render_cell:
+                self.music_manager.play_sound("walk", "walk_volume")
+            player.render_pos, player.render_cell = (round(x), round(y)), cell
+            player.moving = moving
+            if direction in player.images:
+                player.current_direction = direction
+
     # --------------- Game Logic ----------------
+    def handle_local_action(self, player, action):
+        if self.my_player.is_host:
+            self.apply_action(player, action)
+            return
+        if self.tile_map is None:
+            return
+        self.input_buffer.add(action)
+        if action in MOVES:
+            # predicted right away, the host's SNAPSHOT corrects it if needed
+            player.move(*MOVES[action], action)
+
+    def apply_action(self, player, action):
+        """Host: the authoritative effect of one command."""
+        if action == "bomb":
+            player.deploy_bomb(self.bomb_group, self.explosion_group)
+        elif action in MOVES:
+            player.move(*MOVES[action], action)
+
     def destroy_tile(self, x, y):
+        # Tiles of guests change only through the host's MAP_DELTA, so both maps stay identical
+        if not self.my_player.is_host:
+            return
         if self.tile_map[y][x] == 2:
             if (x, y) in self.hidden_powerups:
                 powerup_type = self.hidden_powerups[(x, y)]
@@ -246,7 +521,26 @@ class MultiplayerTestField(State):
                 
             self.hidden_powerups.pop((x, y), None)
             # Update the map (brick is destroyed)
-            self.tile_map[y][x] = 0
+            self.set_tile(x, y, 0)
+
+    def set_tile(self, x: int, y: int, tile: int) -> None:
+        """Change one map tile and keep the tile layer and special tile index in sync."""
+        self.tile_map[y][x] = tile
+        if self.my_player.is_host and self.map_state is not None:
+            self.map_state.record(x, y, tile)
+        if self.tile_layer is not None:
+            self.tile_layer.update_tile(x, y, tile)
+        self.special_tiles.set_tile(x, y, tile)
+        self.mark_dirty((x * config.GRID_SIZE, y * config.GRID_SIZE, config.GRID_SIZE, config.GRID_SIZE))
+
+    def _on_tile_map_loaded(self) -> None:
+        """(Re)build the cached background + walls surface and the special tile index for the current tile_map."""
+        if self.tile_layer is None:
+            self.tile_layer = TileLayer(self.images, self.map_name, self.tile_map)
+        else:
+            self.tile_layer.rebuild(self.tile_map)
+        self.special_tiles.rebuild(self.tile_map)
+        self.request_full_redraw()
 
     def place_hidden_powerups(self):
         brick_positions = []
@@ -266,16 +560,17 @@ class MultiplayerTestField(State):
             self.hidden_powerups[(x,y)] = powerup_type
 
     def check_powerup_collisions(self):
-        if self.powerup_group is None:
+        # guests learn about pickups from POWERUP_PICKUP
+        if self.powerup_group is None or not self.my_player.is_host:
             return
-        visible_powerups = [p for p in self.powerup_group.sprites() if not p.hidden]
-
-        for powerup in visible_powerups:
-            for player_obj in self.players.values():
-                if pygame.sprite.collide_rect(player_obj, powerup):
+        for player_obj in self.players.values():
+            for powerup in self.powerup_group.at(TileGroup.tile_of(player_obj.rect)):
+                if not powerup.hidden:
                     self.powerup_message = powerup.apply_effect(player_obj)
-                    self.message_timer = pygame.time.get_ticks()
+                    self.message_timer = sim_clock.get_ticks()
                     self.music_manager.play_sound("walk", "walk_volume")
+                    x, y = TileGroup.tile_of(powerup.rect)
+                    self.send_packet('POWERUP_PICKUP', {'pos': f"{x},{y}", 'player_name': player_obj.name})
                     powerup.kill()
 
     def draw_active_powerups(self, screen):
@@ -284,115 +579,116 @@ class MultiplayerTestField(State):
         local_player = self.players.get(self.player_name)
         if local_player:
             for powerup, expire_time in local_player.active_powerups.items():
-                remaining = round(expire_time - time.time(), 2)
+                remaining = round(expire_time - sim_clock.time(), 2)
                 if remaining > 0:
                     if powerup == "shield_powerup":
                         powerups_texts.append(f"Shield: {remaining}s")
                     elif powerup == 'freeze_powerup':
                         powerups_texts.append(f'Freeze: {remaining}s')
 
+        drawn = []
         y_offset = 40
         for text in powerups_texts:
             powerup_text = self.game.font.render(text, True, config.COLOR_BLACK)
-            screen.blit(powerup_text, (10, y_offset))
+            drawn.append(screen.blit(powerup_text, (10, y_offset)))
             y_offset += 20
+        return drawn
 
     def handle_explosions(self):
-        if not self.explosion_group:
+        # only the host decides hits, guests get health from SNAPSHOT and the end from GAME_OVER
+        if not self.explosion_group or not self.my_player.is_host:
             return
         for hit_player_name, player_obj in list(self.players.items()):
             if player_obj.check_hit() and player_obj.get_health() <= 0:
-                self.exit_state()
-                winner = [player_name for player_name in list(self.players.keys()) if hit_player_name != player_name][0]
-                self.state_manager.change_state("MultiplayerGameOver", winner, self.map_name, self.network_manager)
-            
+                self.eliminate_player(hit_player_name)
+        self.check_last_player_standing()
+
+    def eliminate_player(self, name):
+        """Take *name* out of the match; the host's next SNAPSHOT no longer lists it, which tells the guests."""
+        player = self.players.pop(name, None)
+        if player is None:
+            return
+        player.health = 0
+        self.eliminated[name] = player
+        self.remote_buffers.pop(name, None)
+        self.queued_inputs.pop(name, None)
+        logger.info("[ELIMINATED] %s (%d left)", name, len(self.players))
+
+    def check_last_player_standing(self):
+        """Host: end the match once at most one player is left (nobody wins if the last ones died together)."""
+        if not self.my_player.is_host or len(self.players) > 1:
+            return
+        winner = next(iter(self.players), None)
+        self.send_packet('GAME_OVER', {'winner': winner})
+        self.exit_state()
+        self.state_manager.change_state("MultiplayerGameOver", winner, self.map_name, self.network_manager)
+
+    def handle_timed_out_peers(self) -> bool:
+        """Players whose heartbeat stopped leave the match; True when this state was left because of it."""
+        timed_out = self.network_manager.pop_timed_out_peers()
+        if not timed_out:
+            return False
+        if not self.my_player.is_host:
+            logger.warning("[TIMEOUT] Host timed out – returning to MainMenu.")
+            self.network_manager.close_socket()
+            self._pop_to_state_name("MainMenu")
+            return True
+        for addr in timed_out:
+            name = self.addr_to_name.get(addr)
+            if name is None:
+                continue
+            logger.warning("[TIMEOUT] %s timed out – removed from the match.", name)
+            self.disconnected.add(addr)
+            self.snapshot_encoder.forget(addr)
+            self.eliminate_player(name)
+        self.check_last_player_standing()
+        return not self.game.state_stack or self.game.state_stack[-1] is not self
+
     # ---------------- Render ---------------
     def draw_menu(self, screen):
-        num_players = len(self.players)
+        hud_players = self._hud_players()
+        num_players = len(hud_players)
         if num_players == 0:
-            return
+            return []
+        drawn = []
         
-        # Place players on edges (left and right)
-        positions = [0, config.SCREEN_WIDTH - 150]
+        # Place players on edges: first half from the left, the rest from the right, the middle stays for messages
+        left = (num_players + 1) // 2
+        positions = [i * 150 for i in range(left)]
+        positions += [config.SCREEN_WIDTH - 150 * (num_players - i) for i in range(left, num_players)]
         
-        for index, (name, player) in enumerate(self.players.items()):
+        for index, (name, player) in enumerate(hud_players):
             x_base = positions[index]
             
             # Heart icon
-            screen.blit(self.images['heart_image'], (x_base, 5))
+            drawn.append(screen.blit(self.images['heart_image'], (x_base, 5)))
             
             # Lives
             lives_text = self.game.font.render(f"x {player.get_health()}", True, config.COLOR_BLACK)
-            screen.blit(lives_text, (x_base + 30, 5))
+            drawn.append(screen.blit(lives_text, (x_base + 30, 5)))
             
             # Bomb icon
-            screen.blit(self.images['bomb_icon'], (x_base + 80, 5))
+            drawn.append(screen.blit(self.images['bomb_icon'], (x_base + 80, 5)))
             
             # Bomb count
             bombs_text = self.game.font.render(f"x {player.get_max_bombs()}", True, config.COLOR_BLACK)
-            screen.blit(bombs_text, (x_base + 110, 5))
+            drawn.append(screen.blit(bombs_text, (x_base + 110, 5)))
         
         # Display power-up message in middle
         if self.powerup_message:
             message_text = self.game.font.render(self.powerup_message, True, config.COLOR_BLACK)
-            screen.blit(message_text, (config.SCREEN_WIDTH // 2 - message_text.get_width() // 2, 5))
-
-    def draw_grid(self, screen):
-        if self.map_name == "Crystal Caves":
-            screen.blit(self.images['cave_bg'], (0, 0))
-        elif self.map_name == "Classic":
-            screen.blit(self.images['grass_bg'], (0, 0))
-        elif self.map_name == "Desert Maze":
-            screen.blit(self.images['sand_bg'], (0, 0))
-        elif self.map_name == "Ancient Ruins":
-            screen.blit(self.images['ruins_bg'], (0, 0))
-        elif self.map_name == "Urban Assault":
-            screen.blit(self.images['urban_bg'], (0, 0))
-        else:
-            for line in range((config.SCREEN_WIDTH // config.GRID_SIZE) + 1):
-                pygame.draw.line(screen, config.COLOR_BLACK, (line * config.GRID_SIZE, 30),
-                                 (line * config.GRID_SIZE, config.SCREEN_HEIGHT))
-            for line in range((config.SCREEN_HEIGHT // config.GRID_SIZE) - 1):
-                pygame.draw.line(screen, config.COLOR_BLACK, (0, line * config.GRID_SIZE + 30),
-                                 (config.SCREEN_WIDTH, line * config.GRID_SIZE + 30))
-    def draw_walls(self, screen):
-            for row_index, row in enumerate(self.tile_map):
-                for col_index, tile in enumerate(row):
-                    x = col_index * config.GRID_SIZE
-                    y = row_index * config.GRID_SIZE
-                    if tile in [0, 4, 5]:  # Empty space (no wall)
-                        if self.map_name not in ["Crystal Caves", "Desert Maze", "Classic", "Ancient Ruins","Urban Assault"]:  #  Only draw green tiles on other maps
-                            rect = pygame.Rect(x, y, config.GRID_SIZE, config.GRID_SIZE)
-                            color = config.COLOR_DARK_GREEN if (col_index + row_index) % 2 == 0 else config.COLOR_LIGHT_GREEN
-                            pygame.draw.rect(screen, color, rect)
-                        
-                    elif tile == 1:  # Unbreakable wall
-                        if self.map_name == "Crystal Caves":
-                            screen.blit(self.images['unbreakable_stone'], (x, y))
-                        elif self.map_name in ["Classic", "Desert Maze"]:
-                            screen.blit(self.images['unbreakable_box'], (x, y))
-                        elif self.map_name == "Ancient Ruins":
-                            screen.blit(self.images['unbreakable_rock'], (x, y))
-                        else:
-                            screen.blit(self.images['unbreakable_wall'], (x, y))
-                    elif tile == 2:  # Breakable wall
-                        if self.map_name == "Desert Maze":
-                            screen.blit(self.images['breakable_cactus'], (x, y))
-                        elif self.map_name == "Classic":
-                            screen.blit(self.images['breakable_bush'], (x, y))
-                        elif self.map_name == "Crystal Caves":
-                            screen.blit(self.images['breakable_diamond'], (x, y))
-                        elif self.map_name == "Ancient Ruins":
-                            screen.blit(self.images['breakable_rock'], (x, y))
-                        else:
-                            screen.blit(self.images['breakable_wall'], (x, y))
-                    if tile == 4:  # Blue cave
-                        screen.blit(self.images['blue_cave'], (x, y))
-                    if tile == 5:  # Red cave
-                        screen.blit(self.images['red_cave'], (x, y))
-                    elif tile == config.TRAP:  # Poklop
-                        screen.blit(self.images['trap_image'], (x, y))
-    
+            drawn.append(screen.blit(message_text, (config.SCREEN_WIDTH // 2 - message_text.get_width() // 2, 5)))
+        return drawn
+
+    def _hud_players(self):
+        """Everyone who started the match, in lobby order, eliminated players included."""
+        players = [(name, self.players.get(name) or self.eliminated.get(name)) for name in self.players_list]
+        return [(name, player) for name, player in players if player is not None]
+
+    def _hud_signature(self):
+        stats = tuple((name, p.get_health(), p.get_max_bombs()) for name, p in self._hud_players())
+        return stats, self.powerup_message
+
     def _draw_player_hat(self, screen: pygame.Surface, player: Player) -> None:
         if not player.has_hat():
             return
@@ -420,42 +716,61 @@ class MultiplayerTestField(State):
         if hat_name == "Devil" and going_left:
             ox -= corner_spread + 2
 
-        hx = player.rect.x + ox
-        hy = player.rect.y + oy + anim_offset_y
+        px, py = player.render_pos or player.rect.topleft
+        hx = px + ox
+        hy = py + oy + anim_offset_y
         hat_to_draw = pygame.transform.flip(hat_image, True, False) if going_left else hat_image
         
-        screen.blit(hat_to_draw, (hx, hy))
+        self.mark_dirty(screen.blit(hat_to_draw, (hx, hy)))
     
     def _draw_players(self, screen: pygame.Surface) -> None:
         if not self.players:
             return
         for player in self.players.values():
-            player.update_animation()
-            screen.blit(player.image, player.rect)
+            self.mark_dirty(screen.blit(player.image, player.render_pos or player.rect))
             self._draw_player_hat(screen, player)
     
     def render(self, screen):
-        screen.fill(config.COLOR_WHITE)
-        if self.tile_map is None:
+        if self.tile_layer is None:
             screen.fill(config.COLOR_BLACK)
             waiting = self.game.font.render("Waiting for host...", True, config.COLOR_WHITE)
             screen.blit(waiting, (config.SCREEN_WIDTH // 2 - waiting.get_width() // 2, config.SCREEN_HEIGHT // 2))
+            self.request_full_redraw()
             return
-        self.draw_grid(screen)
-        self.draw_walls(screen)
-        self.draw_menu(screen)
+        self.tile_layer.draw(screen)
+        self.mark_overlay(self._hud_signature(), self.draw_menu(screen))
 
         self._draw_players(screen)
 
-        # Update explosions
-        self.bomb_group.update(self.explosion_group)
-        self.explosion_group.update()
+        # Draw visible power-ups, bombs and explosions
+        for group in (self.powerup_group, self.bomb_group, self.explosion_group):
+            group.draw(screen)
+            for sprite in group:
+                self.mark_dirty(sprite.rect)
 
-        # Draw visible power-ups
-        self.powerup_group.draw(screen)
+        if self.show_network_stats:
+            self.draw_network_stats(screen)
 
-        # Draw objects
-        self.bomb_group.draw(screen)
-        self.explosion_group.draw(screen)
+    def draw_network_stats(self, screen):
+        now = pygame.time.get_ticks()
+        if self.network_overlay is None or now - self.network_overlay_time >= 500:
+            lines = overlay_lines(self.network_manager.get_stats())
+            for name, buffer in self.remote_buffers.items():
+                lines.append(f"interp {name}  delay {config.NETWORK_INTERPOLATION_DELAY} ms  underruns {buffer.underruns}"
+                             f"  extrapolated {buffer.extrapolated}  late {buffer.late}")
+            rendered = [self.game.font.render(line, True, config.COLOR_WHITE) for line in lines]
+            width = max(text.get_width() for text in rendered) + 10
+            height = sum(text.get_height() for text in rendered) + 10
+            self.network_overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.network_overlay.fill((0, 0, 0, 170))
+            y = 5
+            for text in rendered:
+                self.network_overlay.blit(text, (5, y))
+                y += text.get_height()
+            self.network_overlay_time = now
+            if self.network_overlay_rect:
+                self.mark_dirty(self.network_overlay_rect)  # the new text may be smaller
+        self.network_overlay_rect = screen.blit(self.network_overlay, (5, config.SCREEN_HEIGHT - self.network_overlay.get_height() - 5))
+        self.mark_dirty(self.network_overlay_rect)
 
 
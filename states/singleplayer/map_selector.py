@@ -6,6 +6,7 @@ from states.general.state import State
 from maps.test_field_map import MAP_NAMES, get_map
 from dataclasses import dataclass
 from managers.music_manager import MusicManager
+from managers.asset_manager import asset_manager
 from managers.state_manager import StateManager
 from image_loader import load_images, load_hat_images
 @dataclass
@@ -131,20 +132,20 @@ class MapSelector(State):
 
         # Map preview obrázok
         try:
-            preview = pygame.image.load(
+            preview = asset_manager.load_image(
                 os.path.join("assets", "map_previews",
-                             f"{map_name.lower().replace(' ', '_')}_preview.png")
-            ).convert()
-            preview = pygame.transform.smoothscale(preview, (self.card_w - 20, self.card_h - 50))
-            preview_rect = pygame.Rect(x + 10, y + 36, self.card_w - 20, self.card_h - 50)
+                             f"{map_name.lower().replace(' ', '_')}_preview.png"),
+                config.MAP_PREVIEW_SIZE, alpha=False, smooth=True
+            )
+            preview_rect = pygame.Rect((x + 10, y + 36), config.MAP_PREVIEW_SIZE)
             screen.blit(preview, preview_rect.topleft)
             # Jemný overlay na preview aby text bol čitateľný
-            ov = pygame.Surface((self.card_w - 20, self.card_h - 50), pygame.SRCALPHA)
+            ov = pygame.Surface(config.MAP_PREVIEW_SIZE, pygame.SRCALPHA)
             ov.fill((10, 12, 18, 60))
             screen.blit(ov, preview_rect.topleft)
         except Exception:
             # Placeholder ak nie je preview
-            ph = pygame.Rect(x + 10, y + 36, self.card_w - 20, self.card_h - 50)
+            ph = pygame.Rect((x + 10, y + 36), config.MAP_PREVIEW_SIZE)
             self._draw_rrect(screen, config.BG_LIST, ph, radius=8, alpha=180)
             self._text(screen, "no preview", self.font_xs, config.TEXT_HINT,
                        (ph.centerx, ph.centery - 8), align="center")
@@ -1,4 +1,3 @@
-import time
 import os
 import pygame
 import config
@@ -6,11 +5,11 @@ import config
 from states.general.state import State
 from custom_classes.button import Button
 from managers.music_manager import MusicManager
+from managers.asset_manager import asset_manager
 
 class PauseState(State):
     def __init__(self, game, map_selected, map_name):
         super().__init__(game)
-        self.pause_start = time.time()
         self.map_selected = map_selected
         self.map_name     = map_name
         self.selected_option = 0
@@ -50,9 +49,8 @@ class PauseState(State):
 
         # Pozadie (voliteľné)
         try:
-            self.background_image = pygame.transform.scale(
-                pygame.image.load(os.path.join("assets", "backgrounds", "menu", "pause.png")).convert_alpha(),
-                (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+            self.background_image = asset_manager.load_image(
+                os.path.join("assets", "backgrounds", "menu", "pause.png"), (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
             )
         except Exception:
             self.background_image = None
@@ -169,12 +167,7 @@ class PauseState(State):
             self.game.state_manager.change_state("MainMenu")
 
     def exit_state(self):
-        pause_duration = time.time() - self.pause_start
-        # nájdi TestField v stacku a posuň jeho časovače o dobu pauzy
-        for state in self.game.state_stack:
-            if state.__class__.__name__ == "TestField":
-                state.offset_timers(pause_duration)
-                break
+        # časovače TestField netreba posúvať: čas zápasu beží len v Match.tick(), počas pauzy stojí
         if self.prev_music_playing:
             self.music_manager.play_music('level', 'level_volume', True)
         super().exit_state()
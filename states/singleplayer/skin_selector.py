@@ -4,6 +4,7 @@ from states.general.state import State
 import config
 from managers.state_manager import StateManager
 from managers.music_manager import MusicManager
+from managers.asset_manager import asset_manager
 from image_loader import load_bomb_images, load_explosion_images
 # Akcenty hráčov
 ACCENT = {
@@ -48,6 +49,9 @@ class SkinSelector(State):
             )
             for frame in self.images['player_idle']
         ]
+        # Všetky farby zafarbené raz vopred, listovanie farieb už nič nefarbí
+        self.idle_key = ("player_idle", 1, self.idle_frames[0].get_size())
+        asset_manager.warm_tints(self.idle_key, self.idle_frames, AVAILABLE_COLORS)
         self.idle_index = config.IDLE_INDEX
         self.last_idle_update = pygame.time.get_ticks()
         self.idle_fps = config.IDLE_FPS
@@ -210,7 +214,7 @@ class SkinSelector(State):
         frame_index = (pygame.time.get_ticks() // (1000 // self.idle_fps)) % num_frames
         frame = self.idle_frames[frame_index]
 
-        img = self.tint_image(frame, chosen_color)
+        img = asset_manager.get_tinted_frames(self.idle_key, self.idle_frames, chosen_color)[frame_index]
         if player_id == 2:
             img = pygame.transform.flip(img, True, False)
 
@@ -543,14 +547,6 @@ class SkinSelector(State):
         self._text(screen, select_hint, self.font_xs, (*acc,),
                    (panel.centerx, y + 18), align="center")
 
-    # ------------------------------------------------------------------ tint
-    def tint_image(self, image, color):
-        tinted = image.copy()
-        tint   = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        tint.fill((*color, 255))
-        tinted.blit(tint, (0, 0), special_flags=pygame.BLEND_MULT)
-        return tinted
-
     # ------------------------------------------------------------------ animation tick
     def update_idle_animation(self):
         now = pygame.time.get_ticks()
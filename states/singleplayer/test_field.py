@@ -1,18 +1,24 @@
 import pygame
 import config
-import copy
-import time
 import random
-import os
 
 from states.general.state import State
+from game_objects.singleplayer.match import Match
+from game_objects.singleplayer.match_sprites import BombSprite, ExplosionSprite
 from game_objects.singleplayer.player import Player
 from managers.music_manager import MusicManager
+from managers.time_manager import sim_clock
 from image_loader import load_images, load_game_hat_images
-from game_objects.singleplayer.power_up import PowerUp
+from game_objects.singleplayer.power_up import PowerUp, pickup_message
+from game_objects.general.tile_layer import TileLayer
+from game_objects.general.darkness_layer import DarknessLayer
 
 
 class TestField(State):
+    """Draws a singleplayer Match and feeds it the players' keys; the rules themselves live in the Match."""
+
+    tracks_dirty_rects = True
+
     def __init__(self, game, selected_map, map_name, selected_skins=None):
         State.__init__(self, game)
 
@@ -26,13 +32,16 @@ class TestField(State):
 
         self.keys_held = {pygame.K_s: False, pygame.K_d: False}
 
+        # pravidlá a stav zápasu; sprity nižšie ho len vykresľujú
+        self.match = Match(selected_map, map_name, random.Random())
+
         self.bomb_group = pygame.sprite.Group()
         self.explosion_group = pygame.sprite.Group()
         self.powerup_group = pygame.sprite.Group()
-        self.hidden_powerups = {}
+        self._sprites = {}   # objekt zo zápasu (bomba, výbuch, power-up) -> jeho sprite
 
-        self.player1 = Player(1, "spawn1", self, skin=self.selected_skins.get(1))
-        self.player2 = Player(2, "spawn4", self, skin=self.selected_skins.get(2))
+        self.player1 = Player(self.match.players[0], skin=self.selected_skins.get(1))
+        self.player2 = Player(self.match.players[1], skin=self.selected_skins.get(2))
         self.players = [self.player1, self.player2]
         self.font_md   = pygame.font.Font("CaveatBrush-Regular.ttf", 22)
         self.powerup_message = ""
@@ -43,14 +52,11 @@ class TestField(State):
         self.images = load_images()
         self.hat_images = load_game_hat_images()
 
-        self.tile_map = copy.deepcopy(selected_map)
-        self.available_powerups = ["bomb_powerup", "range_powerup", "freeze_powerup", "live+_powerup", "shield_powerup"]
-
-        if self.map_name == "Crystal Caves":
-            self.available_powerups.append("darkness_powerup")
-        self.darkness_timer = config.DARKNESS_TIMER
+        self.tile_map = self.match.tile_map
+        self.tile_layer = TileLayer(self.images, self.map_name, self.tile_map)
+        self.darkness_active = False
+        self.darkness_layer = None
         self.load_music()
-        self.place_hidden_powerups()
 
     # ------------------------------------------------------------------ skin helpers
     def _skin_field(self, player_id: int, index: int, default=None):
@@ -77,20 +83,6 @@ class TestField(State):
         return config.COLOR_BLACK
 
     # ------------------------------------------------------------------ setup
-    def place_hidden_powerups(self):
-        brick_positions = []
-        for y in range(len(self.tile_map)):
-            for x in range(len(self.tile_map[y])):
-                if self.tile_map[y][x] == 2:
-                    brick_positions.append((x, y))
-
-        num_powerups = int(len(brick_positions) * config.POWERUP_SPAWNING_RATE)
-        selected_bricks = random.sample(brick_positions, min(num_powerups, len(brick_positions)))
-
-        for x, y in selected_bricks:
-            powerup_type = random.choice(self.available_powerups)
-            self.hidden_powerups[(x, y)] = powerup_type
-
     def load_music(self):
         self.music_manager.play_music('level', 'level_volume', True)
 
@@ -108,58 +100,55 @@ class TestField(State):
             if event.key in config.PLAYER2_MOVE_KEYS and event.key in self.player2.held_down_keys:
                 self.player2.held_down_keys.remove(event.key)
 
-    def handle_explosions(self):
-        for player in self.players:
-            player_hit = False
-            for explosion in self.explosion_group:
-                if pygame.sprite.collide_rect(player, explosion):
-                    player_hit = True
-                    break
-            if player_hit:
-                if not hasattr(player, 'hit_this_frame') or not player.hit_this_frame:
-                    has_shield = (
-                        "shield_powerup" in player.active_powerups and
-                        player.active_powerups["shield_powerup"] > time.time()
-                    )
-                    if not has_shield:
-                        player.health = max(0, player.health - 1)
-                        self.music_manager.play_sound("death", "death_volume")
-                        self.powerup_message = f"{self.get_player_name(player.player_id)} hit! Lives left: {player.health}"
-                        self.message_timer = pygame.time.get_ticks()
-
-                        if player.health <= 0:
-                            self.music_manager.play_sound("death", "death_volume")
-                            pygame.mixer_music.stop()
-                            self.exit_state()
-                            winner = self.player2.player_id if player.player_id == 1 else self.player1.player_id
-                            self.game.state_manager.change_state("GameOver", winner, self.selected_map, self.map_name, selected_skins=self.selected_skins)
-                    else:
-                        self.powerup_message = f"{self.get_player_name(player.player_id)} has shield!"
-                        self.message_timer = pygame.time.get_ticks()
-
-                    player.hit_this_frame = True
-            else:
-                player.hit_this_frame = False
-
-    def destroy_tile(self, x, y):
-        if self.tile_map[y][x] == 2:
-            if (x, y) in self.hidden_powerups:
-                powerup_type = self.hidden_powerups[(x, y)]
-                powerup = PowerUp(x, y, powerup_type)
-                powerup.reveal()
-                self.powerup_group.add(powerup)
-                del self.hidden_powerups[(x, y)]
-            self.tile_map[y][x] = 0
-
-    def check_powerup_collisions(self):
-        visible_powerups = [p for p in self.powerup_group.sprites() if not p.hidden]
-        for powerup in visible_powerups:
-            for player in [self.player1, self.player2]:
-                if pygame.sprite.collide_rect(player, powerup):
-                    self.powerup_message = powerup.apply_effect(player)
-                    self.message_timer = pygame.time.get_ticks()
-                    self.music_manager.play_sound("walk", "walk_volume")
-                    powerup.kill()
+    def sync_sprites(self):
+        """Add sprites for new bombs, explosions and power-ups of the match and kill the ones that are gone."""
+        live = {}
+        for objects, group, make in (
+            (self.match.bombs.values(), self.bomb_group, lambda bomb: BombSprite(bomb, self._player(bomb.owner).bomb)),
+            (self.match.explosions, self.explosion_group,
+             lambda explosion: ExplosionSprite(explosion, self._player(explosion.owner).explosion or "Classic")),
+            (self.match.powerups.values(), self.powerup_group, lambda powerup: PowerUp(powerup.x, powerup.y, powerup.type)),
+        ):
+            for obj in objects:
+                sprite = self._sprites.get(obj)
+                if sprite is None:
+                    sprite = make(obj)
+                    group.add(sprite)
+                live[obj] = sprite
+
+        for obj, sprite in self._sprites.items():
+            if obj not in live:
+                sprite.kill()   # zmazanie jeho miesta zariadi get_dirty_rects z minulého frame-u
+        self._sprites = live
+        self.explosion_group.update(self.match.now)
+
+    def _player(self, state):
+        """Sprite of the MatchPlayer *state*."""
+        return self.player1 if state is self.player1.state else self.player2
+
+    def handle_match_events(self):
+        """Sounds, messages and tile redraws for what happened in the last match tick."""
+        for event in self.match.events:
+            if event.kind == "moved":
+                self.music_manager.play_sound("walk", "walk_volume")
+            elif event.kind == "exploded":
+                self.music_manager.play_sound("explosion", "explosion_volume")
+            elif event.kind == "tile":
+                x, y, tile = event.value
+                self.tile_layer.update_tile(x, y, tile)
+                self.mark_dirty((x * config.GRID_SIZE, y * config.GRID_SIZE, config.GRID_SIZE, config.GRID_SIZE))
+            elif event.kind == "hit":
+                self.music_manager.play_sound("death", "death_volume")
+                self.show_message(f"{self.get_player_name(event.player.player_id)} hit! Lives left: {event.player.health}")
+            elif event.kind == "shielded":
+                self.show_message(f"{self.get_player_name(event.player.player_id)} has shield!")
+            elif event.kind == "pickup":
+                self.music_manager.play_sound("walk", "walk_volume")
+                self.show_message(pickup_message(event.value, event.player.player_id))
+
+    def show_message(self, message):
+        self.powerup_message = message
+        self.message_timer = sim_clock.get_ticks()
 
     # ------------------------------------------------------------------ draw
     def draw_menu(self, screen):
@@ -168,6 +157,7 @@ class TestField(State):
 
         icon_y = 4
         text_y = 8
+        drawn = []
 
         # --- Hráč 1 (ľavá strana) ---
         p1_name_surf = self.font_md.render(self.get_player_name(1), True, p1_color)
@@ -175,17 +165,17 @@ class TestField(State):
         p1_bombs     = self.font_md.render(f"x {self.player1.get_max_bombs()}", True, config.COLOR_BLACK)
 
         x = 4
-        screen.blit(p1_name_surf, (x, text_y))
+        drawn.append(screen.blit(p1_name_surf, (x, text_y)))
         x += p1_name_surf.get_width() + 8
 
-        screen.blit(self.images["heart_image"], (x, icon_y))
+        drawn.append(screen.blit(self.images["heart_image"], (x, icon_y)))
         x += self.images["heart_image"].get_width() + 2
-        screen.blit(p1_lives, (x, text_y))
+        drawn.append(screen.blit(p1_lives, (x, text_y)))
         x += p1_lives.get_width() + 8
 
-        screen.blit(self.images["bomb_icon"], (x, icon_y))
+        drawn.append(screen.blit(self.images["bomb_icon"], (x, icon_y)))
         x += self.images["bomb_icon"].get_width() + 2
-        screen.blit(p1_bombs, (x, text_y))
+        drawn.append(screen.blit(p1_bombs, (x, text_y)))
 
         # --- Hráč 2 (pravá strana, sprava doľava) ---
         p2_name_surf = self.font_md.render(self.get_player_name(2), True, p2_color)
@@ -194,91 +184,67 @@ class TestField(State):
 
         x = config.SCREEN_WIDTH - 4
         x -= p2_name_surf.get_width()
-        screen.blit(p2_name_surf, (x, text_y))
+        drawn.append(screen.blit(p2_name_surf, (x, text_y)))
         x -= 8
 
         x -= p2_bombs.get_width()
-        screen.blit(p2_bombs, (x, text_y))
+        drawn.append(screen.blit(p2_bombs, (x, text_y)))
         x -= self.images["bomb_icon"].get_width() + 2
-        screen.blit(self.images["bomb_icon"], (x, icon_y))
+        drawn.append(screen.blit(self.images["bomb_icon"], (x, icon_y)))
         x -= 8
 
         x -= p2_lives.get_width()
-        screen.blit(p2_lives, (x, text_y))
+        drawn.append(screen.blit(p2_lives, (x, text_y)))
         x -= self.images["heart_image"].get_width() + 2
-        screen.blit(self.images["heart_image"], (x, icon_y))
+        drawn.append(screen.blit(self.images["heart_image"], (x, icon_y)))
 
         # --- Správa v strede ---
-        self.draw_active_powerups(screen, 0)
+        drawn += self.draw_active_powerups(screen, 0)
 
         if self.powerup_message:
             msg = self.game.font.render(self.powerup_message, True, config.COLOR_BLACK)
-            screen.blit(msg, (config.SCREEN_WIDTH // 2 - msg.get_width() // 2, text_y))
-            
-    def draw_active_powerups(self, screen, stats_y=40):
+            drawn.append(screen.blit(msg, (config.SCREEN_WIDTH // 2 - msg.get_width() // 2, text_y)))
+        return drawn
+
+    def _active_powerup_texts(self):
         p1_texts, p2_texts = [], []
+        now = self.match.now
         for powerup, expire in self.player1.active_powerups.items():
-            remaining = int(expire - time.time()) + 1
+            remaining = int(expire - now) + 1
             if remaining > 0:
                 if powerup == "shield_powerup":   p1_texts.append(f"Shield: {remaining}s")
                 elif powerup == "freeze_powerup": p2_texts.append(f"Freeze: {remaining}s")
         for powerup, expire in self.player2.active_powerups.items():
-            remaining = int(expire - time.time()) + 1
+            remaining = int(expire - now) + 1
             if remaining > 0:
                 if powerup == "shield_powerup":   p2_texts.append(f"Shield: {remaining}s")
                 elif powerup == "freeze_powerup": p1_texts.append(f"Freeze: {remaining}s")
+        return p1_texts, p2_texts
 
+    def draw_active_powerups(self, screen, stats_y=40):
+        p1_texts, p2_texts = self._active_powerup_texts()
+        drawn = []
         y = stats_y + 30
         for text in p1_texts:
-            screen.blit(self.game.font.render(text, True, config.COLOR_BLACK), (10, y))
+            drawn.append(screen.blit(self.game.font.render(text, True, config.COLOR_BLACK), (10, y)))
             y += 20
         y = stats_y + 30
         for text in p2_texts:
             rendered = self.game.font.render(text, True, config.COLOR_BLACK)
-            screen.blit(rendered, (config.SCREEN_WIDTH - rendered.get_width() - 10, y))
+            drawn.append(screen.blit(rendered, (config.SCREEN_WIDTH - rendered.get_width() - 10, y)))
             y += 20
+        return drawn
 
-    def draw_grid(self, screen):
-        if self.map_name == "Crystal Caves":   screen.blit(self.images["cave_bg"], (0, 0))
-        elif self.map_name == "Classic":        screen.blit(self.images["grass_bg"], (0, 0))
-        elif self.map_name == "Desert Maze":    screen.blit(self.images["sand_bg"], (0, 0))
-        elif self.map_name == "Ancient Ruins":  screen.blit(self.images["ruins_bg"], (0, 0))
-        elif self.map_name == "Urban Assault":  screen.blit(self.images["urban_bg"], (0, 0))
-        else:
-            for line in range((config.SCREEN_WIDTH // config.GRID_SIZE) + 1):
-                pygame.draw.line(screen, config.COLOR_BLACK, (line * config.GRID_SIZE, 30),
-                                 (line * config.GRID_SIZE, config.SCREEN_HEIGHT))
-            for line in range((config.SCREEN_HEIGHT // config.GRID_SIZE) - 1):
-                pygame.draw.line(screen, config.COLOR_BLACK, (0, line * config.GRID_SIZE + 30),
-                                 (config.SCREEN_WIDTH, line * config.GRID_SIZE + 30))
-
-    def draw_walls(self, screen):
-        for y, row in enumerate(self.tile_map):
-            for x, tile in enumerate(row):
-                px, py = x * config.GRID_SIZE, y * config.GRID_SIZE
-                if tile in [0, 4, 5]:
-                    if self.map_name not in ["Crystal Caves", "Desert Maze", "Classic", "Ancient Ruins", "Urban Assault"]:
-                        rect = pygame.Rect(px, py, config.GRID_SIZE, config.GRID_SIZE)
-                        color = config.COLOR_DARK_GREEN if (x + y) % 2 == 0 else config.COLOR_LIGHT_GREEN
-                        pygame.draw.rect(screen, color, rect)
-                elif tile == 1:
-                    if self.map_name == "Crystal Caves":              screen.blit(self.images["unbreakable_stone"], (px, py))
-                    elif self.map_name in ["Classic", "Desert Maze"]: screen.blit(self.images["unbreakable_box"], (px, py))
-                    elif self.map_name == "Ancient Ruins":            screen.blit(self.images["unbreakable_rock"], (px, py))
-                    else:                                             screen.blit(self.images["unbreakable_wall"], (px, py))
-                elif tile == 2:
-                    if self.map_name == "Desert Maze":     screen.blit(self.images["breakable_cactus"], (px, py))
-                    elif self.map_name == "Classic":       screen.blit(self.images["breakable_bush"], (px, py))
-                    elif self.map_name == "Crystal Caves": screen.blit(self.images["breakable_diamond"], (px, py))
-                    elif self.map_name == "Ancient Ruins": screen.blit(self.images["breakable_rock"], (px, py))
-                    else:                                  screen.blit(self.images["breakable_wall"], (px, py))
-                if tile == 4:             screen.blit(self.images["blue_cave"], (px, py))
-                if tile == 5:             screen.blit(self.images["red_cave"], (px, py))
-                elif tile == config.TRAP: screen.blit(self.images["trap_image"], (px, py))
+    def _hud_signature(self):
+        return (
+            self.get_player_name(1), self.player1.get_health(), self.player1.get_max_bombs(),
+            self.get_player_name(2), self.player2.get_health(), self.player2.get_max_bombs(),
+            self.powerup_message, self._active_powerup_texts(),
+        )
 
     def draw_players(self, screen):
         for player in [self.player1, self.player2]:
-            screen.blit(player.image, player.rect)
+            self.mark_dirty(screen.blit(player.image, player.rect))
 
             if player.skin:
                 hat_name = player.hat
@@ -310,110 +276,51 @@ class TestField(State):
                             hx = player.rect.x + ox
                             hy = player.rect.y + oy + anim_offset_y
                             hat_to_draw = pygame.transform.flip(hat_img, True, False) if going_right else hat_img
-                            screen.blit(hat_to_draw, (hx, hy))
-
-    def activate_darkness(self, duration):
-        self.darkness_timer = time.time() + duration
+                            self.mark_dirty(screen.blit(hat_to_draw, (hx, hy)))
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
+        self.match.tick({player.player_id: player.held_action() for player in self.players})
         for player in self.players:
-            player.moving = False
-            player.handle_queued_keys(now)
-            player.update_movement_status()
+            player.sync()
             player.update_animation()
-            player.update_powerups()
-
-        self.handle_explosions()
-        self.check_powerup_collisions()
-        self.powerup_group.update()
-        self.check_trap_collisions()
+        self.sync_sprites()
+        self.handle_match_events()
+
+        if self.match.winner is not None:
+            self.music_manager.play_sound("death", "death_volume")
+            pygame.mixer_music.stop()
+            self.exit_state()
+            self.game.state_manager.change_state("GameOver", self.match.winner, self.selected_map, self.map_name, selected_skins=self.selected_skins)
+            return
 
         if self.message_timer > 0 and now - self.message_timer > 3000:
             self.powerup_message = ""
             self.message_timer = 0
 
-    def check_powerup_explosion_collisions(self):
-        for powerup in self.powerup_group.sprites():
-            if powerup.hidden:
-                continue
-            if time.time() - powerup.reveal_time < 1.0:
-                continue
-            for explosion in self.explosion_group:
-                if pygame.sprite.collide_rect(powerup, explosion):
-                    powerup.kill()
-                    break
-
-    def check_trap_collisions(self):
-        for player in self.players:
-            grid_x = player.rect.x // config.GRID_SIZE
-            grid_y = player.rect.y // config.GRID_SIZE
-            if (0 <= grid_y < len(self.tile_map)) and (0 <= grid_x < len(self.tile_map[0])) and self.tile_map[grid_y][grid_x] == config.TRAP:
-                current_time = time.time()
-                if not hasattr(player, 'last_trap_time') or current_time - player.last_trap_time > 1.0:
-                    player.health = max(0, player.health - 1)
-                    player.last_trap_time = current_time
-                    if player.health <= 0:
-                        self.music_manager.play_sound("death", "death_volume")
-                        pygame.mixer_music.stop()
-                        self.exit_state()
-                        winner = self.player2.player_id if player.player_id == 1 else self.player1.player_id
-                        self.game.state_manager.change_state("GameOver", winner, self.selected_map, self.map_name, selected_skins=self.selected_skins)
-                        self.music_manager.play_sound("death", "death_volume")
-                        self.powerup_message = f"{self.get_player_name(player.player_id)} fell in a sewer!"
-                        self.message_timer = pygame.time.get_ticks()
-
     def _draw_darkness(self, screen):
-        if time.time() >= self.darkness_timer:
+        active = self.match.darkness_active
+        if active != self.darkness_active:
+            # Tma zakrýva celú obrazovku - pri zapnutí/vypnutí treba poslať celý frame
+            self.darkness_active = active
+            self.request_full_redraw()
+        if not active:
             return
 
-        dark = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        dark.fill((0, 0, 0, 250))
-
-        radius = config.GRID_SIZE
-        fade_steps = config.FADE_STEPS
-        fade_extra = config.GRID_SIZE
-
-        for player in self.players:
-            cx = player.rect.centerx
-            cy = player.rect.centery
-            pygame.draw.circle(dark, (0, 0, 0, 0), (cx, cy), radius)
-            for i in range(fade_steps):
-                progress = (i + 1) / fade_steps
-                alpha = int(250 * (progress ** 1.5))
-                r = radius + int(fade_extra * progress)
-                pygame.draw.circle(dark, (0, 0, 0, alpha), (cx, cy), r, width=max(1, int(fade_extra / fade_steps) + 2))
-
-        screen.blit(dark, (0, 0))
-
-    def offset_timers(self, pause_duration):
-        for powerup in self.powerup_group.sprites():
-            powerup.reveal_time += pause_duration
-        for bomb in self.bomb_group.sprites():
-            if hasattr(bomb, 'place_time'):
-                bomb.place_time += pause_duration
-            if hasattr(bomb, 'explode_time'):
-                bomb.explode_time += pause_duration
-        if self.darkness_timer > 0:
-            self.darkness_timer += pause_duration
-        for player in self.players:
-            for key in player.active_powerups:
-                player.active_powerups[key] += pause_duration
-            if hasattr(player, 'frozen_until') and player.frozen_until:
-                player.frozen_until += pause_duration
-            if hasattr(player, 'last_trap_time') and player.last_trap_time:
-                player.last_trap_time += pause_duration
+        if self.darkness_layer is None:
+            self.darkness_layer = DarknessLayer(screen.get_size())
+        centers = [player.rect.center for player in self.players]
+        self.darkness_layer.update(centers)
+        self.darkness_layer.draw(screen)
+        for center in centers:
+            self.mark_dirty(self.darkness_layer.rect_at(center))
 
     def render(self, screen):
-        screen.fill(config.COLOR_WHITE)
-        self.draw_grid(screen)
-        self.draw_walls(screen)
-        self.draw_menu(screen)
+        self.tile_layer.draw(screen)
+        self.mark_overlay(self._hud_signature(), self.draw_menu(screen))
         self.draw_players(screen)
-        self.bomb_group.update(self.explosion_group)
-        self.explosion_group.update()
-        self.powerup_group.draw(screen)
-        self.bomb_group.draw(screen)
-        self.explosion_group.draw(screen)
-        self._draw_darkness(screen)
-        self.check_powerup_explosion_collisions()
\ No newline at end of file
+        for group in (self.powerup_group, self.bomb_group, self.explosion_group):
+            group.draw(screen)
+            for sprite in group:
+                self.mark_dirty(sprite.rect)
+        self._draw_darkness(screen)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import argparse
+import glob
+import json
+import os
+import time
+import config
+
+# bez displeja a zvukovky; zvuky sa dekódujú pre predvolený formát mixéra (ako pygame.mixer.init() v main.py)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+from typing import List, Optional, Tuple
+from managers.asset_archive import HEADER, MAGIC, PIXEL_FORMAT, align, data_start
+from managers.atlas import source_stamp
+from managers.music_manager import MusicManager
+from tools import build_atlas
+import image_loader
+
+# Zapíše config.ASSET_ARCHIVE: surové pixely každého obrázka v každej veľkosti, ktorú hra žiada,
+# plus dekódované zvukové efekty. Najprv (ak netreba --no-atlas) postaví atlas a do archívu dá jeho
+# hárky namiesto jednotlivých spritov. Výstup je generovaný (v .gitignore), po zmene assetov znova:
+#   python -m tools.build_asset_archive
+#   python -m tools.build_asset_archive --no-atlas --out /tmp/assets.pak
+
+Size = Optional[Tuple[int, int]]
+Spec = Tuple[str, Size, bool]   # (path, size, smoothscale) - ako argumenty asset_manager.load_image
+
+SCREEN = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+MAP_PREVIEWS = (
+    (config.MAP_PREVIEW_SIZE, True),       # MapSelector
+    (config.MP_MAP_PREVIEW_SIZE, False),   # MultiplayerMapSelector
+)
+
+
+def image_specs(atlas_index: Optional[dict]) -> List[Spec]:
+    """Every image asset_manager is asked for outside the atlas (or with it, when there is no atlas)."""
+    specs: List[Spec] = [(path, None, False) for path in image_loader.BACKGROUND_IMAGES.values()]
+    specs += [("assets/backgrounds/titles/battlefield.png", None, False)]
+    specs += [(path, SCREEN, False) for path in ("assets/backgrounds/menu/bg.png", "assets/backgrounds/menu/pause.png")]
+
+    for paths in config.PLAYER1_IMAGE_PATHS.values():
+        specs += [(path, None, False) for path in paths]
+        specs += [(path, image_loader.TILE_SIZE, False) for path in paths]
+    for path in config.PLAYER1_IMAGE_PATHS["idle"]:
+        w, h = pygame.image.load(path).get_size()
+        specs.append((path, (w * 4, h * 4), False))   # MultiplayerLobby
+
+    for path in sorted(glob.glob("assets/map_previews/*_preview.png")):
+        specs += [(path, size, smooth) for size, smooth in MAP_PREVIEWS]
+
+    if atlas_index is not None:
+        specs += [(os.path.join(config.ATLAS_DIR, file), None, False) for file in atlas_index["sheets"].values()]
+    else:
+        specs += [spec for sheet in build_atlas.sprite_specs().values() for spec in sheet]
+    return [spec for spec in dict.fromkeys(specs) if os.path.exists(spec[0])]
+
+
+def build(out: str, atlas_index: Optional[dict]) -> dict:
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pygame.mixer.init()
+
+    index = {"pixel_format": PIXEL_FORMAT, "mixer": list(pygame.mixer.get_init()), "images": [], "sounds": [], "sources": {}}
+    blobs: List[bytes] = []
+    offset = 0
+
+    def add(data: bytes) -> int:
+        nonlocal offset
+        start = offset
+        blobs.append(data + bytes(align(len(data)) - len(data)))
+        offset += align(len(data))
+        return start
+
+    def source(path: str) -> str:
+        key = os.path.normpath(path).replace(os.sep, "/")
+        index["sources"][key] = source_stamp(path)
+        return key
+
+    for path, size, smooth in image_specs(atlas_index):
+        image = build_atlas.render((path, size, smooth))
+        index["images"].append({
+            "path": source(path),
+            "size": list(size) if size else None,
+            "smooth": smooth,
+            "pixels": list(image.get_size()),
+            "offset": add(pygame.image.tobytes(image, PIXEL_FORMAT)),
+        })
+    for path in MusicManager.SOUNDS.values():
+        if not os.path.exists(path):
+            continue
+        raw = pygame.mixer.Sound(path).get_raw()
+        index["sounds"].append({"path": source(path), "length": len(raw), "offset": add(raw)})
+
+    encoded = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    with open(out, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        f.write(bytes(data_start(len(encoded)) - HEADER.size - len(encoded)))
+        for blob in blobs:
+            f.write(blob)
+    pygame.mixer.quit()
+    pygame.display.quit()
+    return index
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write pre-scaled images and pre-decoded sound effects into one archive.")
+    parser.add_argument("--out", default=config.ASSET_ARCHIVE)
+    parser.add_argument("--no-atlas", action="store_true", help="store atlas sprites one by one instead of building the atlas")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    atlas_index = None
+    if not args.no_atlas:
+        atlas_index = build_atlas.build(config.ATLAS_DIR, build_atlas.SHEET_WIDTH)
+    index = build(args.out, atlas_index)
+    print(f"[ARCHIVE] {len(index['images'])} images, {len(index['sounds'])} sounds -> {args.out}"
+          f" ({os.path.getsize(args.out) / (1024 * 1024):.1f} MB, {(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+import argparse
+import glob
+import json
+import os
+import time
+import config
+
+# pygame potrebuje displej na convert_alpha; sprity v atlase musia byť pixel po pixeli
+# tie isté, aké by asset_manager vyrobil zo samostatného súboru
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from typing import Dict, List, Optional, Tuple
+from managers.atlas import INDEX_FILE, VERSION, source_stamp
+import image_loader
+
+# Zabalí malé sprity (dlaždice, power-upy, HUD ikony, bomby, výbuchy, klobúky) do pár PNG hárkov
+# a zapíše index.json s ich obdĺžnikmi. Výstup je generovaný (config.ATLAS_DIR je v .gitignore),
+# po zmene spritov alebo ich veľkostí treba skript spustiť znova:
+#   python -m tools.build_atlas
+#   python -m tools.build_atlas --sheet-width 512 --out assets/atlas
+
+Size = Tuple[int, int]
+Spec = Tuple[str, Size, bool]   # (path, size, smoothscale) - ako argumenty asset_manager.load_image
+
+PADDING = 1
+SHEET_WIDTH = 256
+POWERUP_SIZES = (image_loader.TILE_SIZE, (25, 25))   # multiplayer / singleplayer PowerUp
+
+
+def sprite_specs() -> Dict[str, List[Spec]]:
+    """Sprites per sheet, exactly as the game asks asset_manager for them."""
+    tile, preview, thumb = image_loader.TILE_SIZE, image_loader.PREVIEW_SIZE, image_loader.THUMB_SIZE
+
+    environment = [(path, tile, False) for path in image_loader.TILE_IMAGES.values()]
+
+    items = [(path, image_loader.ICON_SIZE, False) for path in image_loader.ICON_IMAGES.values()]
+    items += [(path, size, False) for path in sorted(glob.glob("assets/power_ups/*.png")) for size in POWERUP_SIZES]
+    items += [(path, (20, 20), False) for path in ("assets/menu_items/not_muted.png", "assets/menu_items/mute.png")]
+
+    skins = []
+    for bomb in config.BOMBS:
+        path = image_loader.bomb_path(bomb["file"])
+        skins += [(path, tile, False), (path, preview, False), (path, thumb, False)]
+    for explosion in config.EXPLOSIONS:
+        center = image_loader.explosion_path(explosion["file"])
+        arm = center[:-len("_a.png")] + "_c.png"
+        skins += [(center, tile, False), (arm, tile, False), (center, preview, False), (center, thumb, False)]
+    hat_files = {hat["file"] for hat in config.HATS if hat["file"]} | {hat["file"] for hat in config.AVAILABLE_HATS.values() if hat["file"]}
+    for file in sorted(hat_files):
+        path = image_loader.hat_path(file)
+        skins += [(path, preview, True), (path, thumb, True), (path, image_loader.GAME_HAT_SIZE, True)]
+
+    sheets = {"environment": environment, "items": items, "skins": skins}
+    # rovnaký sprite (napr. classic bomba v HUD aj v hre) stačí zabaliť raz
+    seen = set()
+    for name, specs in sheets.items():
+        unique = []
+        for path, size, smooth in specs:
+            key = (os.path.normpath(path), tuple(size), smooth)
+            if key not in seen and os.path.exists(path):
+                seen.add(key)
+                unique.append((path, tuple(size), smooth))
+        sheets[name] = unique
+    return sheets
+
+
+def render(spec: Spec) -> pygame.Surface:
+    path, size, smooth = spec
+    image = pygame.image.load(path).convert_alpha()
+    if size and image.get_size() != size:
+        image = (pygame.transform.smoothscale if smooth else pygame.transform.scale)(image, size)
+    return image
+
+
+def pack(sizes: List[Size], width: int) -> Tuple[List[Tuple[int, int]], int]:
+    """Shelf packing: tallest first, left to right, a new shelf when a row is full. Returns positions and height."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions: List[Optional[Tuple[int, int]]] = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if w + PADDING > width:
+            raise ValueError(f"sprite {w}x{h} does not fit a sheet {width} px wide")
+        if x + w + PADDING > width:
+            x, y, shelf = 0, y + shelf, 0
+        positions[i] = (x, y)
+        x += w + PADDING
+        shelf = max(shelf, h + PADDING)
+    return positions, y + shelf
+
+
+def build(out_dir: str, sheet_width: int) -> dict:
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    os.makedirs(out_dir, exist_ok=True)
+
+    index = {"version": VERSION, "sheets": {}, "sprites": [], "sources": {}}
+    for name, specs in sprite_specs().items():
+        images = [render(spec) for spec in specs]
+        positions, height = pack([image.get_size() for image in images], sheet_width)
+        sheet = pygame.Surface((sheet_width, height), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        for (path, size, smooth), image, pos in zip(specs, images, positions):
+            # BLEND_RGBA_MAX na priehľadný hárok = presná kópia vrátane alfy (obyčajný blit by miešal)
+            sheet.blit(image, pos, special_flags=pygame.BLEND_RGBA_MAX)
+            source = os.path.normpath(path).replace(os.sep, "/")
+            index["sources"][source] = source_stamp(path)
+            index["sprites"].append({
+                "path": source,
+                "size": list(size),
+                "smooth": smooth,
+                "sheet": name,
+                "rect": [*pos, *size],
+            })
+        file = f"{name}.png"
+        pygame.image.save(sheet, os.path.join(out_dir, file))
+        index["sheets"][name] = file
+        print(f"[ATLAS] {file}: {len(specs)} sprites, {sheet_width}x{height}")
+
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    pygame.display.quit()
+    return index
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pack environment, power-up, HUD and skin sprites into atlas sheets.")
+    parser.add_argument("--out", default=config.ATLAS_DIR)
+    parser.add_argument("--sheet-width", type=int, default=SHEET_WIDTH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = build(args.out, args.sheet_width)
+    print(f"[ATLAS] {len(index['sprites'])} sprites in {len(index['sheets'])} sheets -> {args.out}"
+          f" ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
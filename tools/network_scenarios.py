@@ -0,0 +1,403 @@
+import argparse
+import contextlib
+import io
+import logging
+import os
+import socket
+import time
+import config
+
+# obe strany bežia ako skutočné BomberManApp v jednom procese, bez okna a zvukovky
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from main import BomberManApp
+from managers.music_manager import sound_bank
+from managers.network_manager import NetworkManager
+from managers.network_transport import PROFILES, SimulatedTransport, UdpTransport, get_profile
+from managers.time_manager import sim_clock
+from game_objects.general.blast import blast_cells
+
+# Host a hosť prejdú skutočnými stavmi InputPopup -> MultiplayerLobby -> MultiplayerMapSelector ->
+# MultiplayerTestField: runner len kliká na tlačidlá a stláča klávesy, pakety (vrátane MAP_STATE,
+# MAP_DELTA a tých, čo čakajú na scope ďalšieho stavu) posielajú samotné stavy. Hosť ide cez
+# SimulatedTransport s daným profilom. Spustenie:
+#   python -m tools.network_scenarios
+#   python -m tools.network_scenarios --profiles mobile lossy --play-time 10 --verbose
+
+PHASE_TIMEOUT = 15.0
+SELECTION_MOVES = 10
+BOMB_WAIT = 4000       # ms od bomby: zápalnica 3 s + výbuch 0.5 s + rezerva na oneskorenie BOMB_UPDATE
+STUCK_TIMEOUT = 1000   # ms na jednom kroku cesty, potom sa plánuje znova
+
+Cell = Tuple[int, int]
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+class Peer:
+    """One BomberManApp of the session; input goes straight to its top state's handle_events."""
+
+    def __init__(self, name: str, transport_factory) -> None:
+        self.name = name
+        self.app = BomberManApp()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.network_manager = NetworkManager(sock, transport=transport_factory(sock))
+        self.held_max = 0   # most packets ever waiting for a scope the current state does not read
+
+    @property
+    def state(self):
+        return self.app.state_stack[-1]
+
+    def in_state(self, name: str) -> bool:
+        return type(self.state).__name__ == name
+
+    def step(self) -> None:
+        self.state.update()
+        self.app.render()
+        self.held_max = max(self.held_max, self.network_manager.get_stats()["held"])
+
+    def click(self, rect: pygame.Rect) -> None:
+        self.state.handle_events(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=rect.center, button=1))
+
+    def key_down(self, key: int) -> None:
+        self.state.handle_events(pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0))
+
+    def key_up(self, key: int) -> None:
+        self.state.handle_events(pygame.event.Event(pygame.KEYUP, key=key, unicode="", mod=0))
+
+    def press(self, key: int) -> None:
+        self.key_down(key)
+        self.key_up(key)
+
+    def close(self) -> None:
+        self.network_manager.close_connection()
+
+
+class Bomber:
+    """Plays the local player of a MultiplayerTestField through its keys.
+
+    Walks next to the nearest brick it can blow up, drops a bomb, walks to the
+    nearest cell out of the blast and waits there until the bomb and its
+    explosion are gone, then picks the next brick.
+    """
+
+    def __init__(self, peer: Peer) -> None:
+        self.peer = peer
+        self.plan: List[list] = []   # ["walk", path] / ["bomb"] / ["wait", until]
+        self.held: Optional[int] = None
+        self.step_started = 0   # kedy sa naposledy stlačila klávesa alebo zmenilo políčko
+        self.last_cell: Optional[Cell] = None
+        self.bombs = 0
+
+    @property
+    def player(self):
+        return self.peer.state.players.get(self.peer.name)
+
+    def cell(self) -> Cell:
+        x, y = self.player.rect.topleft
+        return x // config.GRID_SIZE, y // config.GRID_SIZE
+
+    def walkable(self, cell: Cell) -> bool:
+        field = self.peer.state
+        x, y = cell
+        if not (0 <= y < len(field.tile_map) and 0 <= x < len(field.tile_map[0])):
+            return False
+        return field.tile_map[y][x] == config.GROUND and not field.bomb_group.has_tile(cell)
+
+    def reachable(self, start: Cell) -> Dict[Cell, Optional[Cell]]:
+        """Breadth-first predecessors of every cell reachable from *start*, nearest first."""
+        came_from: Dict[Cell, Optional[Cell]] = {start: None}
+        queue = deque([start])
+        while queue:
+            x, y = queue.popleft()
+            for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if cell not in came_from and self.walkable(cell):
+                    came_from[cell] = (x, y)
+                    queue.append(cell)
+        return came_from
+
+    @staticmethod
+    def path(came_from: Dict[Cell, Optional[Cell]], cell: Cell) -> List[Cell]:
+        path = []
+        while cell is not None:
+            path.append(cell)
+            cell = came_from[cell]
+        return path[::-1]
+
+    def make_plan(self) -> bool:
+        tile_map = self.peer.state.tile_map
+        came_from = self.reachable(self.cell())
+        for bomb_cell in came_from:
+            cells = blast_cells(tile_map, *bomb_cell, self.player.power)
+            if not any(destroys for _, _, destroys in cells):
+                continue
+            blast = {(x, y) for x, y, _ in cells}
+            cover = self.reachable(bomb_cell)
+            safe = next((cell for cell in cover if cell not in blast), None)
+            if safe is not None:
+                self.plan = [["walk", self.path(came_from, bomb_cell)], ["bomb"],
+                             ["walk", self.path(cover, safe)], ["wait", None]]
+                return True
+        return False
+
+    def hold(self, key: Optional[int], now: int) -> None:
+        if key == self.held:
+            return
+        if self.held is not None:
+            self.peer.key_up(self.held)
+        if key is not None:
+            self.peer.key_down(key)
+        self.held, self.step_started = key, now
+
+    def step(self, now: int, active: bool) -> None:
+        field = self.peer.state
+        if not active or self.player is None or field.tile_map is None:
+            self.hold(None, now)
+            return
+        if not self.plan and not self.make_plan():
+            self.hold(None, now)
+            return
+        action = self.plan[0]
+        keys = self.player.move_keys   # [hore, vľavo, dole, vpravo, bomba]
+        if action[0] == "walk":
+            path, cell = action[1], self.cell()
+            if cell != self.last_cell:
+                self.last_cell, self.step_started = cell, now
+            while path and path[0] == cell:
+                path.pop(0)
+            if not path:
+                self.hold(None, now)
+                self.plan.pop(0)
+                return
+            dx, dy = path[0][0] - cell[0], path[0][1] - cell[1]
+            if abs(dx) + abs(dy) != 1 or (self.held is not None and now - self.step_started > STUCK_TIMEOUT):
+                self.hold(None, now)   # zablokovaná cesta alebo korekcia od hosta
+                self.plan.clear()
+                return
+            key = keys[3] if dx > 0 else keys[1] if dx < 0 else keys[2] if dy > 0 else keys[0]
+            if key != self.held:
+                self.hold(key, now)
+        elif action[0] == "bomb":
+            if self.held != keys[4]:
+                self.hold(keys[4], now)
+            elif self.player.last_move_time > self.step_started:   # handle_queued_keys ju už spracoval
+                self.hold(None, now)
+                self.bombs += 1
+                self.plan.pop(0)
+        if self.plan and self.plan[0][0] == "wait":
+            if self.plan[0][1] is None:
+                self.plan[0][1] = now + BOMB_WAIT
+            elif now >= self.plan[0][1] and not field.bomb_group and not field.explosion_group:
+                self.plan.pop(0)
+
+
+class Scenario:
+    """Host and guest BomberManApp walking through the multiplayer flow frame by frame."""
+
+    def __init__(self, profile_name: str, seed: int, play_time: float) -> None:
+        self.profile_name = profile_name
+        self.play_time = play_time
+        # lobby hosta počúva na config.SERVER_PORT, voľný port nekoliduje s bežiacou hrou
+        config.SERVER_PORT = free_port()
+        self.host = Peer("host", UdpTransport)
+        self.guest = Peer("guest", lambda sock: SimulatedTransport(sock, get_profile(profile_name), seed=seed))
+        self.phases: Dict[str, Optional[float]] = {}
+        self.notes: List[str] = []
+        self.bombs = 0
+        self.map_rev: Optional[int] = None
+
+    # ---------------- Frame loop ----------------
+    def frame(self) -> None:
+        """One fixed step of both apps, as BomberManApp.update + render; sim_clock is shared, so it advances once."""
+        sim_clock.advance()
+        sound_bank.next_frame()
+        for peer in (self.host, self.guest):
+            peer.step()
+
+    def run_until(self, phase: str, step, done) -> bool:
+        start = time.perf_counter()
+        deadline = start
+        while time.perf_counter() - start < PHASE_TIMEOUT:
+            step()
+            self.frame()
+            if done():
+                self.phases[phase] = time.perf_counter() - start
+                return True
+            # v reálnom čase, sieť (timeouty, oneskorenie profilu) beží na hodinách
+            deadline += sim_clock.step
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+        self.phases[phase] = None
+        return False
+
+    def run(self) -> "Scenario":
+        try:
+            self.join() and self.lobby() and self.map_selection() and self.play()
+        finally:
+            self.host.close()
+            self.guest.close()
+        return self
+
+    # ---------------- Phases ----------------
+    def join(self) -> bool:
+        """Host opens a lobby, guest picks it in InputPopup and submits its name."""
+        host, guest = self.host, self.guest
+        host.app.state_manager.change_state("MultiplayerLobby", host.name, host.network_manager,
+                                            is_host=True, lobby_name="netsim")
+        if host.state.host_setup_failed:
+            self.notes.append(host.state.host_setup_error)
+            return False
+        guest.app.state_manager.change_state("InputPopup", guest.network_manager, mode="join")
+        popup = guest.state
+        popup.username_text = guest.name
+        popup.selected_host_addr = host.state.my_player.addr   # ako klik na lobby v zozname
+        popup.submit()
+
+        return self.run_until("join", lambda: None,
+                              lambda: guest.in_state("MultiplayerLobby") and guest.name in host.state.players_list)
+
+    def lobby(self) -> bool:
+        """Guest clicks Ready, host clicks Start as soon as it sees that."""
+        host, guest = self.host, self.guest
+        guest.click(guest.state.ready_button.rect)
+
+        def step() -> None:
+            ready = host.in_state("MultiplayerLobby") and host.state.players_list[guest.name].is_ready
+            if ready:
+                host.click(host.state.start_button.rect)
+
+        # MAP_SELECTION ide hneď za STATE_CHANGE, hosť ho drží, kým map selector nečíta svoj scope
+        return self.run_until("lobby", step, lambda: guest.in_state("MultiplayerMapSelector")
+                              and host.in_state("MultiplayerMapSelector") and guest.state.selected_maps)
+
+    def map_selection(self) -> bool:
+        """Both vote (guest after moving the cursor), the host starts the match with Space."""
+        host, guest = self.host, self.guest
+        host.press(pygame.K_RETURN)
+        sent: List[int] = []
+        seen: List[int] = []
+        pressed = {"space": False}
+
+        def step() -> None:
+            if guest.in_state("MultiplayerMapSelector"):
+                selector = guest.state
+                if len(sent) < SELECTION_MOVES:
+                    guest.press(pygame.K_d)
+                    sent.append(selector.players_list[guest.name].selection_index)
+                elif selector.players_list[guest.name].vote_index is None:
+                    guest.press(pygame.K_RETURN)
+            if host.in_state("MultiplayerMapSelector"):
+                index = host.state.players_list[guest.name].selection_index
+                if sent and (not seen or seen[-1] != index):
+                    seen.append(index)
+                if host.state.final_map and not pressed["space"]:
+                    host.press(pygame.K_SPACE)
+                    pressed["space"] = True
+
+        ok = self.run_until("map_select", step, lambda: guest.in_state("MultiplayerTestField")
+                            and host.in_state("MultiplayerTestField"))
+        # MOVE_SELECTION je sequenced: host smie vynechať posuny, ale nikdy neukáže starší po novšom
+        remaining = iter(sent)
+        if not all(index in remaining for index in seen[1:]):
+            self.notes.append(f"MOVE_SELECTION out of order: sent {sent}, host saw {seen}")
+        if ok and guest.state.map_name != host.state.map_name:
+            self.notes.append(f"guest plays {guest.state.map_name}, host {host.state.map_name}")
+        return ok
+
+    def play(self) -> bool:
+        """Both players bomb bricks for play_time, then host and guest must agree on the match."""
+        host, guest = self.host, self.guest
+        bombers = [Bomber(host), Bomber(guest)]
+        end = time.perf_counter() + self.play_time
+
+        def step() -> None:
+            active = time.perf_counter() < end
+            for bomber in bombers:
+                if bomber.peer.in_state("MultiplayerTestField"):
+                    bomber.step(sim_clock.get_ticks(), active)
+
+        def settled() -> bool:
+            if time.perf_counter() < end or not (host.in_state("MultiplayerTestField") and guest.in_state("MultiplayerTestField")):
+                return False
+            h, g = host.state, guest.state
+            if g.map_state is None or g.input_buffer.pending:
+                return False
+            same_players = all(g.players[name].rect.topleft == h.players[name].rect.topleft
+                               for name in (host.name, guest.name) if name in g.players and name in h.players)
+            return (same_players and g.map_state.rev == h.map_state.rev and g.tile_map == h.tile_map
+                    and len(g.bomb_group) == len(h.bomb_group))
+
+        ok = self.run_until("play", step, settled)
+        if self.phases["play"] is not None:
+            self.phases["play"] = max(0.0, self.phases["play"] - self.play_time)   # len dobiehanie po poslednom vstupe
+        self.bombs = sum(bomber.bombs for bomber in bombers)
+        for peer in (host, guest):
+            if not peer.in_state("MultiplayerTestField"):
+                self.notes.append(f"{peer.name} left the match for {type(peer.state).__name__}")
+        if guest.in_state("MultiplayerTestField"):
+            field = guest.state
+            self.map_rev = field.map_state.rev if field.map_state else None
+            if field.reconciliations:
+                self.notes.append(f"{field.reconciliations} prediction corrections")
+        return ok
+
+    # ---------------- Report ----------------
+    def report(self) -> List[str]:
+        def ms(value: Optional[float]) -> str:
+            return "TIMEOUT" if value is None else f"{value * 1000:.0f} ms"
+
+        phases = "  ".join(f"{name} {ms(self.phases[name]) if name in self.phases else '-'}"
+                           for name in ("join", "lobby", "map_select", "play"))
+        lines = [f"[NETSIM] {self.profile_name:<9} {phases}"]
+        lines.append(f"[NETSIM]   match  bombs {self.bombs}  map rev {'-' if self.map_rev is None else self.map_rev}"
+                     f"  held max host {self.host.held_max} guest {self.guest.held_max}")
+        for peer in (self.host, self.guest):
+            stats = peer.network_manager.get_stats()
+            for peer_stats in stats["peers"].values():
+                rtt = peer_stats.get("rtt")
+                drops = ", ".join(f"{reason} {count}" for reason, count in sorted(peer_stats["drops"].items())) or "0"
+                lines.append(
+                    f"[NETSIM]   {peer.name:<6} rtt {'-' if rtt is None else f'{rtt * 1000:.0f} ms':>6}"
+                    f"  resends {peer_stats['resends']:<4} dup {peer_stats['duplicate_rate'] * 100:4.1f}%  drops {drops}"
+                )
+        transport = self.guest.network_manager.transport
+        if isinstance(transport, SimulatedTransport):
+            lines.append("[NETSIM]   link   " + ", ".join(f"{k} {v}" for k, v in sorted(transport.counters.items())))
+        lines += [f"[NETSIM]   NOTE {note}" for note in self.notes]
+        return lines
+
+    @property
+    def passed(self) -> bool:
+        return all(value is not None for value in self.phases.values()) and len(self.phases) == 4 and not self.notes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the real lobby -> map selector -> test field states under simulated network profiles.")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--play-time", type=float, default=8.0)
+    parser.add_argument("--verbose", action="store_true", help="show what the states print")
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="[%(levelname)s] %(name)s: %(message)s")
+
+    failed = []
+    for name in args.profiles:
+        with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO()):
+            scenario = Scenario(name, args.seed, args.play_time).run()
+        print("\n".join(scenario.report()))
+        if not scenario.passed:
+            failed.append(name)
+    print(f"[NETSIM] {len(args.profiles) - len(failed)}/{len(args.profiles)} profiles passed"
+          + (f", failed: {', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())